@@ -0,0 +1,187 @@
+#!/usr/bin/env python
+
+"""
+Benchmark inserting fragments into LanceDB as per-row dicts versus Arrow RecordBatches
+built by FragmentColumns. Vectors are random, so only the insert path is measured.
+Each path runs in its own process so peak memory is reported separately.
+Usage:
+    python scripts/benchmark_arrow_insert.py
+    python scripts/benchmark_arrow_insert.py --count 500000 --ndims 4096 \
+        --batch_size 1024
+"""
+
+import os
+import sys
+import json
+import time
+import argparse
+import resource
+import tempfile
+import subprocess
+import numpy as np
+import pyarrow as pa
+import lancedb
+from reportfindingrefiner.config import DEFAULT_INGEST_BATCH_SIZE
+from reportfindingrefiner.lance_db import FragmentColumns
+
+MODES = ["dicts", "arrow"]
+SECTIONS = [
+    "Header:",
+    "Findings:",
+    "Findings:",
+    "Findings:",
+    "Findings:",
+    "Impression:",
+]
+FRAGMENTS_PER_REPORT = len(SECTIONS)
+
+def fragment_schema(ndims: int) -> pa.Schema:
+    """The fragment table schema, without an embedding function attached"""
+    return pa.schema([
+        pa.field("report_id", pa.string(), nullable=False),
+        pa.field("section", pa.string()),
+        pa.field("sequence_number", pa.int64(), nullable=False),
+        pa.field("text", pa.string(), nullable=False),
+        pa.field("vector", pa.list_(pa.float32(), ndims)),
+    ])
+
+def iter_report_batches(count: int, batch_size: int):
+    """Yield lists of (report_id, fragments) holding about batch_size fragments each"""
+    reports = []
+    for r in range(0, count, FRAGMENTS_PER_REPORT):
+        fragments = [
+            (section, f"{section} synthetic fragment {r + seq} with some report text.")
+            for seq, section in enumerate(SECTIONS[:count - r])
+        ]
+        reports.append((f"synthetic_{r // FRAGMENTS_PER_REPORT}.txt", fragments))
+        if len(reports) * FRAGMENTS_PER_REPORT >= batch_size:
+            yield reports
+            reports = []
+    if reports:
+        yield reports
+
+def run_mode(mode: str, count: int, ndims: int, batch_size: int, db_path: str) -> dict:
+    """Insert `count` fragments with one path and return its timings"""
+    table = lancedb.connect(db_path).create_table(
+        mode, schema=fragment_schema(ndims), mode="overwrite"
+    )
+    # Stand-in for the embedding stage's output: one float32 array per fragment
+    vector_pool = list(
+        np.random.default_rng(0).standard_normal(
+            (batch_size + FRAGMENTS_PER_REPORT, ndims), dtype=np.float32
+        )
+    )
+    # Split reports are produced before timing; only building rows and
+    # inserting are measured
+    report_batches = list(iter_report_batches(count, batch_size))
+    rss_before = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+
+    start = time.perf_counter()
+    rows = 0
+    for reports in report_batches:
+        if mode == "dicts":
+            docs = []
+            for report_id, fragments in reports:
+                for seq_num, (section, text) in enumerate(fragments):
+                    docs.append({
+                        "report_id": report_id,
+                        "section": section,
+                        "sequence_number": seq_num,
+                        "text": text,
+                    })
+            for doc, vector in zip(docs, vector_pool):
+                doc["vector"] = vector
+            table.add(docs)
+            rows += len(docs)
+        else:
+            columns = FragmentColumns()
+            for report_id, fragments in reports:
+                columns.append_report(report_id, fragments)
+            table.add(columns.to_record_batch(vector_pool[:len(columns)], table.schema))
+            rows += len(columns)
+    elapsed = time.perf_counter() - start
+
+    assert table.count_rows() == rows
+    return {
+        "mode": mode,
+        "rows": rows,
+        "seconds": elapsed,
+        "rows_per_second": rows / elapsed,
+        # ru_maxrss is in kilobytes on Linux
+        "peak_rss_mb": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024,
+        "peak_rss_growth_mb": (
+            resource.getrusage(resource.RUSAGE_SELF).ru_maxrss - rss_before
+        )
+        / 1024,
+    }
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Benchmark dict vs Arrow fragment inserts."
+    )
+    parser.add_argument("--count", type=int, default=200000,
+                        help="Number of fragments to insert.")
+    parser.add_argument("--ndims", type=int, default=1024, help="Vector dimensions.")
+    parser.add_argument("--batch_size", type=int, default=DEFAULT_INGEST_BATCH_SIZE,
+                        help="Fragments per table.add call.")
+    parser.add_argument("--db_path", type=str, default=None,
+                        help="LanceDB folder for the benchmark tables (default: a "
+                             "temporary folder).")
+    parser.add_argument("--mode", choices=MODES, default=None, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.mode is not None:
+        # Child process: run one path and report its results as JSON
+        print(
+            json.dumps(
+                run_mode(
+                    args.mode, args.count, args.ndims, args.batch_size, args.db_path
+                )
+            )
+        )
+        return
+
+    with tempfile.TemporaryDirectory() as tmp:
+        db_path = args.db_path or os.path.join(tmp, "lancedb")
+        print(
+            f"\nInserting {args.count} fragments ({args.ndims} dims, batch size "
+            f"{args.batch_size})"
+        )
+        print(
+            f"{'path':>8} {'seconds':>10} {'rows/s':>12} {'peak RSS MB':>12} "
+            f"{'growth MB':>10}"
+        )
+        results = {}
+        for mode in MODES:
+            output = subprocess.run(
+                [
+                    sys.executable,
+                    __file__,
+                    "--mode",
+                    mode,
+                    "--count",
+                    str(args.count),
+                    "--ndims",
+                    str(args.ndims),
+                    "--batch_size",
+                    str(args.batch_size),
+                    "--db_path",
+                    db_path,
+                ],
+                check=True,
+                capture_output=True,
+                text=True,
+            ).stdout
+            result = json.loads(output.strip().splitlines()[-1])
+            results[mode] = result
+            print(
+                f"{mode:>8} {result['seconds']:>10.2f} "
+                f"{result['rows_per_second']:>12.0f} "
+                f"{result['peak_rss_mb']:>12.0f} {result['peak_rss_growth_mb']:>10.0f}"
+            )
+
+    speedup = results['arrow']['rows_per_second'] / results['dicts']['rows_per_second']
+    print(f"\nSpeedup: {speedup:.2f}x")
+
+if __name__ == "__main__":
+    main()
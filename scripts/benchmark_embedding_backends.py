@@ -0,0 +1,200 @@
+#!/usr/bin/env python
+
+"""
+Benchmark embedding backends: fragments/second, model load time, peak memory and
+retrieval recall@k against the first (reference) backend. Each backend runs in its
+own process so peak memory is reported separately.
+Backends are given as backend:model, with backend one of huggingface,
+huggingface-int8, onnx.
+Usage:
+    python scripts/benchmark_embedding_backends.py
+    python scripts/benchmark_embedding_backends.py --reports_folder ./data/reports \
+        --count 2000
+    python scripts/benchmark_embedding_backends.py \
+        --backends huggingface:BAAI/bge-en-icl \
+        huggingface-int8:BAAI/bge-small-en-v1.5 onnx:BAAI/bge-small-en-v1.5
+"""
+
+import os
+import sys
+import json
+import time
+import random
+import argparse
+import resource
+import tempfile
+import subprocess
+import numpy as np
+from reportfindingrefiner.config import (
+    DEFAULT_EMBEDDING_MODEL,
+    DEFAULT_EMBEDDING_BACKEND,
+)
+from reportfindingrefiner.section_splitter import SectionSplitter
+from reportfindingrefiner.services.report_sources import iter_folder_reports
+
+DEFAULT_BACKENDS = [
+    f"{DEFAULT_EMBEDDING_BACKEND}:{DEFAULT_EMBEDDING_MODEL}",
+    "huggingface:BAAI/bge-small-en-v1.5",
+    "huggingface-int8:BAAI/bge-small-en-v1.5",
+    "onnx:BAAI/bge-small-en-v1.5",
+]
+
+ORGANS = ["Liver", "Spleen", "Pancreas", "Kidneys", "Lungs", "Heart", "Bones", "Bowel"]
+STATEMENTS = [
+    "Normal in size and attenuation.",
+    "No focal lesion identified.",
+    "Unremarkable.",
+    "Mild diffuse fatty infiltration.",
+    "Small simple cyst, likely benign.",
+    "No acute abnormality.",
+    "Subcentimeter hypodensity, too small to characterize.",
+    "Postsurgical changes without evidence of recurrence.",
+]
+
+def load_fragment_texts(reports_folder: str, count: int, seed: int = 0):
+    """Up to `count` fragment texts from a reports folder, or from synthetic reports"""
+    rng = random.Random(seed)
+    if reports_folder:
+        splitter = SectionSplitter()
+        texts = []
+        for report in iter_folder_reports(reports_folder):
+            texts.extend(
+                text for _, text in splitter.split_into_fragments(report.read_text())
+            )
+            if len(texts) >= count:
+                break
+        return texts[:count]
+    return [
+        f"{rng.choice(ORGANS)}: {rng.choice(STATEMENTS)} {rng.choice(STATEMENTS)}"
+        for _ in range(count)
+    ]
+
+def run_backend(spec: str, texts_path: str, vectors_path: str) -> dict:
+    """Embed the fragment texts with one backend and return its timings"""
+    from reportfindingrefiner.data_models import get_embedding_function
+    from reportfindingrefiner.services.embedding_engine import EmbeddingEngine
+
+    backend, name = spec.split(":", 1)
+    with open(texts_path, "r", encoding="utf-8") as f:
+        texts = json.load(f)
+
+    start = time.perf_counter()
+    engine = EmbeddingEngine(
+        embed_fcn=get_embedding_function(name=name, backend=backend)
+    )
+    load_seconds = time.perf_counter() - start
+    # Warm up so one-off initialisation is not counted as throughput
+    engine.embed(texts[:8])
+
+    start = time.perf_counter()
+    vectors = np.stack(engine.embed(texts)).astype(np.float32)
+    elapsed = time.perf_counter() - start
+    np.save(vectors_path, vectors)
+
+    return {
+        "backend": spec,
+        "ndims": int(vectors.shape[1]),
+        "load_seconds": load_seconds,
+        "seconds": elapsed,
+        "fragments_per_second": len(texts) / elapsed,
+        # ru_maxrss is in kilobytes on Linux
+        "peak_rss_mb": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024,
+    }
+
+def top_k_neighbours(vectors: np.ndarray, queries: np.ndarray, k: int) -> np.ndarray:
+    """
+    Indices of the k most cosine-similar fragments to each query fragment, excluding
+    itself
+    """
+    normed = vectors / np.maximum(np.linalg.norm(vectors, axis=1, keepdims=True), 1e-12)
+    scores = normed[queries] @ normed.T
+    scores[np.arange(len(queries)), queries] = -np.inf
+    return np.argsort(-scores, axis=1)[:, :k]
+
+def recall_at_k(reference: np.ndarray, candidate: np.ndarray) -> float:
+    """Mean fraction of the reference neighbours that the candidate also returns"""
+    k = reference.shape[1]
+    return float(
+        np.mean([len(set(r) & set(c)) / k for r, c in zip(reference, candidate)])
+    )
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark embedding backends.")
+    parser.add_argument("--backends", type=str, nargs="+", default=DEFAULT_BACKENDS,
+                        help="backend:model specs; the first one is the recall "
+                             "reference.")
+    parser.add_argument("--reports_folder", type=str, default=None,
+                        help="Folder of .txt reports to use instead of synthetic "
+                             "fragments.")
+    parser.add_argument("--count", type=int, default=2000,
+                        help="Number of fragments to embed.")
+    parser.add_argument("--queries", type=int, default=200,
+                        help="Fragments used as recall queries.")
+    parser.add_argument("--k", type=int, default=10,
+                        help="Neighbours compared for recall@k.")
+    parser.add_argument("--output", type=str, default=None,
+                        help="Also write the results as JSON.")
+    parser.add_argument("--run", type=str, nargs=3, default=None,
+                        help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.run is not None:
+        # Child process: run one backend and report its results as JSON
+        print(json.dumps(run_backend(*args.run)))
+        return
+
+    texts = load_fragment_texts(args.reports_folder, args.count)
+    rng = np.random.default_rng(0)
+    queries = rng.choice(len(texts), size=min(args.queries, len(texts)), replace=False)
+    k = min(args.k, len(texts) - 1)
+
+    results = []
+    with tempfile.TemporaryDirectory() as tmp:
+        texts_path = os.path.join(tmp, "texts.json")
+        with open(texts_path, "w", encoding="utf-8") as f:
+            json.dump(texts, f)
+
+        print(
+            f"\nEmbedding {len(texts)} fragments; recall@{k} over {len(queries)} "
+            f"queries vs {args.backends[0]}"
+        )
+        print(
+            f"{'backend':<48} {'dims':>5} {'load s':>8} {'frag/s':>9} "
+            f"{'peak RSS MB':>12} {'recall':>7}"
+        )
+        reference = None
+        for i, spec in enumerate(args.backends):
+            vectors_path = os.path.join(tmp, f"vectors_{i}.npy")
+            output = subprocess.run(
+                [sys.executable, __file__, "--run", spec, texts_path, vectors_path],
+                check=True, capture_output=True, text=True,
+            ).stdout
+            result = json.loads(output.strip().splitlines()[-1])
+            neighbours = top_k_neighbours(np.load(vectors_path), queries, k)
+            if reference is None:
+                reference = neighbours
+            result["recall_at_k"] = recall_at_k(reference, neighbours)
+            results.append(result)
+            print(
+                f"{spec:<48} {result['ndims']:>5} {result['load_seconds']:>8.1f} "
+                f"{result['fragments_per_second']:>9.1f} "
+                f"{result['peak_rss_mb']:>12.0f} "
+                f"{result['recall_at_k']:>7.3f}"
+            )
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(
+                {
+                    "fragments": len(texts),
+                    "queries": len(queries),
+                    "k": k,
+                    "results": results,
+                },
+                f,
+                indent=2,
+            )
+        print(f"\nResults written to {args.output}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,101 @@
+#!/usr/bin/env python
+
+"""
+Benchmark report fragmenting throughput (reports/second) against worker count.
+Usage:
+    python scripts/benchmark_fragmenting.py
+    python scripts/benchmark_fragmenting.py --reports_folder ./data/reports \
+        --workers 1 2 4 8
+"""
+
+import argparse
+import random
+import time
+from reportfindingrefiner.config import DEFAULT_SPLIT_CHUNK_SIZE
+from reportfindingrefiner.data_models import Report
+from reportfindingrefiner.section_splitter import SectionSplitter
+from reportfindingrefiner.services.ingestion import (
+    ReportToIngest,
+    iter_reports_from_folder,
+    iter_split_reports,
+)
+
+ORGANS = ["Liver", "Spleen", "Pancreas", "Kidneys", "Lungs", "Heart", "Bones", "Bowel"]
+STATEMENTS = [
+    "Normal in size and attenuation.",
+    "No focal lesion identified.",
+    "Unremarkable.",
+    "Mild diffuse fatty infiltration.",
+    "Small simple cyst, likely benign.",
+    "No acute abnormality.",
+]
+
+def make_synthetic_reports(count: int, seed: int = 0):
+    """Build simple Header/Findings/Impression reports in memory"""
+    rng = random.Random(seed)
+    reports = []
+    for i in range(count):
+        findings = "\n".join(
+            f"{organ}: {rng.choice(STATEMENTS)}" for organ in rng.sample(ORGANS, k=5)
+        )
+        text = (
+            f"Header: CT abdomen and pelvis with contrast, study {i}.\n"
+            f"Findings:\n{findings}\n"
+            f"Impression: {rng.choice(STATEMENTS)}\n"
+        )
+        reports.append(Report(id=f"synthetic_{i}.txt", text=text))
+    return reports
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Benchmark parallel report fragmenting."
+    )
+    parser.add_argument("--reports_folder", type=str, default=None,
+                        help="Folder of .txt reports to use instead of synthetic "
+                             "reports.")
+    parser.add_argument("--count", type=int, default=50000,
+                        help="Number of synthetic reports.")
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 2, 4, 8],
+                        help="Worker counts to benchmark.")
+    parser.add_argument("--chunk_size", type=int, default=DEFAULT_SPLIT_CHUNK_SIZE,
+                        help="Reports per work unit.")
+    parser.add_argument("--unordered", action="store_true",
+                        help="Yield results in completion order.")
+    args = parser.parse_args()
+
+    if args.reports_folder:
+        reports = list(iter_reports_from_folder(args.reports_folder))
+    else:
+        reports = make_synthetic_reports(args.count)
+    items = [
+        ReportToIngest(report=r, content_hash="", mtime=0.0, stale=False)
+        for r in reports
+    ]
+    splitter = SectionSplitter()
+
+    print(f"\nFragmenting {len(items)} reports (chunk size {args.chunk_size})")
+    print(
+        f"{'workers':>8} {'seconds':>10} {'reports/s':>12} {'fragments':>10} "
+        f"{'speedup':>8}"
+    )
+    baseline = None
+    for workers in args.workers:
+        start = time.perf_counter()
+        fragment_count = 0
+        for _, fragments in iter_split_reports(
+            items, splitter,
+            workers=workers,
+            chunk_size=args.chunk_size,
+            ordered=not args.unordered,
+        ):
+            fragment_count += len(fragments)
+        elapsed = time.perf_counter() - start
+        rate = len(items) / elapsed
+        baseline = baseline or rate
+        print(
+            f"{workers:>8} {elapsed:>10.2f} {rate:>12.0f} {fragment_count:>10} "
+            f"{rate / baseline:>7.2f}x"
+        )
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,191 @@
+#!/usr/bin/env python
+
+"""
+Benchmark package import time and CLI startup with `python -X importtime`, and fail
+(exit status 1) when a module's median import time is over its budget, so it can run
+as a check in CI.
+Usage:
+    python scripts/benchmark_import_time.py
+    python scripts/benchmark_import_time.py \
+        --modules reportfindingrefiner reportfindingrefiner.services.search_service
+    python scripts/benchmark_import_time.py --budget reportfindingrefiner=100 \
+        --repeat 9 --top 15
+"""
+
+import os
+import re
+import sys
+import time
+import argparse
+import statistics
+import subprocess
+from typing import Dict, List, Tuple
+
+SCRIPTS_DIR = os.path.dirname(os.path.abspath(__file__))
+
+# Median import time budgets in milliseconds
+DEFAULT_BUDGETS = {
+    "reportfindingrefiner": 100,
+    "reportfindingrefiner.config": 100,
+    "reportfindingrefiner.section_splitter": 100,
+}
+DEFAULT_MODULES = [
+    "reportfindingrefiner",
+    "reportfindingrefiner.config",
+    "reportfindingrefiner.section_splitter",
+    "reportfindingrefiner.services.finding_model_tools",
+    "reportfindingrefiner.services.ingestion",
+    "reportfindingrefiner.services.search_service",
+]
+DEFAULT_SCRIPTS = ["list_finding_models.py", "ingest_reports.py"]
+
+# e.g. "import time:       812 |      10427 |   reportfindingrefiner.config"
+_IMPORT_LINE = re.compile(r"import time:\s+(\d+)\s+\|\s+(\d+)\s+\|( *)(\S+)")
+
+def parse_importtime(stderr: str) -> List[Tuple[int, str, int]]:
+    """(nesting depth, module, cumulative microseconds) for each `-X importtime` line"""
+    entries = []
+    for line in stderr.splitlines():
+        match = _IMPORT_LINE.match(line)
+        if match:
+            entries.append(
+                (len(match.group(3)) // 2, match.group(4), int(match.group(2)))
+            )
+    return entries
+
+def run_importtime(statement: str) -> List[Tuple[int, str, int]]:
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", statement],
+        check=True, capture_output=True, text=True,
+    )
+    return parse_importtime(result.stderr)
+
+def measure_import(module: str, startup_modules: set) -> Tuple[float, Dict[str, int]]:
+    """
+    Import time of `module` in a fresh interpreter in milliseconds, and the cumulative
+    microseconds of each top-level package it pulled in. Modules the interpreter
+    imports at startup are left out.
+    """
+    entries = [
+        e for e in run_importtime(f"import {module}") if e[1] not in startup_modules
+    ]
+    total_us = sum(cumulative for depth, _, cumulative in entries if depth == 0)
+    packages: Dict[str, int] = {}
+    for _, name, cumulative in entries:
+        root = name.split(".")[0]
+        if name == root:
+            packages[root] = max(packages.get(root, 0), cumulative)
+    return total_us / 1000, packages
+
+def measure_script_help(script: str) -> float:
+    """Wall-clock seconds for `python scripts/<script> --help`"""
+    start = time.perf_counter()
+    subprocess.run(
+        [sys.executable, os.path.join(SCRIPTS_DIR, script), "--help"],
+        check=True, capture_output=True, text=True,
+    )
+    return time.perf_counter() - start
+
+
+def median_import_ms(
+    module: str, startup_modules: set, repeat: int
+) -> Tuple[float, Dict[str, int]]:
+    """
+    Median import time of `module` over `repeat` fresh interpreters, and the packages of
+    the last run
+    """
+    runs = [measure_import(module, startup_modules) for _ in range(repeat)]
+    return statistics.median(ms for ms, _ in runs), runs[-1][1]
+
+
+def check_budgets(
+    budgets: Dict[str, float] = DEFAULT_BUDGETS, repeat: int = 5
+) -> Dict[str, float]:
+    """
+    Measure every module that has a budget and return the median import time in
+    milliseconds of those over it (empty when all are within budget).
+    """
+    startup_modules = {name for _, name, _ in run_importtime("pass")}
+    over_budget = {}
+    for module, budget in budgets.items():
+        median_ms, _ = median_import_ms(module, startup_modules, repeat)
+        if median_ms > budget:
+            over_budget[module] = median_ms
+    return over_budget
+
+def parse_budgets(values: List[str]) -> Dict[str, float]:
+    budgets = dict(DEFAULT_BUDGETS)
+    for value in values:
+        module, _, ms = value.partition("=")
+        budgets[module] = float(ms)
+    return budgets
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Benchmark import time and CLI startup."
+    )
+    parser.add_argument("--modules", type=str, nargs="+", default=DEFAULT_MODULES,
+                        help="Modules to import.")
+    parser.add_argument("--scripts", type=str, nargs="*", default=DEFAULT_SCRIPTS,
+                        help="Scripts in scripts/ whose --help startup time is "
+                             "measured.")
+    parser.add_argument("--budget", type=str, nargs="*", default=[],
+                        help="module=milliseconds budgets, added to the defaults.")
+    parser.add_argument("--repeat", type=int, default=5,
+                        help="Fresh interpreters per measurement (median).")
+    parser.add_argument("--top", type=int, default=8,
+                        help="Slowest imported packages to list per module.")
+    args = parser.parse_args()
+
+    budgets = parse_budgets(args.budget)
+    startup_modules = {name for _, name, _ in run_importtime("pass")}
+
+    print(f"\nImport time, median of {args.repeat} fresh interpreters")
+    print(f"{'module':<52} {'ms':>9} {'budget':>8}")
+    over_budget = []
+    for module in args.modules:
+        try:
+            median_ms, packages = median_import_ms(module, startup_modules, args.repeat)
+        except subprocess.CalledProcessError as e:
+            print(
+                f"{module:<52} failed: "
+                f"{e.stderr.strip().splitlines()[-1] if e.stderr else e}"
+            )
+            continue
+        budget = budgets.get(module)
+        status = ""
+        if budget is not None:
+            status = f"{budget:>8.0f}" + (
+                "  ❌ over budget" if median_ms > budget else "  ✅"
+            )
+            if median_ms > budget:
+                over_budget.append(module)
+        print(f"{module:<52} {median_ms:>9.1f} {status}")
+
+        slowest = sorted(packages.items(), key=lambda item: item[1], reverse=True)[
+            : args.top
+        ]
+        print("    " + ", ".join(f"{name} {us / 1000:.0f}ms" for name, us in slowest))
+
+    if args.scripts:
+        print(f"\nCLI startup (--help), median of {args.repeat} runs")
+        for script in args.scripts:
+            try:
+                seconds = statistics.median(
+                    measure_script_help(script) for _ in range(args.repeat)
+                )
+            except subprocess.CalledProcessError as e:
+                print(
+                    f"{script:<52} failed: "
+                    f"{e.stderr.strip().splitlines()[-1] if e.stderr else e}"
+                )
+                continue
+            print(f"{script:<52} {seconds * 1000:>9.1f}")
+
+    if over_budget:
+        print(f"\n❌ Over the import time budget: {', '.join(over_budget)}")
+        sys.exit(1)
+    print("\n✅ All modules within their import time budgets")
+
+if __name__ == "__main__":
+    main()
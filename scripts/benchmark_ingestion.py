@@ -0,0 +1,429 @@
+#!/usr/bin/env python
+
+"""
+Benchmark the ingestion pipeline on a reproducible synthetic corpus: SectionSplitter,
+fragment preparation (column buffers and Arrow batches), embedding and LanceDB insert
+on their own, and the whole streaming pipeline end to end. Each stage runs in its own
+process and reports throughput, p50/p99 batch latency and peak RSS.
+
+Results are printed as a table; with --output they are also written as JSON (or
+appended as one line to a .jsonl file) with the corpus, settings and git commit, so
+runs can be compared over time.
+Usage:
+    python scripts/benchmark_ingestion.py
+    python scripts/benchmark_ingestion.py --count 20000 --stages split prepare insert
+    python scripts/benchmark_ingestion.py --count 5000 --duplication_rate 0.3 --dedup \
+        --workers 4
+    python scripts/benchmark_ingestion.py --output benchmarks/ingestion.jsonl
+"""
+
+import os
+import sys
+import json
+import time
+import argparse
+import platform
+import resource
+import tempfile
+import subprocess
+from datetime import datetime, timezone
+from typing import Iterable, List, Tuple
+import numpy as np
+import pyarrow as pa
+from reportfindingrefiner.config import (
+    DEFAULT_INGEST_BATCH_SIZE,
+    DEFAULT_MAX_IN_FLIGHT_BATCHES,
+    DEFAULT_INGEST_WORKERS,
+    DEFAULT_SPLIT_CHUNK_SIZE,
+    DEFAULT_EMBEDDING_MODEL,
+    DEFAULT_EMBEDDING_BACKEND,
+    DEFAULT_EMBEDDING_NDIMS,
+    DEFAULT_EMBED_MAX_TOKENS_PER_BATCH,
+    DEFAULT_EMBED_NUM_THREADS,
+)
+from reportfindingrefiner.synthetic_reports import (
+    generate_synthetic_reports,
+    write_synthetic_reports,
+)
+from generate_synthetic_reports import add_corpus_arguments, corpus_spec_from_args
+
+STAGES = ["split", "prepare", "embed", "insert", "end_to_end"]
+
+def fragment_schema(ndims: int) -> pa.Schema:
+    """The fragment table schema, without an embedding function attached"""
+    return pa.schema([
+        pa.field("report_id", pa.string(), nullable=False),
+        pa.field("section", pa.string()),
+        pa.field("sequence_number", pa.int64(), nullable=False),
+        pa.field("text", pa.string(), nullable=False),
+        pa.field("vector", pa.list_(pa.float32(), ndims)),
+    ])
+
+def load_split_reports(corpus_path: str):
+    """The corpus as ReportToIngest items with their fragments (not timed)"""
+    from reportfindingrefiner.data_models import Report
+    from reportfindingrefiner.section_splitter import SectionSplitter
+    from reportfindingrefiner.services.ingestion import ReportToIngest
+    from reportfindingrefiner.services.report_sources import iter_jsonl_reports
+
+    splitter = SectionSplitter()
+    split = []
+    for source in iter_jsonl_reports(corpus_path):
+        item = ReportToIngest(
+            report=Report(id=source.report_id, text=source.read_text()),
+            content_hash="",
+            mtime=0.0,
+            stale=False,
+        )
+        split.append((item, splitter.split_into_fragments(item.report.text)))
+    return split
+
+def timed(batches: Iterable, latencies: List[float]) -> Iterable:
+    """
+    Yield from `batches`, appending to `latencies` the time from one batch being
+    handed out to the next one, i.e. producing plus processing each batch.
+    """
+    last = time.perf_counter()
+    for batch in batches:
+        yield batch
+        now = time.perf_counter()
+        latencies.append(now - last)
+        last = now
+
+
+def stage_result(
+    stage: str,
+    reports: int,
+    fragments: int,
+    seconds: float,
+    latencies: List[float],
+    **extra,
+) -> dict:
+    return {
+        "stage": stage,
+        "reports": reports,
+        "fragments": fragments,
+        "batches": len(latencies),
+        "seconds": seconds,
+        "reports_per_second": reports / seconds if seconds else 0.0,
+        "fragments_per_second": fragments / seconds if seconds else 0.0,
+        "batch_p50_ms": (
+            float(np.percentile(latencies, 50)) * 1000 if latencies else 0.0
+        ),
+        "batch_p99_ms": (
+            float(np.percentile(latencies, 99)) * 1000 if latencies else 0.0
+        ),
+        # ru_maxrss is in kilobytes on Linux
+        "peak_rss_mb": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024,
+        **extra,
+    }
+
+
+def random_record_batches(
+    split, batch_size: int, ndims: int
+) -> Tuple[pa.Schema, List[pa.RecordBatch], List[float]]:
+    """
+    Build the Arrow batches for the split corpus with random vectors, timing each batch
+    """
+    from reportfindingrefiner.services.ingestion import iter_fragment_batches
+
+    schema = fragment_schema(ndims)
+    # A batch holds up to batch_size fragments plus the rest of its last report
+    pool_size = batch_size + max((len(fragments) for _, fragments in split), default=0)
+    vector_pool = list(
+        np.random.default_rng(0).standard_normal((pool_size, ndims), dtype=np.float32)
+    )
+    record_batches, latencies = [], []
+    for batch in timed(iter_fragment_batches(split, batch_size), latencies):
+        record_batches.append(
+            batch.fragments.to_record_batch(vector_pool[: len(batch.fragments)], schema)
+        )
+    return schema, record_batches, latencies
+
+
+def run_stage(
+    stage: str, corpus_path: str, db_path: str, args: argparse.Namespace
+) -> dict:
+    """Run one stage over the corpus and return its timings"""
+    from reportfindingrefiner.services.pipeline import batched
+
+    if stage == "end_to_end":
+        return run_end_to_end(corpus_path, db_path, args)
+
+    if stage == "split":
+        from reportfindingrefiner.section_splitter import SectionSplitter
+        from reportfindingrefiner.services.report_sources import iter_jsonl_reports
+
+        texts = [source.read_text() for source in iter_jsonl_reports(corpus_path)]
+        splitter = SectionSplitter()
+        latencies, fragments = [], 0
+        start = time.perf_counter()
+        for chunk in timed(batched(texts, DEFAULT_SPLIT_CHUNK_SIZE), latencies):
+            fragments += sum(len(splitter.split_into_fragments(text)) for text in chunk)
+        return stage_result(
+            stage, len(texts), fragments, time.perf_counter() - start, latencies
+        )
+
+    split = load_split_reports(corpus_path)
+    fragments = sum(len(f) for _, f in split)
+
+    if stage == "prepare":
+        start = time.perf_counter()
+        _, _, latencies = random_record_batches(split, args.batch_size, args.ndims)
+        return stage_result(
+            stage, len(split), fragments, time.perf_counter() - start, latencies
+        )
+
+    if stage == "embed":
+        from reportfindingrefiner.services.embedding_engine import (
+            EmbeddingEngine,
+            set_embedding_threads,
+        )
+
+        texts = [text for _, f in split for _, text in f]
+        start = time.perf_counter()
+        set_embedding_threads(args.embed_threads)
+        engine = EmbeddingEngine(max_tokens_per_batch=args.max_tokens_per_batch)
+        load_seconds = time.perf_counter() - start
+        # Warm up so one-off initialisation is not counted as throughput
+        engine.embed(texts[:8])
+        latencies = []
+        start = time.perf_counter()
+        for chunk in timed(batched(texts, args.batch_size), latencies):
+            engine.embed(chunk)
+        return stage_result(
+            stage,
+            len(split),
+            fragments,
+            time.perf_counter() - start,
+            latencies,
+            load_seconds=load_seconds,
+            ndims=engine.ndims(),
+        )
+
+    if stage == "insert":
+        import lancedb
+
+        schema, record_batches, _ = random_record_batches(
+            split, args.batch_size, args.ndims
+        )
+        table = lancedb.connect(db_path).create_table(
+            stage, schema=schema, mode="overwrite"
+        )
+        latencies = []
+        start = time.perf_counter()
+        for record_batch in timed(record_batches, latencies):
+            table.add(record_batch)
+        seconds = time.perf_counter() - start
+        assert table.count_rows() == fragments
+        return stage_result(
+            stage, len(split), fragments, seconds, latencies, ndims=args.ndims
+        )
+
+    raise ValueError(f"Unknown stage: {stage}")
+
+def run_end_to_end(corpus_path: str, db_path: str, args: argparse.Namespace) -> dict:
+    """
+    The streaming pipeline of `ingest_source` (read -> split -> [dedup] -> batch ->
+    embed -> insert), timed per written batch. The model is loaded before timing
+    and no embedding cache is used, so every fragment goes through the model.
+    """
+    from reportfindingrefiner.section_splitter import SectionSplitter
+    from reportfindingrefiner.lance_db import connect_db, create_fragment_table
+    from reportfindingrefiner.services.dedup import NearDuplicateIndex
+    from reportfindingrefiner.services.embedding_engine import (
+        EmbeddingEngine,
+        set_embedding_threads,
+    )
+    from reportfindingrefiner.services.manifest import (
+        IngestionManifest,
+        manifest_path_for,
+    )
+    from reportfindingrefiner.services.pipeline import prefetch
+    from reportfindingrefiner.services.report_sources import iter_jsonl_reports
+    from reportfindingrefiner.services.ingestion import (
+        IngestionStats,
+        iter_deduplicated,
+        iter_fragment_batches,
+        iter_reports_to_ingest,
+        iter_split_reports,
+        write_fragment_batch,
+    )
+
+    start = time.perf_counter()
+    set_embedding_threads(args.embed_threads)
+    engine = EmbeddingEngine(max_tokens_per_batch=args.max_tokens_per_batch)
+    table = create_fragment_table(connect_db(db_path), table_name="end_to_end")
+    load_seconds = time.perf_counter() - start
+    manifest = IngestionManifest(manifest_path_for(db_path, "end_to_end"))
+    stats = IngestionStats()
+
+    latencies = []
+    start = time.perf_counter()
+    reports = iter_reports_to_ingest(
+        iter_jsonl_reports(corpus_path), manifest, stats, incremental=False
+    )
+    split_reports = iter_split_reports(reports, SectionSplitter(), workers=args.workers)
+    if args.dedup:
+        split_reports = iter_deduplicated(split_reports, NearDuplicateIndex(), stats)
+    batches = prefetch(
+        iter_fragment_batches(split_reports, args.batch_size), args.max_in_flight
+    )
+    for batch in timed(batches, latencies):
+        write_fragment_batch(table, batch, manifest, engine)
+        stats.fragments_written += len(batch.fragments)
+    seconds = time.perf_counter() - start
+
+    assert table.count_rows() == stats.fragments_written
+    return stage_result(
+        "end_to_end",
+        stats.reports_scanned,
+        stats.fragments_written,
+        seconds,
+        latencies,
+        load_seconds=load_seconds,
+        ndims=engine.ndims(),
+        reports_duplicate=stats.reports_duplicate,
+    )
+
+def git_commit() -> str:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            cwd=os.path.dirname(os.path.abspath(__file__)),
+            check=True, capture_output=True, text=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return ""
+
+def write_results(results: dict, path: str) -> None:
+    """Append one line to a .jsonl history file, or write a JSON file"""
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    if path.endswith(".jsonl"):
+        with open(path, "a", encoding="utf-8") as f:
+            f.write(json.dumps(results) + "\n")
+    else:
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(results, f, indent=2)
+
+def stage_arguments(args: argparse.Namespace) -> List[str]:
+    """Command-line arguments passed on to the per-stage processes"""
+    argv = [
+        "--batch_size", str(args.batch_size),
+        "--max_in_flight", str(args.max_in_flight),
+        "--workers", str(args.workers),
+        "--ndims", str(args.ndims),
+        "--max_tokens_per_batch", str(args.max_tokens_per_batch),
+        "--embed_threads", str(args.embed_threads),
+    ]
+    return argv + (["--dedup"] if args.dedup else [])
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Benchmark ingestion stages on a synthetic corpus."
+    )
+    add_corpus_arguments(parser)
+    parser.add_argument("--stages", choices=STAGES, nargs="+", default=STAGES,
+                        help="Stages to run.")
+    parser.add_argument("--batch_size", type=int, default=DEFAULT_INGEST_BATCH_SIZE,
+                        help="Fragments per batch (split batches are report chunks of "
+                             "the split chunk size).")
+    parser.add_argument("--max_in_flight", type=int,
+                        default=DEFAULT_MAX_IN_FLIGHT_BATCHES,
+                        help="Batches buffered ahead of embedding in the end-to-end "
+                             "run.")
+    parser.add_argument("--workers", type=int, default=DEFAULT_INGEST_WORKERS,
+                        help="Splitting processes in the end-to-end run.")
+    parser.add_argument("--dedup", action="store_true",
+                        help="Skip near-duplicate reports in the end-to-end run.")
+    parser.add_argument("--ndims", type=int, default=DEFAULT_EMBEDDING_NDIMS or 1024,
+                        help="Dimensions of the random vectors used by the prepare "
+                             "and insert stages.")
+    parser.add_argument("--max_tokens_per_batch", type=int,
+                        default=DEFAULT_EMBED_MAX_TOKENS_PER_BATCH,
+                        help="Token budget for each model forward pass.")
+    parser.add_argument("--embed_threads", type=int, default=DEFAULT_EMBED_NUM_THREADS,
+                        help="Torch CPU threads used for embedding (0 = torch "
+                             "default).")
+    parser.add_argument("--output", type=str, default=None,
+                        help="Write the results as JSON, or append them to a .jsonl "
+                             "file.")
+    parser.add_argument("--run", type=str, nargs=3, default=None,
+                        help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.run is not None:
+        # Child process: run one stage and report its results as JSON
+        stage, corpus_path, db_path = args.run
+        print(json.dumps(run_stage(stage, corpus_path, db_path, args)))
+        return
+
+    spec = corpus_spec_from_args(args)
+    results = {
+        "timestamp": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "git_commit": git_commit(),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "cpu_count": os.cpu_count(),
+        "embedding_model": DEFAULT_EMBEDDING_MODEL,
+        "embedding_backend": DEFAULT_EMBEDDING_BACKEND,
+        "corpus": spec.model_dump(),
+        "settings": {
+            "batch_size": args.batch_size,
+            "max_in_flight": args.max_in_flight,
+            "workers": args.workers,
+            "dedup": args.dedup,
+            "ndims": args.ndims,
+            "max_tokens_per_batch": args.max_tokens_per_batch,
+            "embed_threads": args.embed_threads,
+        },
+        "stages": {},
+    }
+
+    with tempfile.TemporaryDirectory() as tmp:
+        corpus_path = os.path.join(tmp, "corpus.jsonl")
+        write_synthetic_reports(generate_synthetic_reports(spec), corpus_path)
+
+        print(
+            f"\nIngesting {spec.count} synthetic reports (batch size {args.batch_size})"
+        )
+        print(f"{'stage':<12} {'reports/s':>10} {'frag/s':>10} {'batches':>8} "
+              f"{'p50 ms':>9} {'p99 ms':>9} {'peak RSS MB':>12}")
+        for stage in args.stages:
+            try:
+                output = subprocess.run(
+                    [
+                        sys.executable,
+                        __file__,
+                        "--run",
+                        stage,
+                        corpus_path,
+                        os.path.join(tmp, "lancedb"),
+                        *stage_arguments(args),
+                    ],
+                    check=True,
+                    capture_output=True,
+                    text=True,
+                ).stdout
+            except subprocess.CalledProcessError as e:
+                print(
+                    f"{stage:<12} failed: "
+                    f"{e.stderr.strip().splitlines()[-1] if e.stderr else e}"
+                )
+                continue
+            result = json.loads(output.strip().splitlines()[-1])
+            results["stages"][stage] = result
+            print(
+                f"{stage:<12} {result['reports_per_second']:>10.0f} "
+                f"{result['fragments_per_second']:>10.0f} "
+                f"{result['batches']:>8} {result['batch_p50_ms']:>9.1f} "
+                f"{result['batch_p99_ms']:>9.1f} "
+                f"{result['peak_rss_mb']:>12.0f}"
+            )
+
+    if args.output:
+        write_results(results, args.output)
+        print(f"\nResults written to {args.output}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,198 @@
+#!/usr/bin/env python
+
+"""
+Micro-benchmark the compiled SectionSplitter against the previous implementation
+on a synthetic corpus, and check that both produce identical fragments.
+Usage:
+    python scripts/benchmark_section_splitter.py
+    python scripts/benchmark_section_splitter.py --count 100000 --repeat 3
+"""
+
+import re
+import sys
+import time
+import random
+import argparse
+from reportfindingrefiner.section_splitter import SectionSplitter
+
+
+class LegacySectionSplitter:
+    """
+    The previous splitter, kept verbatim as the reference for output and speed.
+    """
+
+    def __init__(self):
+        self.main_sections = ["Header:", "Findings:", "Impression:"]
+
+    def split_into_sections(self, report_text):
+        pattern = r"(" + "|".join(map(re.escape, self.main_sections)) + r")"
+        parts = re.split(pattern, report_text)
+        results = []
+        current_section_label = None
+        current_text_chunks = []
+
+        for part in parts:
+            part_stripped = part.strip()
+            if not part_stripped:
+                continue
+
+            if part in self.main_sections:
+                if current_section_label and current_text_chunks:
+                    combined_text = " ".join(current_text_chunks).strip()
+                    results.append((current_section_label, combined_text))
+                current_section_label = part_stripped
+                current_text_chunks = []
+            else:
+                current_text_chunks.append(part_stripped)
+
+        if current_section_label and current_text_chunks:
+            combined_text = " ".join(current_text_chunks).strip()
+            results.append((current_section_label, combined_text))
+
+        if not results and report_text.strip():
+            results.append((None, report_text.strip()))
+
+        return results
+
+    def create_smaller_fragments(self, section_fragments):
+        smaller_fragments = []
+        for label, text in section_fragments:
+            if label == "Findings:" and ':' in text:
+                lines = text.split('\n')
+                current_fragment = []
+
+                for line in lines:
+                    if ':' in line and not line.endswith(':'):
+                        if current_fragment:
+                            fragment_text = ' '.join(current_fragment).strip()
+                            smaller_fragments.append((label, fragment_text))
+                            current_fragment = []
+                        smaller_fragments.append((label, line.strip()))
+                    else:
+                        current_fragment.append(line)
+
+                if current_fragment:
+                    fragment_text = ' '.join(current_fragment).strip()
+                    smaller_fragments.append((label, fragment_text))
+            else:
+                smaller_fragments.append((label, text.strip()))
+
+        return smaller_fragments
+
+    def split_into_fragments(self, report_text):
+        return self.create_smaller_fragments(self.split_into_sections(report_text))
+
+
+ORGANS = [
+    "Liver",
+    "Spleen",
+    "Pancreas",
+    "Kidneys",
+    "Lungs",
+    "Heart",
+    "Bones",
+    "Bowel",
+    "Adrenals",
+]
+STATEMENTS = [
+    "Normal in size and attenuation.",
+    "No focal lesion identified.",
+    "Unremarkable.",
+    "Mild diffuse fatty infiltration.",
+    "Small simple cyst, likely benign.",
+    "No acute abnormality.",
+    "Status post cholecystectomy.",
+]
+
+def make_report(rng: random.Random, i: int) -> str:
+    """Build one synthetic report, including the irregular layouts seen in real data"""
+    lines = []
+    if rng.random() < 0.1:
+        lines.append("ACCESSION 12345 (text before the first heading)")
+    if rng.random() < 0.9:
+        lines.append(f"Header: CT abdomen and pelvis with contrast, study {i}.")
+    lines.append("Findings:")
+    for organ in rng.sample(ORGANS, k=rng.randint(2, 7)):
+        lines.append(f"{organ}: {rng.choice(STATEMENTS)}")
+        roll = rng.random()
+        if roll < 0.15:
+            lines.append(rng.choice(STATEMENTS))  # continuation line without a colon
+        elif roll < 0.2:
+            lines.append("")  # blank line inside the section
+        elif roll < 0.25:
+            lines.append("Additional comments:")  # line ending with a colon
+    if rng.random() < 0.95:
+        lines.append(f"Impression: {rng.choice(STATEMENTS)}")
+    if rng.random() < 0.05:
+        lines.append("Impression:")  # empty trailing section
+    return "\n".join(lines) + "\n"
+
+def time_splitter(splitter, texts, repeat):
+    """Return the best wall time over `repeat` runs and the fragments of the last run"""
+    best = float("inf")
+    outputs = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        outputs = [splitter.split_into_fragments(text) for text in texts]
+        best = min(best, time.perf_counter() - start)
+    return best, outputs
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Benchmark the compiled SectionSplitter."
+    )
+    parser.add_argument("--count", type=int, default=100000,
+                        help="Number of synthetic reports.")
+    parser.add_argument("--repeat", type=int, default=3,
+                        help="Runs per implementation (best is reported).")
+    parser.add_argument("--seed", type=int, default=0,
+                        help="Random seed for the synthetic corpus.")
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    texts = [make_report(rng, i) for i in range(args.count)]
+    print(f"\nSplitting {len(texts)} synthetic reports (best of {args.repeat})")
+
+    legacy_time, legacy_out = time_splitter(LegacySectionSplitter(), texts, args.repeat)
+    compiled_time, compiled_out = time_splitter(SectionSplitter(), texts, args.repeat)
+
+    mismatches = [i for i, (a, b) in enumerate(zip(legacy_out, compiled_out)) if a != b]
+    fragment_count = sum(len(f) for f in compiled_out)
+
+    print(f"{'implementation':>16} {'seconds':>10} {'reports/s':>12}")
+    print(f"{'legacy':>16} {legacy_time:>10.2f} {len(texts) / legacy_time:>12.0f}")
+    print(
+        f"{'compiled':>16} {compiled_time:>10.2f} {len(texts) / compiled_time:>12.0f}"
+    )
+    print(f"\nSpeedup: {legacy_time / compiled_time:.2f}x ({fragment_count} fragments)")
+
+    if mismatches:
+        i = mismatches[0]
+        print(f"\n❌ {len(mismatches)} reports differ; first mismatch (report {i}):")
+        print(f"  legacy:   {legacy_out[i]}")
+        print(f"  compiled: {compiled_out[i]}")
+        sys.exit(1)
+    print("✅ Outputs identical for every report")
+
+    # Configured headings: case-insensitive matching maps to the configured label
+    splitter = SectionSplitter(
+        headings=[
+            "TECHNIQUE:",
+            "COMPARISON:",
+            "CLINICAL HISTORY:",
+            "FINDINGS:",
+            "IMPRESSION:",
+        ],
+        subsection_headings=["FINDINGS:"],
+        ignore_case=True,
+    )
+    sample = (
+        "Clinical history: pain.\nTechnique: CT.\nComparison: none.\n"
+        "Findings:\nLiver: normal.\nImpression: ok."
+    )
+    print("\nConfigured headings example:")
+    for label, text in splitter.split_into_fragments(sample):
+        print(f"  {label:<18} {text}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,229 @@
+#!/usr/bin/env python
+
+"""
+Report recall@k and query latency of the ANN vector index against exact search,
+over a grid of nprobes and refine_factor settings, to pick the per-query defaults
+(REPORT_REFINER_NPROBES / REPORT_REFINER_REFINE_FACTOR) for a table.
+
+Vectors come from an existing fragment table (copied, so it is not modified) or are
+synthetic clustered vectors. Queries are stored vectors with a little noise added.
+Usage:
+    python scripts/benchmark_vector_index.py
+    python scripts/benchmark_vector_index.py --db_path ./data/lancedb \
+        --table_name reports
+    python scripts/benchmark_vector_index.py --count 1000000 --ndims 1024 \
+        --index_type IVF_HNSW_SQ --nprobes 5 10 20 50 --refine_factors 0 10 \
+        --output vector_index.json
+"""
+
+import json
+import time
+import argparse
+import tempfile
+from typing import List
+import numpy as np
+import pyarrow as pa
+import lancedb
+from reportfindingrefiner.config import (
+    DEFAULT_VECTOR_INDEX_TYPE,
+    DEFAULT_VECTOR_INDEX_METRIC,
+)
+from reportfindingrefiner.lance_db import vector_index_params
+
+def load_vectors(db_path: str, table_name: str) -> np.ndarray:
+    table = lancedb.connect(db_path).open_table(table_name)
+    column = table.to_lance().to_table(columns=["vector"])["vector"].combine_chunks()
+    return column.values.to_numpy().reshape(len(column), -1).astype(np.float32)
+
+
+def synthetic_vectors(
+    count: int, ndims: int, clusters: int, seed: int = 0
+) -> np.ndarray:
+    """Gaussian clusters, closer to embedding vectors than uniform noise"""
+    rng = np.random.default_rng(seed)
+    centers = rng.standard_normal((clusters, ndims), dtype=np.float32)
+    assignment = rng.integers(0, clusters, size=count)
+    return centers[assignment] + 0.3 * rng.standard_normal(
+        (count, ndims), dtype=np.float32
+    )
+
+
+def exact_neighbours(
+    vectors: np.ndarray, queries: np.ndarray, k: int, chunk_size: int = 65536
+) -> np.ndarray:
+    """
+    Row ids of the k nearest vectors (L2) to each query, scanning the vectors in chunks
+    """
+    best_ids = np.zeros((len(queries), 0), dtype=np.int64)
+    best_dist = np.zeros((len(queries), 0), dtype=np.float32)
+    query_norms = (queries ** 2).sum(axis=1, keepdims=True)
+    for start in range(0, len(vectors), chunk_size):
+        chunk = vectors[start:start + chunk_size]
+        dist = query_norms - 2 * queries @ chunk.T + (chunk ** 2).sum(axis=1)
+        ids = np.broadcast_to(np.arange(start, start + len(chunk)), dist.shape)
+        dist = np.concatenate([best_dist, dist], axis=1)
+        ids = np.concatenate([best_ids, ids], axis=1)
+        top = np.argsort(dist, axis=1)[:, :k]
+        best_dist = np.take_along_axis(dist, top, axis=1)
+        best_ids = np.take_along_axis(ids, top, axis=1)
+    return best_ids
+
+
+def run_queries(
+    table, queries: np.ndarray, k: int, nprobes: int = None, refine_factor: int = 0
+):
+    """(row ids per query, per-query latencies in seconds)"""
+    results, latencies = [], []
+    for query in queries:
+        builder = (
+            table.search(query)
+            .metric(DEFAULT_VECTOR_INDEX_METRIC)
+            .select(["id"])
+            .limit(k)
+        )
+        if nprobes is not None:
+            builder = builder.nprobes(nprobes)
+        if refine_factor > 0:
+            builder = builder.refine_factor(refine_factor)
+        start = time.perf_counter()
+        ids = builder.to_arrow()["id"].to_pylist()
+        latencies.append(time.perf_counter() - start)
+        results.append(ids)
+    return results, latencies
+
+def recall_at_k(exact: np.ndarray, found: List[List[int]]) -> float:
+    k = exact.shape[1]
+    return float(
+        np.mean([len(set(e.tolist()) & set(f)) / k for e, f in zip(exact, found)])
+    )
+
+def latency_summary(latencies: List[float]) -> dict:
+    return {
+        "p50_ms": float(np.percentile(latencies, 50)) * 1000,
+        "p99_ms": float(np.percentile(latencies, 99)) * 1000,
+    }
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Benchmark ANN index recall and latency against exact search."
+    )
+    parser.add_argument("--db_path", type=str, default=None,
+                        help="LanceDB folder of a fragment table to copy.")
+    parser.add_argument("--table_name", type=str, default="table",
+                        help="Fragment table name.")
+    parser.add_argument("--count", type=int, default=200000,
+                        help="Synthetic vectors (without --db_path).")
+    parser.add_argument("--ndims", type=int, default=1024,
+                        help="Synthetic vector dimensions.")
+    parser.add_argument("--clusters", type=int, default=500,
+                        help="Clusters in the synthetic vectors.")
+    parser.add_argument("--queries", type=int, default=200, help="Number of queries.")
+    parser.add_argument("--k", type=int, default=10,
+                        help="Neighbours compared for recall@k.")
+    parser.add_argument("--index_type", type=str, default=DEFAULT_VECTOR_INDEX_TYPE,
+                        help="IVF_PQ, IVF_HNSW_PQ or IVF_HNSW_SQ.")
+    parser.add_argument("--num_partitions", type=int, default=None,
+                        help="Override the derived partitions.")
+    parser.add_argument("--num_sub_vectors", type=int, default=None,
+                        help="Override the derived sub-vectors.")
+    parser.add_argument("--nprobes", type=int, nargs="+",
+                        default=[1, 5, 10, 20, 50, 100], help="nprobes values to try.")
+    parser.add_argument("--refine_factors", type=int, nargs="+", default=[0, 5, 20],
+                        help="refine_factor values to try (0 = no re-ranking).")
+    parser.add_argument("--output", type=str, default=None,
+                        help="Also write the results as JSON.")
+    args = parser.parse_args()
+
+    if args.db_path:
+        vectors = load_vectors(args.db_path, args.table_name)
+    else:
+        vectors = synthetic_vectors(args.count, args.ndims, args.clusters)
+    count, ndims = vectors.shape
+    rng = np.random.default_rng(1)
+    queries = vectors[rng.choice(count, size=min(args.queries, count), replace=False)]
+    queries = queries + 0.05 * queries.std() * rng.standard_normal(
+        queries.shape, dtype=np.float32
+    )
+    k = min(args.k, count)
+
+    params = vector_index_params(count, ndims)
+    if args.num_partitions:
+        params["num_partitions"] = args.num_partitions
+    if args.num_sub_vectors:
+        params["num_sub_vectors"] = args.num_sub_vectors
+
+    results = {
+        "vectors": count,
+        "ndims": ndims,
+        "queries": len(queries),
+        "k": k,
+        "index_type": args.index_type,
+        "metric": DEFAULT_VECTOR_INDEX_METRIC,
+        **params,
+        "runs": [],
+    }
+    with tempfile.TemporaryDirectory() as tmp:
+        table = lancedb.connect(tmp).create_table(
+            "vectors",
+            pa.table(
+                {
+                    "id": pa.array(np.arange(count)),
+                    "vector": pa.FixedSizeListArray.from_arrays(
+                        pa.array(vectors.ravel()), ndims
+                    ),
+                }
+            ),
+        )
+        exact = exact_neighbours(vectors, queries, k)
+
+        print(f"\n{count} vectors ({ndims} dims), {len(queries)} queries, recall@{k}")
+        _, latencies = run_queries(table, queries, k)
+        results["exact"] = latency_summary(latencies)
+        print(
+            f"Exact search: p50 {results['exact']['p50_ms']:.1f} ms, p99 "
+            f"{results['exact']['p99_ms']:.1f} ms"
+        )
+
+        start = time.perf_counter()
+        table.create_index(
+            metric=DEFAULT_VECTOR_INDEX_METRIC,
+            index_type=args.index_type,
+            **params,
+        )
+        results["build_seconds"] = time.perf_counter() - start
+        print(
+            f"Built {args.index_type} ({params['num_partitions']} partitions, "
+            f"{params['num_sub_vectors']} sub-vectors) in "
+            f"{results['build_seconds']:.1f}s\n"
+        )
+
+        print(
+            f"{'nprobes':>8} {'refine':>7} {'recall':>7} {'p50 ms':>9} {'p99 ms':>9} "
+            f"{'speedup':>8}"
+        )
+        for nprobes in args.nprobes:
+            for refine_factor in args.refine_factors:
+                found, latencies = run_queries(
+                    table, queries, k, nprobes, refine_factor
+                )
+                run = {
+                    "nprobes": nprobes,
+                    "refine_factor": refine_factor,
+                    "recall_at_k": recall_at_k(exact, found),
+                    **latency_summary(latencies),
+                }
+                run["speedup"] = results["exact"]["p50_ms"] / run["p50_ms"]
+                results["runs"].append(run)
+                print(
+                    f"{nprobes:>8} {refine_factor:>7} {run['recall_at_k']:>7.3f} "
+                    f"{run['p50_ms']:>9.1f} "
+                    f"{run['p99_ms']:>9.1f} {run['speedup']:>7.1f}x"
+                )
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(results, f, indent=2)
+        print(f"\nResults written to {args.output}")
+
+if __name__ == "__main__":
+    main()
@@ -1,7 +1,7 @@
 #!/usr/bin/env python
 
 import argparse
-from reportfindingrefiner.finding_model_tools import (
+from reportfindingrefiner.services.finding_model_tools import (
     generate_finding_description,
     generate_finding_outline_with_context
 )
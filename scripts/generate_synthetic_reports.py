@@ -0,0 +1,90 @@
+#!/usr/bin/env python
+
+"""
+Generate a reproducible synthetic radiology report corpus, as a folder of .txt
+files or a .jsonl[.gz] file that scripts/ingest_reports.py can ingest.
+Usage:
+    python scripts/generate_synthetic_reports.py --output ./data/synthetic_reports \
+        --count 10000
+    python scripts/generate_synthetic_reports.py --output ./data/synthetic.jsonl.gz \
+        --count 1000000 --duplication_rate 0.2 --fragment_words 8 40
+    python scripts/generate_synthetic_reports.py --output ./data/synthetic.jsonl \
+        --sections "Clinical history:=0.5" "Technique:=0.8" "Findings:=1" \
+        "Impression:=1"
+"""
+
+import argparse
+from typing import Dict, List
+from reportfindingrefiner.synthetic_reports import (
+    SyntheticCorpusSpec,
+    generate_synthetic_reports,
+    write_synthetic_reports,
+)
+
+def parse_section_mix(values: List[str]) -> Dict[str, float]:
+    """heading=probability pairs, in report order"""
+    mix = {}
+    for value in values:
+        heading, _, probability = value.rpartition("=")
+        mix[heading] = float(probability)
+    return mix
+
+def add_corpus_arguments(parser: argparse.ArgumentParser) -> None:
+    """
+    Arguments describing a SyntheticCorpusSpec, shared with the ingestion benchmark
+    """
+    defaults = SyntheticCorpusSpec()
+    parser.add_argument("--count", type=int, default=defaults.count,
+                        help="Number of reports.")
+    parser.add_argument("--seed", type=int, default=defaults.seed, help="Random seed.")
+    parser.add_argument(
+        "--sections",
+        type=str,
+        nargs="+",
+        default=None,
+        help="heading=probability for each section, in report order "
+        "(default: "
+        f"{' '.join(f'{h}={p:g}' for h, p in defaults.section_mix.items())}).",
+    )
+    parser.add_argument("--subsection_headings", type=str, nargs="+",
+                        default=defaults.subsection_headings,
+                        help="Sections written as one 'Organ: text' line per finding.")
+    parser.add_argument("--findings_per_report", type=int, nargs=2,
+                        default=list(defaults.findings_per_report),
+                        metavar=("MIN", "MAX"), help="Findings lines per subsection.")
+    parser.add_argument("--fragment_words", type=int, nargs=2,
+                        default=list(defaults.fragment_words), metavar=("MIN", "MAX"),
+                        help="Words per fragment.")
+    parser.add_argument("--duplication_rate", type=float,
+                        default=defaults.duplication_rate,
+                        help="Share of reports that copy an earlier report with a new "
+                             "study number.")
+
+def corpus_spec_from_args(args: argparse.Namespace) -> SyntheticCorpusSpec:
+    spec = SyntheticCorpusSpec(
+        count=args.count,
+        seed=args.seed,
+        subsection_headings=args.subsection_headings,
+        findings_per_report=tuple(args.findings_per_report),
+        fragment_words=tuple(args.fragment_words),
+        duplication_rate=args.duplication_rate,
+    )
+    if args.sections:
+        spec.section_mix = parse_section_mix(args.sections)
+    return spec
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Generate synthetic radiology reports."
+    )
+    parser.add_argument("--output", type=str, required=True,
+                        help="Folder for .txt reports, or a .jsonl / .jsonl.gz file.")
+    add_corpus_arguments(parser)
+    args = parser.parse_args()
+
+    spec = corpus_spec_from_args(args)
+    written = write_synthetic_reports(generate_synthetic_reports(spec), args.output)
+    print(f"\n📝 Wrote {written} synthetic reports to {args.output}")
+
+if __name__ == "__main__":
+    main()
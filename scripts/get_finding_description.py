@@ -1,5 +1,7 @@
 import argparse
-from reportfindingrefiner.finding_model_tools import generate_finding_description
+from reportfindingrefiner.services.finding_model_tools import (
+    generate_finding_description,
+)
 from reportfindingrefiner.config import DEFAULT_MODEL
 
 def main():
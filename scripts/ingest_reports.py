@@ -4,15 +4,153 @@
 Command-line script to ingest reports into LanceDB.
 Usage:
     python scripts/ingest_reports.py
+    python scripts/ingest_reports.py --reports_folder ./data/reports --incremental
+    python scripts/ingest_reports.py --reports_folder ./data/reports --workers 8
+    python scripts/ingest_reports.py --resume
+    python scripts/ingest_reports.py --reports_folder ./exports/reports.jsonl.gz \
+        --incremental
+    python scripts/ingest_reports.py --reports_folder ./exports/reports.parquet \
+        --id_field accession --text_field report_text
+    python scripts/ingest_reports.py --reports_folder ./data/reports --incremental \
+        --watch
 """
 
-from reportfindingrefiner.ingestion import ingest_reports
+import argparse
+from reportfindingrefiner.services.ingestion import ingest_reports
+from reportfindingrefiner.config import (
+    DEFAULT_INGEST_BATCH_SIZE,
+    DEFAULT_MAX_IN_FLIGHT_BATCHES,
+    DEFAULT_INGEST_WORKERS,
+    DEFAULT_EMBED_MAX_TOKENS_PER_BATCH,
+    DEFAULT_EMBED_NUM_THREADS,
+    DEFAULT_WATCH_DEBOUNCE_SECONDS,
+    DEFAULT_WATCH_POLL_INTERVAL,
+    DEFAULT_DEDUP_THRESHOLD,
+    DEFAULT_CHUNK_BY_TOKENS,
+)
+from reportfindingrefiner.services.report_service import ReportService
+from reportfindingrefiner.services.report_watcher import ReportFolderWatcher
+from reportfindingrefiner.services.report_sources import SOURCE_FORMATS
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Ingest report text files into LanceDB."
+    )
+    parser.add_argument("--reports_folder", type=str, default="./data/reports_10",
+                        help="Folder containing report text files, or a "
+                             ".jsonl[.gz|.zst], .tar[.gz|.bz2|.xz|.zst] or .parquet "
+                             "file of reports.")
+    parser.add_argument("--source_format", choices=SOURCE_FORMATS, default="auto",
+                        help="Format of --reports_folder (auto = detect from the "
+                             "path).")
+    parser.add_argument("--id_field", type=str, default="id",
+                        help="Report ID field in JSON Lines records or Parquet "
+                             "columns.")
+    parser.add_argument("--text_field", type=str, default="text",
+                        help="Report text field in JSON Lines records or Parquet "
+                             "columns.")
+    parser.add_argument("--db_path", type=str, default="./data/lancedb",
+                        help="Path to LanceDB folder.")
+    parser.add_argument("--table_name", type=str, default="table",
+                        help="LanceDB table name.")
+    parser.add_argument("--incremental", action="store_true",
+                        help="Only ingest new or changed reports instead of "
+                             "rebuilding the table.")
+    parser.add_argument("--batch_size", type=int, default=DEFAULT_INGEST_BATCH_SIZE,
+                        help="Fragments embedded and inserted per batch.")
+    parser.add_argument("--max_in_flight", type=int,
+                        default=DEFAULT_MAX_IN_FLIGHT_BATCHES,
+                        help="Batches buffered ahead of the embedding stage (bounds "
+                             "memory use).")
+    parser.add_argument("--workers", type=int, default=DEFAULT_INGEST_WORKERS,
+                        help="Processes used to split reports into fragments (1 = no "
+                             "pool).")
+    parser.add_argument("--unordered", action="store_true",
+                        help="Insert reports in completion order rather than folder "
+                             "order when using workers.")
+    parser.add_argument("--no_embedding_cache", action="store_true",
+                        help="Embed every fragment instead of reusing cached vectors.")
+    parser.add_argument("--max_tokens_per_batch", type=int,
+                        default=DEFAULT_EMBED_MAX_TOKENS_PER_BATCH,
+                        help="Token budget (longest sequence x batch size) for each "
+                             "model forward pass.")
+    parser.add_argument("--embed_threads", type=int, default=DEFAULT_EMBED_NUM_THREADS,
+                        help="Torch CPU threads used for embedding (0 = torch "
+                             "default).")
+    parser.add_argument("--dedup", action="store_true",
+                        help="Skip embedding near-duplicate reports, pointing them at "
+                             "a representative report.")
+    parser.add_argument("--dedup_threshold", type=float,
+                        default=DEFAULT_DEDUP_THRESHOLD,
+                        help="Estimated Jaccard similarity (word shingles) at which "
+                             "reports count as duplicates.")
+    parser.add_argument("--chunk_by_tokens", action="store_true",
+                        default=DEFAULT_CHUNK_BY_TOKENS,
+                        help="Merge short and split long fragments to the embedding "
+                             "model's token budget.")
+    parser.add_argument("--resume", action="store_true",
+                        help="Continue an interrupted ingestion from its last "
+                             "committed batch.")
+    parser.add_argument("--watch", action="store_true",
+                        help="Keep running and ingest new or modified reports as they "
+                             "land in the folder.")
+    parser.add_argument("--debounce", type=float,
+                        default=DEFAULT_WATCH_DEBOUNCE_SECONDS,
+                        help="Seconds a watched report must be unchanged before it is "
+                             "ingested.")
+    parser.add_argument("--poll_interval", type=float,
+                        default=DEFAULT_WATCH_POLL_INTERVAL,
+                        help="Seconds between checks of the watched folder.")
+    parser.add_argument("--no_inotify", action="store_true",
+                        help="Poll the watched folder even if inotify is available.")
+    args = parser.parse_args()
+
+    # In watch mode an incremental run is just the watcher's catch-up pass
+    if args.resume or not (args.watch and args.incremental):
+        ingest_reports(
+            reports_folder=args.reports_folder,
+            db_path=args.db_path,
+            table_name=args.table_name,
+            incremental=args.incremental,
+            batch_size=args.batch_size,
+            max_in_flight=args.max_in_flight,
+            workers=args.workers,
+            ordered=not args.unordered,
+            use_embedding_cache=not args.no_embedding_cache,
+            max_tokens_per_batch=args.max_tokens_per_batch,
+            embed_threads=args.embed_threads,
+            resume=args.resume,
+            source_format=args.source_format,
+            id_field=args.id_field,
+            text_field=args.text_field,
+            dedup=args.dedup,
+            dedup_threshold=args.dedup_threshold,
+            chunk_by_tokens=args.chunk_by_tokens,
+        )
+
+    if args.watch:
+        watcher = ReportFolderWatcher(
+            args.reports_folder,
+            ReportService(
+                db_path=args.db_path,
+                table_name=args.table_name,
+                workers=args.workers,
+                batch_size=args.batch_size,
+                use_embedding_cache=not args.no_embedding_cache,
+                max_tokens_per_batch=args.max_tokens_per_batch,
+                embed_threads=args.embed_threads,
+                dedup=args.dedup,
+                dedup_threshold=args.dedup_threshold,
+                chunk_by_tokens=args.chunk_by_tokens,
+            ),
+            debounce_seconds=args.debounce,
+            poll_interval=args.poll_interval,
+            use_inotify=not args.no_inotify,
+        )
+        try:
+            watcher.run(catch_up=True)
+        except KeyboardInterrupt:
+            print("\n\n⚠️  Stopped watching")
 
 if __name__ == "__main__":
-    # You might parse command-line args here (e.g., using argparse).
-    # For now, just call with defaults:
-    ingest_reports(
-        reports_folder="./data/reports_10",
-        db_path="./data/lancedb",
-        table_name="table",
-    )
\ No newline at end of file
+    main()
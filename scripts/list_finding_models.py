@@ -2,7 +2,7 @@
 
 import argparse
 import json
-from reportfindingrefiner.finding_model_tools import list_finding_models
+from reportfindingrefiner.services.finding_model_tools import list_finding_models
 from reportfindingrefiner.config import DEFAULT_DB_PATH
 import os
 
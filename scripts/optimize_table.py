@@ -0,0 +1,53 @@
+#!/usr/bin/env python
+
+"""
+Compact a LanceDB reports table, prune old versions and update its indices.
+Frequent incremental or watched ingestion leaves one small data file and one
+version per batch; this merges them back into a few large files.
+Usage:
+    python scripts/optimize_table.py
+    python scripts/optimize_table.py --db_path ./data/lancedb --table_name reports \
+        --retention_hours 24
+    python scripts/optimize_table.py --rebuild_indices --output optimize.json
+"""
+
+import json
+import argparse
+from datetime import timedelta
+from reportfindingrefiner.config import DEFAULT_OPTIMIZE_RETENTION_HOURS
+from reportfindingrefiner.services.report_service import ReportService
+from reportfindingrefiner.services.maintenance import print_optimize_report
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Compact a LanceDB table and prune old versions."
+    )
+    parser.add_argument("--db_path", type=str, default="./data/lancedb",
+                        help="Path to LanceDB folder.")
+    parser.add_argument("--table_name", type=str, default="table",
+                        help="LanceDB table name.")
+    parser.add_argument("--retention_hours", type=float,
+                        default=DEFAULT_OPTIMIZE_RETENTION_HOURS,
+                        help="Keep versions newer than this many hours (0 = keep only "
+                             "the latest).")
+    parser.add_argument("--rebuild_indices", action="store_true",
+                        help="Rebuild full-text indices and retrain the vector index "
+                             "instead of updating them.")
+    parser.add_argument("--output", type=str, default=None,
+                        help="Also write the report as JSON.")
+    args = parser.parse_args()
+
+    service = ReportService(db_path=args.db_path, table_name=args.table_name)
+    report = service.optimize(
+        retention=timedelta(hours=args.retention_hours),
+        rebuild_indices=args.rebuild_indices,
+    )
+    print_optimize_report(report)
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(report.model_dump(), f, indent=2)
+        print(f"\nReport written to {args.output}")
+
+if __name__ == "__main__":
+    main()
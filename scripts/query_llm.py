@@ -1,8 +1,8 @@
 #!/usr/bin/env python
 
 import argparse
-from reportfindingrefiner.search import search_in_db
-from reportfindingrefiner.llm_query import query_llm
+from reportfindingrefiner.services.search import search_in_db
+from reportfindingrefiner.services.llm_query import query_llm
 from reportfindingrefiner.config import DEFAULT_MODEL, DEFAULT_DB_PATH, DEFAULT_TABLE_NAME, DEFAULT_LIMIT
 
 def main():
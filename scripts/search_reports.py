@@ -5,6 +5,8 @@ Command-line script to demonstrate searching using the SearchService.
 Usage:
     python scripts/search_reports.py --query "fatty liver" --mode hybrid
     python scripts/search_reports.py --query "fatty liver" --compare
+    python scripts/search_reports.py --query "fatty liver" --mode vector \
+        --where "section = 'Impression:'"
 """
 
 import argparse
@@ -12,7 +14,11 @@ import os
 import json
 from reportfindingrefiner.services.search_service import SearchService
 from reportfindingrefiner.services.report_service import ReportService
-from reportfindingrefiner.config import DEFAULT_DB_PATH
+from reportfindingrefiner.config import (
+    DEFAULT_DB_PATH,
+    DEFAULT_NPROBES,
+    DEFAULT_REFINE_FACTOR,
+)
 
 def main():
     parser = argparse.ArgumentParser(description="Search LanceDB for matching text.")
@@ -24,6 +30,15 @@ def main():
     parser.add_argument("--reports_folder", type=str, default="./data/reports", help="Folder containing report text files.")
     parser.add_argument("--compare", action="store_true", help="Run comparison between search methods.")
     parser.add_argument("--limit", type=int, default=10, help="Maximum number of results to return.")
+    parser.add_argument("--nprobes", type=int, default=DEFAULT_NPROBES,
+                        help="Vector index partitions probed (vector and hybrid "
+                             "modes).")
+    parser.add_argument("--refine_factor", type=int, default=DEFAULT_REFINE_FACTOR,
+                        help="Re-rank refine_factor x limit candidates with exact "
+                             "distances (0 = off).")
+    parser.add_argument("--where", type=str, default=None,
+                        help='SQL filter applied before searching, e.g. "section = '
+                             '\'Impression:\'".')
     args = parser.parse_args()
 
     # Create specific directory for search testing if needed
@@ -83,7 +98,10 @@ def main():
             print(f"Text: {r['text'][:100]}...\n")
     else:
         # Perform a regular search
-        results = search_service.search(args.query, mode=args.mode, limit=args.limit)
+        results = search_service.search(
+            args.query, mode=args.mode, limit=args.limit,
+            nprobes=args.nprobes, refine_factor=args.refine_factor, where=args.where,
+        )
         
         print(f"Search results using mode={args.mode}:")
         for r in results:
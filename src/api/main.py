@@ -9,19 +9,40 @@ import json
 import lancedb
 
 # Import reportfindingrefiner tools
-from reportfindingrefiner.search import search_in_db
+from reportfindingrefiner.services.search import search_in_db, search_many_in_db
+from reportfindingrefiner.lance_db import (
+    FRAGMENT_TEXT_COLUMNS,
+    ensure_fts_index,
+    scan_fragments,
+)
+from reportfindingrefiner.services.query_embedding_cache import (
+    get_query_embedding_cache,
+)
+from reportfindingrefiner.services.search_result_cache import get_search_result_cache
 from reportfindingrefiner.config import (
     DEFAULT_MODEL,
     DEFAULT_DB_PATH,
     DEFAULT_TABLE_NAME,
     DEFAULT_SEARCH_MODE,
-    DEFAULT_LIMIT
+    DEFAULT_LIMIT,
+    DEFAULT_WATCH_REPORTS,
+    DEFAULT_EMBEDDING_WARMUP,
+    DEFAULT_OPTIMIZE_INTERVAL_HOURS,
+    DEFAULT_NPROBES,
+    DEFAULT_REFINE_FACTOR
 )
 from reportfindingrefiner.models.finding_info import BaseFindingInfo
 from reportfindingrefiner.models.finding_model import FindingModelBase
-from reportfindingrefiner.ingestion import read_reports_from_folder, ingest_reports
-from reportfindingrefiner.data_models import FragmentSchema, FindingModelSchema
-from reportfindingrefiner.finding_model_tools import (
+from reportfindingrefiner.data_models import (
+    FragmentSchema,
+    FindingModelSchema,
+    embedding_model_status,
+    start_embedding_warmup
+)
+from reportfindingrefiner.services.ingestion_jobs import IngestionJobManager
+from reportfindingrefiner.services.report_watcher import ReportFolderWatcher
+from reportfindingrefiner.services.maintenance import TableMaintenanceScheduler
+from reportfindingrefiner.services.finding_model_tools import (
     generate_finding_description,
     generate_finding_outline,
     generate_finding_outline_with_context,
@@ -34,8 +55,12 @@ app = FastAPI(title="Report Finding Refiner API")
 # Global variables for DB connections
 reports_db = None
 findings_db = None
+ingestion_jobs = None
+report_watcher = None
+table_maintenance = None
 REPORTS_TABLE_NAME = "reports"
 FINDINGS_TABLE_NAME = "findings"
+REPORTS_FOLDER = "./data/reports"
 
 
 
@@ -43,7 +68,7 @@ FINDINGS_TABLE_NAME = "findings"
 @app.on_event("startup")
 async def startup_event():
     """Initialize LanceDB connections and create tables on startup"""
-    global reports_db, findings_db
+    global reports_db, findings_db, ingestion_jobs, report_watcher, table_maintenance
     
     print("\n🚀 Starting Report Finding Refiner API")
     
@@ -51,7 +76,7 @@ async def startup_event():
         # Create all required directories
         os.makedirs(DEFAULT_DB_PATH, exist_ok=True)
         os.makedirs(os.path.join(DEFAULT_DB_PATH, "findings"), exist_ok=True)
-        os.makedirs("./data/reports", exist_ok=True)
+        os.makedirs(REPORTS_FOLDER, exist_ok=True)
         print("📁 Created required directories")
         
         # Connect to DBs
@@ -59,13 +84,21 @@ async def startup_event():
         findings_db = lancedb.connect(os.path.join(DEFAULT_DB_PATH, "findings"))
         print("🔌 Connected to databases")
         
+        # Load the shared embedding model in the background, so the first search does
+        # not pay for it and startup is not held up; /embedding reports its progress
+        if DEFAULT_EMBEDDING_WARMUP:
+            start_embedding_warmup()
+            print("🧠 Loading the embedding model in the background")
+        
         # Initialize reports table if it doesn't exist
         if REPORTS_TABLE_NAME not in reports_db.table_names():
-            reports_db.create_table(
+            reports_table = reports_db.create_table(
                 REPORTS_TABLE_NAME,
-                schema=FragmentSchema,
+                schema=FragmentSchema.with_embedding(),
                 mode="create"
             )
+            # Searches only check for the full-text index; ingestion keeps it up to date
+            ensure_fts_index(reports_table)
             print(f"📊 Created new reports table: {REPORTS_TABLE_NAME}")
             
         # Initialize findings table if it doesn't exist
@@ -77,22 +110,36 @@ async def startup_event():
             )
             print(f"📊 Created new findings table: {FINDINGS_TABLE_NAME}")
             
-        # Check for and process any reports
-        reports_folder = "./data/reports"
-        if os.path.exists(reports_folder) and any(f.endswith('.txt') for f in os.listdir(reports_folder)):
-            print("\n📝 Found reports to process...")
-            try:
-                ingest_reports(
-                    reports_folder=reports_folder,
-                    db_path=DEFAULT_DB_PATH,
-                    table_name=REPORTS_TABLE_NAME
-                )   
-            except KeyboardInterrupt:
-                print("\n\n⚠️  Startup cancelled by user")
-                raise
+        # Schedule ingestion of any reports in the background; the API serves
+        # requests (against the current table version) while the job runs
+        ingestion_jobs = IngestionJobManager(
+            db_path=DEFAULT_DB_PATH, table_name=REPORTS_TABLE_NAME
+        )
+        if any(f.endswith('.txt') for f in os.listdir(REPORTS_FOLDER)):
+            job = ingestion_jobs.submit(REPORTS_FOLDER)
+            print(
+                f"\n📝 Found reports to process, scheduled ingestion job {job.job_id}"
+            )
         else:
-            print("\n📝 No reports found in ./data/reports")
-            
+            print(f"\n📝 No reports found in {REPORTS_FOLDER}")
+        
+        # Pick up reports dropped into the folder from now on; the job above
+        # covers the ones already there, and both share one ReportService
+        if DEFAULT_WATCH_REPORTS:
+            report_watcher = ReportFolderWatcher(
+                REPORTS_FOLDER, ingestion_jobs.report_service
+            )
+            report_watcher.start(catch_up=False)
+        
+        # Compact the reports table and prune old versions on a schedule
+        if DEFAULT_OPTIMIZE_INTERVAL_HOURS > 0:
+            table_maintenance = TableMaintenanceScheduler(ingestion_jobs.report_service)
+            table_maintenance.start()
+            print(
+                f"🧹 Optimizing {REPORTS_TABLE_NAME} every "
+                f"{DEFAULT_OPTIMIZE_INTERVAL_HOURS:g}h"
+            )
+
         print("\n✨ Startup complete!\n")
             
     except KeyboardInterrupt:
@@ -101,6 +148,16 @@ async def startup_event():
     except Exception as e:
         print(f"\n❌ Error during startup: {str(e)}")
 
+@app.on_event("shutdown")
+async def shutdown_event():
+    """Stop the ingestion worker; a running batch finishes, queued jobs are dropped"""
+    if report_watcher is not None:
+        report_watcher.stop(wait=False)
+    if table_maintenance is not None:
+        table_maintenance.stop()
+    if ingestion_jobs is not None:
+        ingestion_jobs.shutdown(wait=False)
+
 @app.get("/")
 def read_root():
     return {
@@ -133,6 +190,11 @@ class SearchQuery(BaseModel):
     query: str
     mode: str = DEFAULT_SEARCH_MODE
     limit: int = DEFAULT_LIMIT
+    # Vector index recall/latency trade-off for vector and hybrid searches
+    nprobes: int = DEFAULT_NPROBES
+    refine_factor: int = DEFAULT_REFINE_FACTOR
+    # SQL filter applied before searching, e.g. "section = 'Impression:'"
+    where: Optional[str] = None
 
 @app.post("/search")
 async def search_text(query: SearchQuery):
@@ -141,12 +203,118 @@ async def search_text(query: SearchQuery):
             db_path=DEFAULT_DB_PATH,
             table_name=REPORTS_TABLE_NAME,
             query_str=query.query,
-            mode=query.mode
+            mode=query.mode,
+            limit=query.limit,
+            nprobes=query.nprobes,
+            refine_factor=query.refine_factor,
+            where=query.where
         )
         return {"results": results[:query.limit]}
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error performing search: {str(e)}")
 
+class IngestRequest(BaseModel):
+    reports_folder: str = REPORTS_FOLDER
+    incremental: bool = True
+
+class SearchBatchQuery(BaseModel):
+    queries: List[str]
+    mode: str = DEFAULT_SEARCH_MODE
+    limit: int = DEFAULT_LIMIT
+    nprobes: int = DEFAULT_NPROBES
+    refine_factor: int = DEFAULT_REFINE_FACTOR
+    # SQL filter applied before searching, e.g. "section = 'Impression:'"
+    where: Optional[str] = None
+
+@app.post("/search/batch")
+def search_batch(query: SearchBatchQuery):
+    """Search for many queries at once; results are keyed by query"""
+    try:
+        results = search_many_in_db(
+            db_path=DEFAULT_DB_PATH,
+            table_name=REPORTS_TABLE_NAME,
+            queries=query.queries,
+            mode=query.mode,
+            limit=query.limit,
+            nprobes=query.nprobes,
+            refine_factor=query.refine_factor,
+            where=query.where
+        )
+        return {"results": results}
+    except Exception as e:
+        raise HTTPException(
+            status_code=500, detail=f"Error performing search: {str(e)}"
+        )
+
+@app.get("/search/cache")
+async def get_search_cache_stats():
+    """Return the size and hit rate of the query embedding and search result caches"""
+    return {
+        "query_embeddings": get_query_embedding_cache().stats(),
+        "results": get_search_result_cache().stats(),
+    }
+
+@app.post("/ingest", status_code=202)
+async def start_ingestion(request: IngestRequest):
+    """Queue a background ingestion job and return its id"""
+    if ingestion_jobs is None:
+        raise HTTPException(status_code=503, detail="Ingestion is not available yet")
+    if not os.path.isdir(request.reports_folder):
+        raise HTTPException(
+            status_code=400,
+            detail=f"Reports folder not found: {request.reports_folder}",
+        )
+    job = ingestion_jobs.submit(request.reports_folder, incremental=request.incremental)
+    return job.progress()
+
+@app.get("/ingest")
+async def list_ingestion_jobs():
+    """Return the progress of all ingestion jobs"""
+    if ingestion_jobs is None:
+        return {"jobs": []}
+    return {"jobs": [job.progress() for job in ingestion_jobs.list_jobs()]}
+
+@app.get("/ingest/{job_id}")
+async def get_ingestion_job(job_id: str):
+    """Return progress for one ingestion job: counts, throughput and ETA"""
+    job = ingestion_jobs.get(job_id) if ingestion_jobs is not None else None
+    if job is None:
+        raise HTTPException(status_code=404, detail=f"Unknown ingestion job: {job_id}")
+    return job.progress()
+
+@app.get("/watch")
+async def get_watcher_status():
+    """Return the folder watcher's mode and counters"""
+    if report_watcher is None:
+        return {"enabled": False}
+    return {"enabled": True, **report_watcher.status()}
+
+@app.get("/maintenance")
+async def get_maintenance_status():
+    """Return the table maintenance schedule and the last run's report"""
+    if table_maintenance is None:
+        return {"enabled": False}
+    return {"enabled": True, **table_maintenance.status()}
+
+@app.post("/maintenance/optimize")
+def optimize_reports_table(rebuild_indices: bool = False):
+    """Compact the reports table, prune old versions and update its indices now"""
+    if ingestion_jobs is None:
+        raise HTTPException(
+            status_code=503, detail="Table maintenance is not available"
+        )
+    return ingestion_jobs.report_service.optimize(
+        rebuild_indices=rebuild_indices
+    ).model_dump()
+
+@app.get("/embedding")
+async def get_embedding_status():
+    """
+    Return the configured embedding model, the state of the startup warmup and how long
+    each loaded model took to load
+    """
+    return embedding_model_status()
+
 class FindingModelQuery(BaseModel):
     finding_type: str
     context_docs: List[str]
@@ -227,7 +395,7 @@ async def get_reports():
     try:
         # Get reports table
         reports_table = reports_db.open_table(REPORTS_TABLE_NAME)
-        df = reports_table.to_pandas()
+        df = scan_fragments(reports_table, columns=FRAGMENT_TEXT_COLUMNS).to_pandas()
         
         # Get unique report IDs
         unique_reports = df['report_id'].unique()
@@ -264,7 +432,7 @@ async def get_fragments():
     try:
         # Get reports table
         reports_table = reports_db.open_table(REPORTS_TABLE_NAME)
-        df = reports_table.to_pandas()
+        df = scan_fragments(reports_table, columns=FRAGMENT_TEXT_COLUMNS).to_pandas()
         
         # Sort by report_id and sequence_number for consistent output
         df = df.sort_values(['report_id', 'sequence_number'])
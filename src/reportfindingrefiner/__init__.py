@@ -2,18 +2,48 @@
 ReportFindingRefiner - A tool for processing and analyzing reports.
 
 This package provides functionality for ingesting, processing, and searching reports.
+
+Public names are imported lazily (PEP 562), so `import reportfindingrefiner` does
+not pull in lancedb, pandas or torch until one of them is actually used.
 """
 
-from .data_models import Report
-from .ingestion import ingest_reports, read_reports_from_folder
-from .section_splitter import SectionSplitter, create_fragments_from_reports
+from importlib import import_module
+from typing import TYPE_CHECKING
 
 __version__ = "0.1.0"
 
+# Public name -> submodule that defines it
+_LAZY_ATTRIBUTES = {
+    "Report": ".data_models",
+    "ingest_reports": ".services.ingestion",
+    "read_reports_from_folder": ".services.ingestion",
+    "SectionSplitter": ".section_splitter",
+    "create_fragments_from_reports": ".section_splitter",
+}
+
 __all__ = [
     "Report",
     "ingest_reports",
     "read_reports_from_folder",
     "SectionSplitter",
     "create_fragments_from_reports",
-] 
\ No newline at end of file
+]
+
+if TYPE_CHECKING:
+    from .data_models import Report
+    from .services.ingestion import ingest_reports, read_reports_from_folder
+    from .section_splitter import SectionSplitter, create_fragments_from_reports
+
+
+def __getattr__(name: str):
+    module_name = _LAZY_ATTRIBUTES.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(import_module(module_name, __name__), name)
+    # Cache it so later lookups skip __getattr__
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
@@ -7,7 +7,159 @@ DEFAULT_TABLE_NAME = "table"
 DEFAULT_SEARCH_MODE = "basic"
 DEFAULT_LIMIT = 10
 DEFAULT_API_BASE = os.getenv("OLLAMA_API_BASE", "http://localhost:11434/api")
+# Embedding model and backend: "huggingface" (torch), "huggingface-int8" (torch with
+# int8 dynamically quantized Linear layers) or "onnx" (ONNX Runtime, int8 by default).
+# Tables must be rebuilt after switching, since stored vectors come from the old model.
+DEFAULT_EMBEDDING_MODEL = os.getenv("REPORT_REFINER_EMBEDDING_MODEL", "BAAI/bge-en-icl")
+DEFAULT_EMBEDDING_BACKEND = os.getenv("REPORT_REFINER_EMBEDDING_BACKEND", "huggingface")
+# 0 = the model's hidden size
+DEFAULT_EMBEDDING_NDIMS = int(os.getenv("REPORT_REFINER_EMBEDDING_NDIMS", "0"))
+# Load the embedding model in a background thread when the API starts instead
+# of on the first request
+DEFAULT_EMBEDDING_WARMUP = (
+    os.getenv("REPORT_REFINER_EMBEDDING_WARMUP", "true").lower() == "true"
+)
+DEFAULT_ONNX_CACHE_DIR = os.getenv(
+    "REPORT_REFINER_ONNX_CACHE_DIR",
+    str(Path.home() / ".cache" / "reportfindingrefiner" / "onnx"),
+)
 
 # Ensure paths are properly resolved
 if not os.path.isabs(DEFAULT_DB_PATH):
     DEFAULT_DB_PATH = str(Path(__file__).parent.parent.parent / DEFAULT_DB_PATH)
+
+# Ingestion pipeline: fragments per batch and how many batches may be buffered
+# between the read/split stage and the embed/write stage
+DEFAULT_INGEST_BATCH_SIZE = int(os.getenv("REPORT_REFINER_INGEST_BATCH_SIZE", "256"))
+DEFAULT_MAX_IN_FLIGHT_BATCHES = int(
+    os.getenv("REPORT_REFINER_MAX_IN_FLIGHT_BATCHES", "2")
+)
+
+# Parallel fragmenting: worker processes (1 = split in-process)
+# and reports per work unit
+DEFAULT_INGEST_WORKERS = int(os.getenv("REPORT_REFINER_INGEST_WORKERS", "1"))
+DEFAULT_SPLIT_CHUNK_SIZE = int(os.getenv("REPORT_REFINER_SPLIT_CHUNK_SIZE", "256"))
+
+# Embedding cache: reuse vectors for fragment texts that were embedded before
+DEFAULT_EMBEDDING_CACHE_ENABLED = (
+    os.getenv("REPORT_REFINER_EMBEDDING_CACHE", "true").lower() == "true"
+)
+DEFAULT_EMBEDDING_CACHE_MAX_ENTRIES = int(
+    os.getenv("REPORT_REFINER_EMBEDDING_CACHE_MAX_ENTRIES", "2000000")
+)
+
+# Embedding engine: fragments are sorted by token length and grouped so that
+# (longest sequence x batch size) stays under the token budget
+DEFAULT_EMBED_MAX_TOKENS_PER_BATCH = int(
+    os.getenv("REPORT_REFINER_EMBED_MAX_TOKENS_PER_BATCH", "16384")
+)
+DEFAULT_EMBED_MAX_BATCH_SIZE = int(
+    os.getenv("REPORT_REFINER_EMBED_MAX_BATCH_SIZE", "128")
+)
+# 0 = torch default
+DEFAULT_EMBED_NUM_THREADS = int(os.getenv("REPORT_REFINER_EMBED_NUM_THREADS", "0"))
+
+# Report section headings recognised by the SectionSplitter (comma-separated in the
+# env), and the sections that are further split into one fragment per "Label: text" line
+DEFAULT_SECTION_HEADINGS = [
+    h.strip()
+    for h in os.getenv(
+        "REPORT_REFINER_SECTION_HEADINGS", "Header:,Findings:,Impression:"
+    ).split(",")
+    if h.strip()
+]
+DEFAULT_SUBSECTION_HEADINGS = [
+    h.strip()
+    for h in os.getenv("REPORT_REFINER_SUBSECTION_HEADINGS", "Findings:").split(",")
+    if h.strip()
+]
+DEFAULT_SECTION_HEADINGS_IGNORE_CASE = (
+    os.getenv("REPORT_REFINER_SECTION_HEADINGS_IGNORE_CASE", "false").lower() == "true"
+)
+
+# Folder watcher: a changed report is ingested once it has been quiet for the debounce
+# period; reports that settle together are appended in one micro-batch
+DEFAULT_WATCH_REPORTS = (
+    os.getenv("REPORT_REFINER_WATCH_REPORTS", "false").lower() == "true"
+)
+DEFAULT_WATCH_DEBOUNCE_SECONDS = float(
+    os.getenv("REPORT_REFINER_WATCH_DEBOUNCE_SECONDS", "1.0")
+)
+DEFAULT_WATCH_POLL_INTERVAL = float(
+    os.getenv("REPORT_REFINER_WATCH_POLL_INTERVAL", "1.0")
+)
+DEFAULT_WATCH_MAX_BATCH_REPORTS = int(
+    os.getenv("REPORT_REFINER_WATCH_MAX_BATCH_REPORTS", "1000")
+)
+
+# Near-duplicate detection: reports whose MinHash similarity (word shingles) to an
+# earlier report reaches the threshold are not embedded and point to that report instead
+DEFAULT_DEDUP_ENABLED = os.getenv("REPORT_REFINER_DEDUP", "false").lower() == "true"
+DEFAULT_DEDUP_THRESHOLD = float(os.getenv("REPORT_REFINER_DEDUP_THRESHOLD", "0.9"))
+DEFAULT_DEDUP_NUM_PERM = int(os.getenv("REPORT_REFINER_DEDUP_NUM_PERM", "128"))
+DEFAULT_DEDUP_BANDS = int(os.getenv("REPORT_REFINER_DEDUP_BANDS", "16"))
+DEFAULT_DEDUP_SHINGLE_SIZE = int(os.getenv("REPORT_REFINER_DEDUP_SHINGLE_SIZE", "3"))
+
+# Token-budget chunking: fragments are re-chunked with the embedding model's tokenizer
+# so short ones are merged within their section and long ones are split with overlap
+# instead of being truncated by the model
+DEFAULT_CHUNK_BY_TOKENS = (
+    os.getenv("REPORT_REFINER_CHUNK_BY_TOKENS", "false").lower() == "true"
+)
+DEFAULT_CHUNK_MAX_TOKENS = int(os.getenv("REPORT_REFINER_CHUNK_MAX_TOKENS", "256"))
+DEFAULT_CHUNK_MIN_TOKENS = int(os.getenv("REPORT_REFINER_CHUNK_MIN_TOKENS", "32"))
+DEFAULT_CHUNK_OVERLAP_TOKENS = int(
+    os.getenv("REPORT_REFINER_CHUNK_OVERLAP_TOKENS", "32")
+)
+
+# Table maintenance: compaction, pruning of versions older than the retention window and
+# index updates; the API runs it every interval when the interval is above 0
+DEFAULT_OPTIMIZE_RETENTION_HOURS = float(
+    os.getenv("REPORT_REFINER_OPTIMIZE_RETENTION_HOURS", "168")
+)
+DEFAULT_OPTIMIZE_INTERVAL_HOURS = float(
+    os.getenv("REPORT_REFINER_OPTIMIZE_INTERVAL_HOURS", "0")
+)
+
+# Approximate nearest neighbour index on the fragment vectors, built after ingestion
+# once the table has this many rows (exact search is fast enough below that).
+# Index types: IVF_PQ, IVF_HNSW_PQ or IVF_HNSW_SQ; the metric must match the one used
+# at query time (LanceDB searches with L2 by default)
+DEFAULT_VECTOR_INDEX_TYPE = os.getenv("REPORT_REFINER_VECTOR_INDEX_TYPE", "IVF_PQ")
+DEFAULT_VECTOR_INDEX_METRIC = os.getenv("REPORT_REFINER_VECTOR_INDEX_METRIC", "L2")
+DEFAULT_VECTOR_INDEX_MIN_ROWS = int(
+    os.getenv("REPORT_REFINER_VECTOR_INDEX_MIN_ROWS", "50000")
+)
+# Retrain the index once the rows added since it was trained reach this share of the
+# rows it was trained on; smaller additions are assigned to the existing partitions
+DEFAULT_VECTOR_INDEX_REBUILD_FRACTION = float(
+    os.getenv("REPORT_REFINER_VECTOR_INDEX_REBUILD_FRACTION", "0.5")
+)
+# Per-query recall/latency trade-off: IVF partitions probed, and how many times `limit`
+# candidates are re-ranked with exact distances (0 = no re-ranking)
+DEFAULT_NPROBES = int(os.getenv("REPORT_REFINER_NPROBES", "20"))
+DEFAULT_REFINE_FACTOR = int(os.getenv("REPORT_REFINER_REFINE_FACTOR", "10"))
+
+# Query embedding cache: the vectors of recent search queries, kept in memory and shared
+# by all searches in the process (0 entries = off; TTL 0 = entries never expire)
+DEFAULT_QUERY_EMBEDDING_CACHE_SIZE = int(
+    os.getenv("REPORT_REFINER_QUERY_EMBEDDING_CACHE_SIZE", "1024")
+)
+DEFAULT_QUERY_EMBEDDING_CACHE_TTL_SECONDS = float(
+    os.getenv("REPORT_REFINER_QUERY_EMBEDDING_CACHE_TTL_SECONDS", "0")
+)
+
+# Search result cache: results of recent searches, keyed by the table version so they
+# are served from memory until the table changes (0 entries = off)
+DEFAULT_SEARCH_CACHE_MAX_ENTRIES = int(
+    os.getenv("REPORT_REFINER_SEARCH_CACHE_MAX_ENTRIES", "512")
+)
+DEFAULT_SEARCH_CACHE_MAX_BYTES = int(
+    os.getenv("REPORT_REFINER_SEARCH_CACHE_MAX_BYTES", str(256 * 1024 * 1024))
+)
+
+# Batch search: concurrent index lookups per search_many call (queries
+# are embedded in one pass)
+DEFAULT_SEARCH_BATCH_WORKERS = int(
+    os.getenv("REPORT_REFINER_SEARCH_BATCH_WORKERS", "8")
+)
@@ -1,9 +1,20 @@
-from typing import Optional, List
+import threading
+from typing import Any, Dict, Optional, List, Tuple
 from pydantic import BaseModel
 
 from lancedb.pydantic import LanceModel, Vector
 from lancedb.embeddings import get_registry
 
+from .config import (
+    DEFAULT_EMBEDDING_MODEL,
+    DEFAULT_EMBEDDING_BACKEND,
+    DEFAULT_EMBEDDING_NDIMS,
+)
+
+# Registers the shared-model, int8 and ONNX backends with LanceDB, so tables re-create
+# them for queries
+from . import embedding_backends
+
 
 class Report(BaseModel):
     """
@@ -24,10 +35,93 @@ class Fragment(BaseModel):
     vector: Optional[List[float]] = None
 
 
-def get_embedding_function():
-    """Get the configured embedding function"""
-    # This can be made configurable via environment variables
-    return get_registry().get("huggingface").create(name="BAAI/bge-en-icl")
+_embedding_functions: Dict[Tuple[str, str], Any] = {}
+_embedding_functions_lock = threading.Lock()
+_warmup_state: Dict[str, Optional[str]] = {"state": "not started", "error": None}
+
+
+def get_embedding_function(name: Optional[str] = None, backend: Optional[str] = None):
+    """
+    Get the process-wide embedding function for a model, loading the model on
+    first use. Ingestion, search and finding-model storage all share it.
+
+    Args:
+        name: Model name (default: REPORT_REFINER_EMBEDDING_MODEL)
+        backend: One of EMBEDDING_BACKENDS (default: REPORT_REFINER_EMBEDDING_BACKEND)
+    """
+    key = (backend or DEFAULT_EMBEDDING_BACKEND, name or DEFAULT_EMBEDDING_MODEL)
+    with _embedding_functions_lock:
+        embed_fcn = _embedding_functions.get(key)
+        if embed_fcn is None:
+            embed_fcn = get_registry().get(key[0]).create(name=key[1])
+            if (
+                name is None
+                and DEFAULT_EMBEDDING_NDIMS
+                and embed_fcn.ndims() != DEFAULT_EMBEDDING_NDIMS
+            ):
+                raise ValueError(
+                    f"Embedding model {embed_fcn.name} produces "
+                    f"{embed_fcn.ndims()}-dimensional vectors, "
+                    f"but REPORT_REFINER_EMBEDDING_NDIMS is {DEFAULT_EMBEDDING_NDIMS}"
+                )
+            _embedding_functions[key] = embed_fcn
+    return embed_fcn
+
+
+def embedding_model_status() -> Dict[str, Any]:
+    """
+    Configured embedding model, whether it is loaded, and the load time of every model
+    loaded so far
+    """
+    key = (DEFAULT_EMBEDDING_BACKEND, DEFAULT_EMBEDDING_MODEL)
+    # Not under the lock, which is held while a model loads
+    loaded = key in _embedding_functions
+    return {
+        "backend": key[0],
+        "model": key[1],
+        "loaded": loaded,
+        "warmup": dict(_warmup_state),
+        "models_loaded": embedding_backends.get_model_load_metrics(),
+    }
+
+
+def warmup_embedding_function() -> Dict[str, Any]:
+    """
+    Load the configured embedding model now rather than on the first request
+    (e.g. at API startup), and return its status.
+    """
+    _warmup_state.update(state="running", error=None)
+    try:
+        get_embedding_function()
+    except Exception as e:
+        _warmup_state.update(state="failed", error=str(e))
+        raise
+    _warmup_state.update(state="done")
+    return embedding_model_status()
+
+
+def start_embedding_warmup() -> threading.Thread:
+    """
+    Load the configured embedding model in a background thread, so a server can
+    start serving (and report progress through `embedding_model_status`) while the
+    model loads. Requests that need the model meanwhile wait for it.
+    """
+    def warmup() -> None:
+        try:
+            status = warmup_embedding_function()
+        except Exception as e:
+            print(f"❌ Error loading embedding model: {str(e)}")
+            return
+        for loaded in status["models_loaded"]:
+            print(
+                f"🧠 Loaded embedding model {loaded['model']} ({loaded['backend']}) in "
+                f"{loaded['load_seconds']:.1f}s"
+            )
+
+    thread = threading.Thread(target=warmup, name="embedding-warmup", daemon=True)
+    _warmup_state.update(state="running", error=None)
+    thread.start()
+    return thread
 
 
 class FragmentSchema(LanceModel):
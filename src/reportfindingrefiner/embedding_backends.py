@@ -0,0 +1,280 @@
+import os
+import time
+import threading
+from types import SimpleNamespace
+from typing import Any, Callable, Dict, List, Optional, Tuple
+import numpy as np
+
+from pydantic import PrivateAttr
+from lancedb.embeddings import EmbeddingFunction
+from lancedb.embeddings.registry import register
+from lancedb.embeddings.transformers import TransformersEmbeddingFunction
+
+from .config import DEFAULT_ONNX_CACHE_DIR
+
+# LanceDB registry names accepted as REPORT_REFINER_EMBEDDING_BACKEND
+EMBEDDING_BACKENDS = ["huggingface", "huggingface-int8", "onnx"]
+
+# Loaded (tokenizer, model) pairs shared by every embedding function
+# instance in the process
+_shared_models: Dict[Tuple, Tuple[Any, Any]] = {}
+_shared_models_lock = threading.Lock()
+_model_load_metrics: List[Dict[str, Any]] = []
+
+
+def load_shared_model(
+    key: Tuple, loader: Callable[[], Tuple[Any, Any]]
+) -> Tuple[Any, Any]:
+    """
+    Return the (tokenizer, model) pair for `key`, calling `loader` only the first
+    time it is requested in this process.
+
+    LanceDB instantiates a table's embedding function whenever the table is opened
+    for search and on every `table.add`, so without sharing each of those would load
+    the model weights again.
+    """
+    with _shared_models_lock:
+        loaded = _shared_models.get(key)
+        if loaded is None:
+            start = time.perf_counter()
+            loaded = loader()
+            _model_load_metrics.append({
+                "backend": key[0],
+                "model": key[1],
+                "load_seconds": time.perf_counter() - start,
+                "loaded_at": time.time(),
+            })
+            _shared_models[key] = loaded
+        return loaded
+
+
+def get_model_load_metrics() -> List[Dict[str, Any]]:
+    """Backend, model name, load time and load timestamp of every model loaded so far"""
+    with _shared_models_lock:
+        return [dict(metrics) for metrics in _model_load_metrics]
+
+
+@register("huggingface")
+class SharedTransformersEmbeddingFunction(TransformersEmbeddingFunction):
+    """
+    LanceDB's "huggingface" embedding function, with the model loaded once per
+    process and shared between instances.
+    """
+
+    def __init__(self, *args, **kwargs):
+        # Skip TransformersEmbeddingFunction.__init__, which loads the model every time
+        EmbeddingFunction.__init__(self, *args, **kwargs)
+        self._ndims = None
+        self._tokenizer, self._model = load_shared_model(
+            (
+                self.__embedding_function_registry_alias__,
+                self.name,
+                self.device,
+                self.trust_remote_code,
+            ),
+            self._load,
+        )
+
+    @property
+    def tokenizer(self):
+        """The shared tokenizer, for batched embedding outside LanceDB"""
+        return self._tokenizer
+
+    @property
+    def model(self):
+        """The shared encoder, for batched embedding outside LanceDB"""
+        return self._model
+
+    def _load(self) -> Tuple[Any, Any]:
+        from transformers import AutoModel, AutoTokenizer
+
+        tokenizer = AutoTokenizer.from_pretrained(self.name)
+        model = AutoModel.from_pretrained(
+            self.name, trust_remote_code=self.trust_remote_code
+        )
+        return tokenizer, model.to(self.device)
+
+
+@register("huggingface-int8")
+class QuantizedTransformersEmbeddingFunction(SharedTransformersEmbeddingFunction):
+    """
+    The HuggingFace embedding function with its Linear layers dynamically
+    quantized to int8, for CPU-only hosts. Produces the same (mean-pooled)
+    kind of vectors as "huggingface" at a fraction of the memory and compute.
+    """
+
+    def _load(self) -> Tuple[Any, Any]:
+        import torch
+
+        if self.device != "cpu":
+            raise ValueError("int8 dynamic quantization only runs on the CPU")
+        tokenizer, model = super()._load()
+        model = torch.ao.quantization.quantize_dynamic(
+            model.eval(), {torch.nn.Linear}, dtype=torch.qint8
+        )
+        return tokenizer, model
+
+
+class _OnnxEncoder:
+    """
+    Runs an exported encoder with ONNX Runtime behind the part of the transformers
+    model interface that EmbeddingEngine uses (eval, to, config, calling with the
+    tokenizer's tensors and reading last_hidden_state).
+    """
+
+    def __init__(self, session, hidden_size: int):
+        self.session = session
+        self.config = SimpleNamespace(hidden_size=hidden_size)
+        self._input_names = {i.name for i in session.get_inputs()}
+
+    def eval(self) -> "_OnnxEncoder":
+        return self
+
+    def to(self, device) -> "_OnnxEncoder":
+        return self
+
+    def __call__(self, **inputs) -> SimpleNamespace:
+        import torch
+
+        feeds = {
+            name: value.cpu().numpy().astype(np.int64)
+            for name, value in inputs.items() if name in self._input_names
+        }
+        hidden = self.session.run(["last_hidden_state"], feeds)[0]
+        return SimpleNamespace(last_hidden_state=torch.from_numpy(hidden))
+
+
+def export_onnx_model(name: str, path: str, quantize: bool = True) -> None:
+    """
+    Export a HuggingFace encoder to ONNX (last_hidden_state output, dynamic batch
+    and sequence axes), optionally with int8 dynamically quantized weights.
+    """
+    import torch
+    from transformers import AutoModel, AutoTokenizer
+
+    class LastHiddenState(torch.nn.Module):
+        """
+        Takes the tokenizer outputs positionally and returns only last_hidden_state
+        """
+
+        def __init__(self, model, input_names: List[str]):
+            super().__init__()
+            self.model = model
+            self.input_names = input_names
+
+        def forward(self, *inputs):
+            return self.model(**dict(zip(self.input_names, inputs))).last_hidden_state
+
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    tokenizer = AutoTokenizer.from_pretrained(name)
+    model = AutoModel.from_pretrained(name).eval()
+    sample = tokenizer(["Findings: no acute abnormality."], return_tensors="pt")
+    input_names = [
+        key
+        for key in ("input_ids", "attention_mask", "token_type_ids")
+        if key in sample
+    ]
+    dynamic_axes = {
+        key: {0: "batch", 1: "sequence"} for key in [*input_names, "last_hidden_state"]
+    }
+
+    fp32_path = f"{path}.fp32" if quantize else path
+    with torch.no_grad():
+        torch.onnx.export(
+            LastHiddenState(model, input_names),
+            tuple(sample[key] for key in input_names),
+            fp32_path,
+            input_names=input_names,
+            output_names=["last_hidden_state"],
+            dynamic_axes=dynamic_axes,
+            dynamo=False,
+        )
+    if quantize:
+        from onnxruntime.quantization import QuantType, quantize_dynamic
+
+        quantize_dynamic(fp32_path, path, weight_type=QuantType.QInt8)
+        os.remove(fp32_path)
+
+
+@register("onnx")
+class OnnxEmbeddingFunction(EmbeddingFunction):
+    """
+    A HuggingFace encoder exported to ONNX and run with ONNX Runtime on the CPU,
+    mean-pooled like the "huggingface" embedding function (see `EmbeddingEngine`).
+
+    The model is exported (and by default int8 quantized) on first use and kept in
+    `onnx_path`, or under DEFAULT_ONNX_CACHE_DIR when no path is given.
+    """
+
+    name: str = "BAAI/bge-small-en-v1.5"
+    device: str = "cpu"
+    onnx_path: Optional[str] = None
+    quantize: bool = True
+    num_threads: int = 0  # 0 = ONNX Runtime default
+    _tokenizer: Any = PrivateAttr()
+    _model: Any = PrivateAttr()
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._tokenizer, self._model = load_shared_model(
+            ("onnx", self.name, self.onnx_path, self.quantize, self.num_threads),
+            self._load,
+        )
+
+    @property
+    def tokenizer(self):
+        """The shared tokenizer, for batched embedding outside LanceDB"""
+        return self._tokenizer
+
+    @property
+    def model(self) -> _OnnxEncoder:
+        """The ONNX Runtime encoder, behind the transformers model interface"""
+        return self._model
+
+    def _load(self) -> Tuple[Any, Any]:
+        try:
+            import onnxruntime
+        except ImportError as e:
+            raise ImportError(
+                "The onnx embedding backend requires the 'onnxruntime' and 'onnx' "
+                "packages; "
+                "install them with `pip install reportfindingrefiner[onnx]`"
+            ) from e
+        from transformers import AutoConfig, AutoTokenizer
+
+        path = self.onnx_path or os.path.join(
+            DEFAULT_ONNX_CACHE_DIR,
+            self.name.replace("/", "--"),
+            "model-int8.onnx" if self.quantize else "model.onnx",
+        )
+        if not os.path.exists(path):
+            print(f"\n📦 Exporting {self.name} to ONNX: {path}")
+            export_onnx_model(self.name, path, quantize=self.quantize)
+
+        options = onnxruntime.SessionOptions()
+        if self.num_threads > 0:
+            options.intra_op_num_threads = self.num_threads
+        session = onnxruntime.InferenceSession(
+            path, options, providers=["CPUExecutionProvider"]
+        )
+        tokenizer = AutoTokenizer.from_pretrained(self.name)
+        return tokenizer, _OnnxEncoder(
+            session, AutoConfig.from_pretrained(self.name).hidden_size
+        )
+
+    def ndims(self) -> int:
+        return self._model.config.hidden_size
+
+    def compute_query_embeddings(self, query: str, *args, **kwargs) -> List[np.ndarray]:
+        return self.compute_source_embeddings(query)
+
+    def compute_source_embeddings(self, texts, *args, **kwargs) -> List[np.ndarray]:
+        """
+        Embed texts in length-bucketed batches with masked mean pooling, exactly
+        as `EmbeddingEngine` does at ingest time, so table.add and searches get
+        the same vectors as the ingestion pipeline
+        """
+        # Imported here: embedding_engine imports data_models, which imports us
+        from .services.embedding_engine import EmbeddingEngine
+
+        return EmbeddingEngine(self).embed(list(self.sanitize_input(texts)))
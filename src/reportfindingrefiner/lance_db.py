@@ -1,8 +1,18 @@
-import os
+import math
+import threading
+from itertools import repeat
+from typing import Dict, List, Optional, Sequence, Set, Tuple
+import numpy as np
+import pyarrow as pa
 import lancedb
-from typing import List
+from lancedb.merge import LanceMergeInsertBuilder
+from .config import (
+    DEFAULT_VECTOR_INDEX_TYPE,
+    DEFAULT_VECTOR_INDEX_METRIC,
+    DEFAULT_VECTOR_INDEX_MIN_ROWS,
+    DEFAULT_VECTOR_INDEX_REBUILD_FRACTION,
+)
 from .data_models import FragmentSchema
-from tqdm import tqdm
 
 def connect_db(db_path: str = "./data/lancedb"):
     """
@@ -13,24 +23,356 @@ def connect_db(db_path: str = "./data/lancedb"):
 def create_fragment_table(db, table_name: str = "table") -> lancedb.table:
     """
     Create or overwrite a LanceDB table with the FragmentSchema.
+    The embedding function is stored with the table so query strings can be embedded
+    at search time.
     """
-    return db.create_table(table_name, schema=FragmentSchema, mode="overwrite")
-
-def insert_fragments(table, docs: List[dict]) -> None:
-    """
-    Insert fragment documents into the specified LanceDB table.
-    Shows progress during embedding and insertion.
-    """
-    total_docs = len(docs)
-    batch_size = 32  # Optimal batch size for embedding
-    
-    print(f"\n💾 Starting embedding and insertion of {total_docs} fragments...")
-    
-    # Process in batches with progress bar
-    with tqdm(total=total_docs, desc="Embedding fragments") as pbar:
-        for i in range(0, total_docs, batch_size):
-            batch = docs[i:min(i + batch_size, total_docs)]
-            table.add(batch)
-            pbar.update(len(batch))
-    
-    print("\n✅ Embedding and insertion complete!")
\ No newline at end of file
+    return db.create_table(
+        table_name, schema=FragmentSchema.with_embedding(), mode="overwrite"
+    )
+
+def open_or_create_fragment_table(db, table_name: str = "table") -> lancedb.table:
+    """
+    Open an existing fragment table, creating an empty one if it does not exist.
+    """
+    if table_name in db.table_names():
+        return db.open_table(table_name)
+    return db.create_table(
+        table_name, schema=FragmentSchema.with_embedding(), mode="create"
+    )
+
+# Table URI -> table version at which its full-text index was last found up to date
+_fts_index_versions: Dict[str, int] = {}
+_fts_index_lock = threading.Lock()
+
+def ensure_fts_index(table, field: str = "text") -> str:
+    """
+    Make sure the table has a full-text index on `field` that covers every row,
+    creating it if missing and otherwise indexing only the rows appended since.
+
+    The check is skipped while the table version is the one last found up to date.
+    This writes to the table, so it belongs on the write paths (after ingestion,
+    upserts and maintenance); queries use the read-only `require_fts_index`.
+
+    Returns:
+        "current", "created" or "updated"
+    """
+    key = getattr(table, "_dataset_uri", None) or table.to_lance().uri
+    with _fts_index_lock:
+        if _fts_index_versions.get(key) == table.version:
+            return "current"
+
+        dataset = table.to_lance()
+        index = next(
+            (
+                i
+                for i in dataset.list_indices()
+                if i["type"] == "Inverted" and i["fields"] == [field]
+            ),
+            None,
+        )
+        status = "current"
+        if index is None:
+            table.create_fts_index(field, use_tantivy=False, replace=True)
+            status = "created"
+        elif dataset.stats.index_stats(index["name"])["num_unindexed_fragments"]:
+            dataset.optimize.optimize_indices(index_names=[index["name"]])
+            table.checkout_latest()
+            status = "updated"
+        _fts_index_versions[key] = table.version
+        return status
+
+# Table URIs known to have a full-text index
+_fts_indexed_tables: Set[str] = set()
+
+def require_fts_index(table, field: str = "text") -> None:
+    """
+    Raise a ValueError unless the table has a full-text index on `field`.
+
+    Unlike `ensure_fts_index` this never writes, so it is safe on the query path
+    while an ingestion holds the table: the index is created and extended by the
+    write paths (ingestion, upserts and `optimize_table`), and rows added since it
+    was last extended are still found, just without the index. Tables found
+    indexed are remembered, so the check costs nothing after the first query.
+    """
+    key = getattr(table, "_dataset_uri", None) or table.to_lance().uri
+    if key in _fts_indexed_tables or key in _fts_index_versions:
+        return
+    if not any(
+        i["type"] == "Inverted" and i["fields"] == [field]
+        for i in table.to_lance().list_indices()
+    ):
+        raise ValueError(
+            f"Table {key} has no full-text index on {field!r}; ingest reports or "
+            "optimize the table to create it"
+        )
+    _fts_indexed_tables.add(key)
+
+# Scalar indices kept on fragment tables, by column: a btree for the high-cardinality
+# report IDs and a bitmap for the handful of section headings
+SCALAR_INDEX_TYPES: Dict[str, str] = {"report_id": "BTREE", "section": "BITMAP"}
+
+# Table URI -> table version at which its scalar indices were last found up to date
+_scalar_index_versions: Dict[str, int] = {}
+_scalar_index_lock = threading.Lock()
+
+
+def ensure_scalar_indices(
+    table, index_types: Optional[Dict[str, str]] = None
+) -> Dict[str, str]:
+    """
+    Make sure the table has a scalar index on each column of `index_types`
+    (default `SCALAR_INDEX_TYPES`) covering every row, so `where` filters on those
+    columns are index lookups rather than scans. Like `ensure_fts_index`, the check
+    is skipped while the table version is the one last found up to date.
+
+    Returns:
+        Column -> "current", "created" or "updated" (all "skipped" for an empty table)
+    """
+    index_types = index_types or SCALAR_INDEX_TYPES
+    key = getattr(table, "_dataset_uri", None) or table.to_lance().uri
+    with _scalar_index_lock:
+        if _scalar_index_versions.get(key) == table.version:
+            return {column: "current" for column in index_types}
+        if table.count_rows() == 0:
+            return {column: "skipped" for column in index_types}
+
+        dataset = table.to_lance()
+        indices = {
+            tuple(i["fields"]): i
+            for i in dataset.list_indices()
+            if i["type"] != "Inverted"
+        }
+        statuses = {}
+        stale = []
+        for column, index_type in index_types.items():
+            index = indices.get((column,))
+            if index is None:
+                table.create_scalar_index(column, index_type=index_type, replace=True)
+                statuses[column] = "created"
+            elif dataset.stats.index_stats(index["name"])["num_unindexed_fragments"]:
+                stale.append(index["name"])
+                statuses[column] = "updated"
+            else:
+                statuses[column] = "current"
+        if stale:
+            table.to_lance().optimize.optimize_indices(index_names=stale)
+        table.checkout_latest()
+        _scalar_index_versions[key] = table.version
+        return statuses
+
+# Fragment columns other than the vector, for reads that do not need embeddings
+FRAGMENT_TEXT_COLUMNS = ["report_id", "section", "sequence_number", "text"]
+
+
+def scan_fragments(
+    table, where: Optional[str] = None, columns: Optional[List[str]] = None
+) -> pa.Table:
+    """
+    Read the `columns` (default all) of the fragment rows matching a SQL filter
+    (default all rows). Filters on indexed columns (see `ensure_scalar_indices`)
+    only read the matching rows instead of scanning the table.
+    """
+    return table.to_lance().to_table(columns=columns, filter=where)
+
+def vector_index_params(num_rows: int, ndims: int) -> Dict[str, int]:
+    """
+    IVF partitions and PQ sub-vectors for a table size: about sqrt(rows) partitions,
+    and sub-vectors of about 16 dimensions (the vector size must divide evenly).
+    """
+    num_sub_vectors = max(1, ndims // 16)
+    while ndims % num_sub_vectors:
+        num_sub_vectors -= 1
+    return {
+        "num_partitions": max(1, round(math.sqrt(num_rows))),
+        "num_sub_vectors": num_sub_vectors,
+    }
+
+def create_vector_index(
+    table,
+    index_type: str = DEFAULT_VECTOR_INDEX_TYPE,
+    metric: str = DEFAULT_VECTOR_INDEX_METRIC,
+    vector_column: str = "vector",
+) -> Dict[str, int]:
+    """
+    Train an ANN index on the table's vectors from scratch, replacing any existing one.
+
+    Returns:
+        The partition and sub-vector settings used
+    """
+    params = vector_index_params(
+        table.count_rows(), table.schema.field(vector_column).type.list_size
+    )
+    print(
+        f"\n🧭 Building {index_type} vector index ({params['num_partitions']} "
+        "partitions, "
+        f"{params['num_sub_vectors']} sub-vectors)..."
+    )
+    table.create_index(
+        metric=metric,
+        vector_column_name=vector_column,
+        index_type=index_type,
+        replace=True,
+        **params,
+    )
+    return params
+
+def ensure_vector_index(
+    table,
+    min_rows: int = DEFAULT_VECTOR_INDEX_MIN_ROWS,
+    rebuild_fraction: float = DEFAULT_VECTOR_INDEX_REBUILD_FRACTION,
+    vector_column: str = "vector",
+    train: bool = True,
+) -> str:
+    """
+    Keep an ANN index on the table's vectors once it has `min_rows` rows.
+
+    New rows are added to the existing partitions, which is cheap but keeps the
+    centroids trained on the old data. The index was trained with about sqrt(rows)
+    partitions, so once the table has grown by `rebuild_fraction` past
+    partitions^2 rows it is retrained with settings for the current size.
+
+    Training reads every vector, so with train=False (e.g. after a small
+    incremental batch) the index is only extended, and creating or retraining it
+    is left to `optimize_table`.
+
+    Returns:
+        "skipped" (too few rows), "created", "rebuilt", "updated", "current" or
+        "deferred" (training needed but train=False)
+    """
+    num_rows = table.count_rows()
+    dataset = table.to_lance()
+    index = next(
+        (i for i in dataset.list_indices() if i["fields"] == [vector_column]), None
+    )
+    if index is None:
+        # Training the PQ codebooks needs at least 256 rows
+        if num_rows < max(min_rows, 256):
+            return "skipped"
+        if not train:
+            return "deferred"
+        create_vector_index(table, vector_column=vector_column)
+        return "created"
+
+    stats = dataset.stats.index_stats(index["name"])
+    num_partitions = stats["indices"][0]["num_partitions"]
+    if train and num_rows > (1 + rebuild_fraction) * num_partitions ** 2:
+        create_vector_index(table, vector_column=vector_column)
+        return "rebuilt"
+    if stats["num_unindexed_fragments"]:
+        dataset.optimize.optimize_indices(index_names=[index["name"]])
+        table.checkout_latest()
+        return "updated"
+    return "current"
+
+def quote_sql_string(value: str) -> str:
+    """
+    Quote a string literal for use in a LanceDB filter expression.
+    """
+    return "'" + value.replace("'", "''") + "'"
+
+
+def delete_report_fragments(
+    table, report_ids: List[str], batch_size: int = 500
+) -> None:
+    """
+    Delete all fragments belonging to the given report IDs.
+    IDs are deleted in batches to keep each filter expression small.
+    """
+    for i in range(0, len(report_ids), batch_size):
+        batch = report_ids[i:i + batch_size]
+        id_list = ", ".join(quote_sql_string(rid) for rid in batch)
+        table.delete(f"report_id IN ({id_list})")
+
+def upsert_report_fragments(table, fragments: pa.RecordBatch) -> None:
+    """
+    Insert or update fragments keyed on (report_id, sequence_number) in a single
+    merge-insert, so rows for unchanged keys are rewritten in place rather than
+    duplicated.
+    """
+    # Table.merge_insert in lancedb 0.17 only accepts a single key column as a
+    # string, so build the merge on the composite key directly
+    (
+        LanceMergeInsertBuilder(table, ["report_id", "sequence_number"])
+        .when_matched_update_all()
+        .when_not_matched_insert_all()
+        .execute(fragments)
+    )
+
+def delete_fragment_tails(table, tails: Dict[str, int], batch_size: int = 500) -> None:
+    """
+    Delete the fragments of each report from a sequence number onwards, for reports
+    that now have fewer fragments than before. `tails` maps report_id to the first
+    sequence number to delete.
+    """
+    # Group reports by start so each filter is a short IN list rather than a long
+    # chain of ORs, which is far slower to plan
+    by_start: Dict[int, List[str]] = {}
+    for report_id, start in tails.items():
+        by_start.setdefault(int(start), []).append(report_id)
+    for start, report_ids in by_start.items():
+        for i in range(0, len(report_ids), batch_size):
+            id_list = ", ".join(
+                quote_sql_string(rid) for rid in report_ids[i : i + batch_size]
+            )
+            table.delete(f"sequence_number >= {start} AND report_id IN ({id_list})")
+
+class FragmentColumns:
+    """
+    Column buffers for fragment rows.
+
+    Fragments are appended straight into one list per column and converted to a
+    `pyarrow.RecordBatch` in one step, rather than building a dict per row and
+    letting LanceDB convert the rows (and every vector) one by one.
+    """
+
+    def __init__(self):
+        self.report_ids: List[str] = []
+        self.sections: List[Optional[str]] = []
+        self.sequence_numbers: List[int] = []
+        self.texts: List[str] = []
+
+    def append_report(
+        self, report_id: str, fragments: Sequence[Tuple[Optional[str], str]]
+    ) -> None:
+        """
+        Append a report's (section, text) fragments, numbered from 0 in order.
+        """
+        self.report_ids.extend(repeat(report_id, len(fragments)))
+        self.sequence_numbers.extend(range(len(fragments)))
+        for section, text in fragments:
+            self.sections.append(section)
+            self.texts.append(text)
+
+    def __len__(self) -> int:
+        return len(self.texts)
+
+    def to_record_batch(
+        self, vectors: Sequence[Sequence[float]], schema: pa.Schema
+    ) -> pa.RecordBatch:
+        """
+        Build a RecordBatch in the table's schema with one vector per fragment.
+
+        The vectors are stacked into a single float32 matrix and wrapped as a
+        fixed-size list column without copying them row by row.
+        """
+        matrix = np.asarray(vectors, dtype=np.float32).reshape(len(self), -1)
+        vector_type = schema.field("vector").type
+        vector_array = pa.FixedSizeListArray.from_arrays(
+            pa.array(matrix.reshape(-1)), matrix.shape[1]
+        ).cast(vector_type)
+
+        columns = {
+            "report_id": self.report_ids,
+            "section": self.sections,
+            "sequence_number": self.sequence_numbers,
+            "text": self.texts,
+        }
+        arrays = [
+            (
+                vector_array
+                if field.name == "vector"
+                else pa.array(columns[field.name], type=field.type)
+            )
+            for field in schema
+        ]
+        return pa.RecordBatch.from_arrays(arrays, schema=schema)
@@ -1,6 +1,9 @@
 import lancedb
-from reportfindingrefiner.search import search_in_db
-from reportfindingrefiner.ingestion import read_reports_from_folder, ingest_reports
+from reportfindingrefiner.services.search import search_in_db
+from reportfindingrefiner.services.ingestion import (
+    read_reports_from_folder,
+    ingest_reports,
+)
 
 #ingest_reports("./data/reports", "./data/lancedb_search_test", "reports")
 print("Searching for 'fatty liver' in vector mode...")
@@ -1,52 +1,107 @@
 import re
-from typing import List, Tuple, Optional
-from .data_models import Report, Fragment
+from typing import TYPE_CHECKING, List, Tuple, Optional
+from .config import (
+    DEFAULT_SECTION_HEADINGS,
+    DEFAULT_SUBSECTION_HEADINGS,
+    DEFAULT_SECTION_HEADINGS_IGNORE_CASE,
+)
+from .token_chunker import TokenBudgetChunker
+
+if TYPE_CHECKING:
+    # data_models pulls in lancedb; ingestion split workers only need the splitter
+    from .data_models import Report, Fragment
 
 
 class SectionSplitter:
     """
-    Splits text into sections based on main headings (Header, Findings, Impression)
-    and then further splits sections by colons for natural subsections.
+    Splits text into sections based on main headings (Header, Findings, Impression
+    by default) and then further splits sections by colons for natural subsections.
+
+    The heading pattern is compiled once at construction, and a report is split into
+    fragments in a single scan. Headings can be any strings (e.g. "TECHNIQUE:",
+    "COMPARISON:", "CLINICAL HISTORY:"); with ignore_case=True they also match in any
+    case and the configured spelling is used as the section label.
+
+    With a `chunker`, the fragments of each report are re-chunked to the embedding
+    model's token budget (see `TokenBudgetChunker`).
     """
 
-    def __init__(self):
-        self.main_sections = ["Header:", "Findings:", "Impression:"]
+    def __init__(
+        self,
+        headings: Optional[List[str]] = None,
+        subsection_headings: Optional[List[str]] = None,
+        ignore_case: bool = DEFAULT_SECTION_HEADINGS_IGNORE_CASE,
+        chunker: Optional[TokenBudgetChunker] = None,
+    ):
+        self.main_sections = list(headings or DEFAULT_SECTION_HEADINGS)
+        self.subsection_headings = set(
+            DEFAULT_SUBSECTION_HEADINGS
+            if subsection_headings is None
+            else subsection_headings
+        )
+        self.ignore_case = ignore_case
+        self.chunker = chunker
+
+        # Longest first, so a heading that is a prefix of another cannot shadow it
+        alternatives = sorted(self.main_sections, key=len, reverse=True)
+        # The capture group makes split() return
+        # [preamble, heading, text, heading, text, ...]
+        self._pattern = re.compile(
+            "(" + "|".join(map(re.escape, alternatives)) + ")",
+            re.IGNORECASE if ignore_case else 0,
+        )
+        self._labels = {
+            (h.lower() if ignore_case else h): h for h in self.main_sections
+        }
+
+    def _iter_sections(self, report_text: str):
+        """
+        Yield (section_label, section_text) for each non-empty section in one scan.
+        Text before the first heading is ignored.
+        """
+        parts = self._pattern.split(report_text)
+        labels = self._labels
+        for i in range(1, len(parts), 2):
+            section_text = parts[i + 1].strip()
+            if section_text:
+                heading = parts[i].lower() if self.ignore_case else parts[i]
+                yield labels[heading], section_text
 
     def split_into_sections(self, report_text: str) -> List[Tuple[Optional[str], str]]:
         """
         Returns a list of tuples (section_label, section_text).
         If no headings are found, returns one tuple with (None, entire_text).
         """
-        pattern = r"(" + "|".join(map(re.escape, self.main_sections)) + r")"
-        parts = re.split(pattern, report_text)
-        results = []
-        current_section_label = None
-        current_text_chunks = []
-
-        for part in parts:
-            part_stripped = part.strip()
-            if not part_stripped:
-                continue
-
-            if part in self.main_sections:
-                if current_section_label and current_text_chunks:
-                    combined_text = " ".join(current_text_chunks).strip()
-                    results.append((current_section_label, combined_text))
-                current_section_label = part_stripped
-                current_text_chunks = []
-            else:
-                current_text_chunks.append(part_stripped)
-
-        # Final chunk
-        if current_section_label and current_text_chunks:
-            combined_text = " ".join(current_text_chunks).strip()
-            results.append((current_section_label, combined_text))
-
+        results = list(self._iter_sections(report_text))
         if not results and report_text.strip():
             results.append((None, report_text.strip()))
-
         return results
 
+    def _split_subsections(
+        self, label: Optional[str], text: str, out: List[Tuple[Optional[str], str]]
+    ) -> None:
+        """
+        Split a section line by line: every line containing (but not ending with)
+        a colon becomes its own fragment, and runs of other lines are joined with
+        spaces into one fragment. Runs are sliced out of the section text by offset
+        rather than collected and joined line by line.
+        """
+        run_start = None
+        offset = 0
+        for line in text.split("\n"):
+            if ":" in line and not line.endswith(":"):
+                if run_start is not None:
+                    out.append(
+                        (label, text[run_start : offset - 1].replace("\n", " ").strip())
+                    )
+                    run_start = None
+                out.append((label, line.strip()))
+            elif run_start is None:
+                run_start = offset
+            offset += len(line) + 1
+        if run_start is not None:
+            out.append((label, text[run_start:].replace("\n", " ").strip()))
+
     def create_smaller_fragments(
         self, section_fragments: List[Tuple[Optional[str], str]]
     ) -> List[Tuple[Optional[str], str]]:
@@ -54,47 +109,52 @@ class SectionSplitter:
         Split sections by colons to create natural subsections.
         Preserves the original section label (Header/Findings/Impression).
         """
-        smaller_fragments = []
+        smaller_fragments: List[Tuple[Optional[str], str]] = []
         for label, text in section_fragments:
-            if label == "Findings:" and ':' in text:
+            if label in self.subsection_headings and ':' in text:
                 # Split findings section by colons, preserving the parent section
-                lines = text.split('\n')
-                current_fragment = []
-                
-                for line in lines:
-                    if ':' in line and not line.endswith(':'):
-                        # If we have accumulated text, save it as a fragment
-                        if current_fragment:
-                            fragment_text = ' '.join(current_fragment).strip()
-                            smaller_fragments.append((label, fragment_text))
-                            current_fragment = []
-                        # Add this line as a new fragment
-                        smaller_fragments.append((label, line.strip()))
-                    else:
-                        current_fragment.append(line)
-                
-                # Add any remaining text
-                if current_fragment:
-                    fragment_text = ' '.join(current_fragment).strip()
-                    smaller_fragments.append((label, fragment_text))
+                self._split_subsections(label, text, smaller_fragments)
             else:
                 # Keep Header and Impression sections as single fragments
                 smaller_fragments.append((label, text.strip()))
-                
         return smaller_fragments
 
+    def split_into_fragments(self, report_text: str) -> List[Tuple[Optional[str], str]]:
+        """
+        Split a report's text into sections and then into smaller fragments,
+        in a single pass over the heading matches.
+        """
+        fragments: List[Tuple[Optional[str], str]] = []
+        parts = self._pattern.split(report_text)
+        labels = self._labels
+        for i in range(1, len(parts), 2):
+            text = parts[i + 1].strip()
+            if not text:
+                continue
+            label = labels[parts[i].lower() if self.ignore_case else parts[i]]
+            if label in self.subsection_headings and ":" in text:
+                self._split_subsections(label, text, fragments)
+            else:
+                fragments.append((label, text))
+        if not fragments and report_text.strip():
+            fragments.append((None, report_text.strip()))
+        if self.chunker is not None:
+            fragments = self.chunker.chunk(fragments)
+        return fragments
+
 
 def create_fragments_from_report(
-    report: Report, section_splitter: SectionSplitter
-) -> List[Fragment]:
+    report: "Report", section_splitter: SectionSplitter
+) -> List["Fragment"]:
     """
     1) Split the entire report text into sections.
     2) Possibly further split each section.
     3) Return a list of Fragment objects.
     """
+    from .data_models import Fragment
+
     fragments = []
-    sections = section_splitter.split_into_sections(report.text)
-    smaller_fragments = section_splitter.create_smaller_fragments(sections)
+    smaller_fragments = section_splitter.split_into_fragments(report.text)
     seq_num = 0
 
     for section_label, section_text in smaller_fragments:
@@ -113,8 +173,8 @@ def create_fragments_from_report(
 
 
 def create_fragments_from_reports(
-    reports: List[Report], section_splitter: SectionSplitter
-) -> List[Fragment]:
+    reports: List["Report"], section_splitter: SectionSplitter
+) -> List["Fragment"]:
     """
     Process a list of Report objects and return a list of Fragment objects.
     """
@@ -122,4 +182,23 @@ def create_fragments_from_reports(
     for r in reports:
         frags = create_fragments_from_report(r, section_splitter)
         all_fragments.extend(frags)
-    return all_fragments
\ No newline at end of file
+    return all_fragments
+
+
+_worker_splitter: Optional[SectionSplitter] = None
+
+
+def init_split_worker(section_splitter: SectionSplitter) -> None:
+    """
+    Process pool initializer: keep one splitter per worker process.
+    """
+    global _worker_splitter
+    _worker_splitter = section_splitter
+
+
+def split_texts_in_worker(texts: List[str]) -> List[List[Tuple[Optional[str], str]]]:
+    """
+    Split a chunk of report texts inside a process pool worker.
+    Returns the (section_label, text) fragments of each report, in input order.
+    """
+    return [_worker_splitter.split_into_fragments(text) for text in texts]
@@ -0,0 +1,143 @@
+import os
+import time
+from typing import List, Optional, Tuple
+from pydantic import BaseModel, Field
+
+from .manifest import IngestionManifest
+
+
+def checkpoint_path_for(db_path: str, table_name: str) -> str:
+    """Location of the ingestion checkpoint, stored next to the LanceDB table"""
+    return os.path.join(db_path, f"{table_name}.checkpoint.jsonl")
+
+
+class CheckpointHeader(BaseModel):
+    """
+    How an interrupted ingestion run was started, so it can be resumed the same way.
+    """
+    reports_folder: str  # folder or report file, read with the source options below
+    source_format: str = "auto"
+    id_field: str = "id"
+    text_field: str = "text"
+    chunk_by_tokens: bool = False
+    incremental: bool
+    replace_untracked: bool
+    table_version: int  # table version before the first batch was written
+    started_at: float = Field(default_factory=time.time)
+
+
+class CommittedBatch(BaseModel):
+    """
+    One batch whose fragments are stored in the table.
+    """
+    table_version: int
+    # (report_id, content_hash, mtime, fragment_count, duplicate_of, source)
+    reports: List[Tuple[str, str, float, int, Optional[str], Optional[str]]]
+
+
+class IngestionCheckpoint:
+    """
+    Append-only record of the batches committed by an ingestion run.
+
+    The first line of the file is the run's header; every committed batch then
+    appends one line, flushed and fsynced before the next batch is written, with
+    the table version it produced and the manifest entries of its reports. If the
+    run dies, even without reaching a `finally` block, the checkpoint tells a
+    restarted run which reports are already stored and which table version to
+    roll back to, so nothing committed is embedded again.
+    """
+
+    def __init__(
+        self,
+        path: str,
+        header: CheckpointHeader,
+        batches: Optional[List[CommittedBatch]] = None,
+    ):
+        self.path = path
+        self.header = header
+        self.batches: List[CommittedBatch] = batches or []
+
+    @classmethod
+    def start(cls, path: str, header: CheckpointHeader) -> "IngestionCheckpoint":
+        """Begin a new checkpoint, replacing any left by an earlier run"""
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        checkpoint = cls(path, header)
+        with open(path, "w", encoding="utf-8") as f:
+            checkpoint._write_line(f, header)
+        return checkpoint
+
+    @classmethod
+    def load(cls, path: str) -> Optional["IngestionCheckpoint"]:
+        """Load the checkpoint of an interrupted run, or None if there is none"""
+        if not os.path.exists(path):
+            return None
+        with open(path, "r", encoding="utf-8") as f:
+            lines = f.read().splitlines()
+        if not lines:
+            return None
+        header = CheckpointHeader.model_validate_json(lines[0])
+        batches = []
+        for line in lines[1:]:
+            try:
+                batches.append(CommittedBatch.model_validate_json(line))
+            except ValueError:
+                # A line torn by the crash; its batch is rolled back on resume
+                break
+        return cls(path, header, batches)
+
+    @staticmethod
+    def _write_line(f, record: BaseModel) -> None:
+        f.write(record.model_dump_json() + "\n")
+        f.flush()
+        os.fsync(f.fileno())
+
+    def record_batch(
+        self,
+        table_version: int,
+        reports: List[Tuple[str, str, float, int, Optional[str], Optional[str]]],
+    ) -> None:
+        """Durably record a batch once its fragments are stored in the table"""
+        batch = CommittedBatch(table_version=table_version, reports=reports)
+        with open(self.path, "a", encoding="utf-8") as f:
+            self._write_line(f, batch)
+        self.batches.append(batch)
+
+    @property
+    def table_version(self) -> int:
+        """Table version after the last committed batch"""
+        return (
+            self.batches[-1].table_version
+            if self.batches
+            else self.header.table_version
+        )
+
+    @property
+    def reports_committed(self) -> int:
+        return sum(len(batch.reports) for batch in self.batches)
+
+    @property
+    def last_report_id(self) -> Optional[str]:
+        for batch in reversed(self.batches):
+            if batch.reports:
+                return batch.reports[-1][0]
+        return None
+
+    def apply_to(self, manifest: IngestionManifest) -> None:
+        """Record every committed report in the manifest"""
+        for batch in self.batches:
+            for (
+                report_id,
+                content_hash,
+                mtime,
+                fragment_count,
+                duplicate_of,
+                source,
+            ) in batch.reports:
+                manifest.update(
+                    report_id, content_hash, mtime, fragment_count, duplicate_of, source
+                )
+
+    def remove(self) -> None:
+        """Delete the checkpoint once the run has completed"""
+        if os.path.exists(self.path):
+            os.remove(self.path)
@@ -0,0 +1,262 @@
+import os
+import re
+import zlib
+from typing import Dict, Iterable, List, Optional, Set
+import numpy as np
+
+from ..config import (
+    DEFAULT_DEDUP_THRESHOLD,
+    DEFAULT_DEDUP_NUM_PERM,
+    DEFAULT_DEDUP_BANDS,
+    DEFAULT_DEDUP_SHINGLE_SIZE,
+)
+
+_MERSENNE_PRIME = np.uint64((1 << 61) - 1)
+_MAX_HASH = np.uint64((1 << 32) - 1)
+_WORD = re.compile(r"\w+")
+
+
+def dedup_index_path_for(db_path: str, table_name: str) -> str:
+    """Location of the near-duplicate index, stored next to the LanceDB table"""
+    return os.path.join(db_path, f"{table_name}.minhash.npz")
+
+
+def shingle_hashes(
+    text: str, shingle_size: int = DEFAULT_DEDUP_SHINGLE_SIZE
+) -> np.ndarray:
+    """
+    32-bit hashes of the distinct word n-grams of a text, ignoring case and punctuation.
+    """
+    words = _WORD.findall(text.lower())
+    if len(words) <= shingle_size:
+        shingles = {" ".join(words)}
+    else:
+        shingles = {
+            " ".join(words[i : i + shingle_size])
+            for i in range(len(words) - shingle_size + 1)
+        }
+    return np.fromiter(
+        (zlib.crc32(s.encode("utf-8")) for s in shingles),
+        dtype=np.uint64,
+        count=len(shingles),
+    )
+
+
+class MinHasher:
+    """
+    MinHash signatures of word shingles; the fraction of equal signature values
+    between two texts estimates the Jaccard similarity of their shingle sets.
+    """
+
+    def __init__(
+        self,
+        num_perm: int = DEFAULT_DEDUP_NUM_PERM,
+        shingle_size: int = DEFAULT_DEDUP_SHINGLE_SIZE,
+        seed: int = 1,
+    ):
+        self.num_perm = num_perm
+        self.shingle_size = shingle_size
+        rng = np.random.RandomState(seed)
+        # a, b and the shingle hashes are below 2**32, so a * h + b
+        # never overflows uint64
+        self.a = rng.randint(1, 1 << 32, size=num_perm, dtype=np.uint64)
+        self.b = rng.randint(0, 1 << 32, size=num_perm, dtype=np.uint64)
+
+    def signature(self, text: str) -> np.ndarray:
+        hashes = shingle_hashes(text, self.shingle_size)[:, np.newaxis]
+        permuted = ((hashes * self.a + self.b) % _MERSENNE_PRIME) & _MAX_HASH
+        return permuted.min(axis=0).astype(np.uint32)
+
+
+class NearDuplicateIndex:
+    """
+    MinHash/LSH index of representative reports.
+
+    Each report's signature is cut into `bands` bands; reports that share a band
+    are candidates, and a candidate whose estimated similarity reaches `threshold`
+    makes the new report a near-duplicate of it. Reports without such a match
+    become representatives themselves. Only representatives' signatures are kept,
+    and they are saved next to the table so later runs dedupe against them too.
+
+    New and removed representatives stay uncommitted until `commit` is called once
+    the table is written, and `save` stores them as they were before. An
+    interrupted ingestion therefore never saves a representative whose fragments
+    are not in the table, nor drops one whose fragments still are.
+    """
+
+    def __init__(
+        self,
+        path: Optional[str] = None,
+        threshold: float = DEFAULT_DEDUP_THRESHOLD,
+        num_perm: int = DEFAULT_DEDUP_NUM_PERM,
+        bands: int = DEFAULT_DEDUP_BANDS,
+        shingle_size: int = DEFAULT_DEDUP_SHINGLE_SIZE,
+    ):
+        if num_perm % bands:
+            raise ValueError(
+                f"num_perm ({num_perm}) must be a multiple of bands ({bands})"
+            )
+        self.path = path
+        self.threshold = threshold
+        self.bands = bands
+        self.rows = num_perm // bands
+        self.hasher = MinHasher(num_perm, shingle_size)
+
+        self._ids: List[Optional[str]] = []  # None where a representative was removed
+        self._signatures: List[np.ndarray] = []
+        self._positions: Dict[str, int] = {}
+        self._buckets: Dict[bytes, int] = {}
+        # representatives whose fragments are not written yet
+        self._uncommitted: Set[str] = set()
+        # positions of removed representatives whose old signature is kept until
+        # the removal is committed or a successor takes it over
+        self._retired: Dict[str, int] = {}
+
+    @classmethod
+    def load(cls, path: str, **kwargs) -> "NearDuplicateIndex":
+        """
+        Load saved representatives, or start empty if none were saved with these
+        settings
+        """
+        index = cls(path, **kwargs)
+        if os.path.exists(path):
+            with np.load(path) as saved:
+                params = saved["params"].tolist()
+                if params == [
+                    index.hasher.num_perm,
+                    index.bands,
+                    index.hasher.shingle_size,
+                ]:
+                    for report_id, signature in zip(
+                        saved["ids"].tolist(), saved["signatures"]
+                    ):
+                        index._add(report_id, signature)
+        return index
+
+    def save(self) -> None:
+        """
+        Atomically write the committed representatives' signatures to disk.
+        Representatives whose changed text is not committed yet keep their old
+        signature.
+        """
+        if self.path is None:
+            return
+        os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+        tmp_path = f"{self.path}.tmp"
+        # Snapshot first: the ingestion pipeline may add reports from another thread
+        uncommitted = set(self._uncommitted)
+        positions = {
+            report_id: position
+            for position, report_id in enumerate(list(self._ids))
+            if report_id is not None and report_id not in uncommitted
+        }
+        for report_id, position in dict(self._retired).items():
+            positions.setdefault(report_id, position)
+        ids = list(positions)
+        signatures = (
+            np.stack([self._signatures[positions[report_id]] for report_id in ids])
+            if ids
+            else np.zeros((0, self.hasher.num_perm), dtype=np.uint32)
+        )
+        with open(tmp_path, "wb") as f:
+            np.savez(
+                f,
+                ids=np.array(ids, dtype=str),
+                signatures=signatures,
+                params=np.array(
+                    [self.hasher.num_perm, self.bands, self.hasher.shingle_size]
+                ),
+            )
+        os.replace(tmp_path, self.path)
+
+    def clear(self) -> None:
+        self._ids, self._signatures = [], []
+        self._positions, self._buckets = {}, {}
+        self._uncommitted, self._retired = set(), {}
+
+    def commit(self, report_ids: Iterable[str]) -> None:
+        """
+        Mark reports as written to (or deleted from) the table, so `save` stores
+        them as they are now
+        """
+        for report_id in report_ids:
+            self._uncommitted.discard(report_id)
+            self._retired.pop(report_id, None)
+
+    def _band_keys(self, signature: np.ndarray) -> List[bytes]:
+        return [
+            band.to_bytes(2, "little")
+            + signature[band * self.rows : (band + 1) * self.rows].tobytes()
+            for band in range(self.bands)
+        ]
+
+    def _add(self, report_id: str, signature: np.ndarray) -> None:
+        position = self._positions.get(report_id)
+        if position is None:
+            position = len(self._ids)
+            self._positions[report_id] = position
+            self._ids.append(report_id)
+            self._signatures.append(signature)
+        else:
+            # A changed representative; stale buckets fail the similarity check
+            self._signatures[position] = signature
+        for key in self._band_keys(signature):
+            self._buckets.setdefault(key, position)
+
+    def find_or_add(self, report_id: str, text: str) -> Optional[str]:
+        """
+        Return the ID of a representative report that `text` nearly duplicates,
+        or None after registering the report as a new representative.
+        """
+        signature = self.hasher.signature(text)
+        for key in self._band_keys(signature):
+            position = self._buckets.get(key)
+            if position is None or self._ids[position] == report_id:
+                continue
+            if np.mean(self._signatures[position] == signature) >= self.threshold:
+                return self._ids[position]
+        # Before _add, so a concurrent save never sees it half-added
+        self._uncommitted.add(report_id)
+        self._add(report_id, signature)
+        return None
+
+    def remove(self, report_id: str, successor: Optional[str] = None) -> bool:
+        """
+        Stop deduplicating against `report_id`, e.g. once it is deleted or its text
+        changed. A `successor` (one of its near-duplicates promoted to representative)
+        takes over its signature instead. Returns whether the report was a
+        representative.
+
+        Without a successor the old signature is still saved until the removal is
+        committed (see `commit`). Naming a successor in the meantime hands that old
+        signature over, even if the report's changed text was added since: the
+        ingestion pipeline removes changed representatives before it knows which
+        near-duplicate is promoted in their place.
+        """
+        retired = self._retired.pop(report_id, None) if successor is not None else None
+        if retired is not None:
+            if successor not in self._positions:
+                self._positions[successor] = retired
+                self._ids[retired] = successor
+                for key in self._band_keys(self._signatures[retired]):
+                    self._buckets.setdefault(key, retired)
+            return True
+        position = self._positions.pop(report_id, None)
+        if position is None:
+            return False
+        uncommitted = report_id in self._uncommitted
+        self._uncommitted.discard(report_id)
+        if successor is not None and successor not in self._positions:
+            self._positions[successor] = position
+            self._ids[position] = successor
+            return True
+        for key in self._band_keys(self._signatures[position]):
+            if self._buckets.get(key) == position:
+                del self._buckets[key]
+        self._ids[position] = None
+        if not uncommitted:
+            self._retired[report_id] = position
+        return True
+
+    def __len__(self) -> int:
+        return len(self._positions)
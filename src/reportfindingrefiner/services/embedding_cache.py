@@ -0,0 +1,185 @@
+import os
+import time
+import sqlite3
+import threading
+from typing import Callable, Dict, List, Optional, Sequence
+import numpy as np
+
+from ..config import DEFAULT_EMBEDDING_CACHE_MAX_ENTRIES
+from .manifest import hash_text
+
+
+def embedding_cache_path_for(db_path: str) -> str:
+    """Location of the embedding cache, shared by all tables in a LanceDB folder"""
+    return os.path.join(db_path, "embedding_cache.sqlite")
+
+
+class EmbeddingCache:
+    """
+    On-disk cache of fragment embeddings keyed by (model name, text hash).
+
+    Radiology reports repeat the same sentences constantly, so most fragments can
+    reuse a vector computed earlier instead of going through the model again.
+    Entries are evicted least-recently-used first once `max_entries` is exceeded.
+    """
+
+    def __init__(
+        self,
+        path: str,
+        model_name: str,
+        max_entries: int = DEFAULT_EMBEDDING_CACHE_MAX_ENTRIES,
+    ):
+        self.path = path
+        self.model_name = model_name
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS embeddings (
+                model TEXT NOT NULL,
+                text_hash TEXT NOT NULL,
+                vector BLOB NOT NULL,
+                last_used REAL NOT NULL,
+                PRIMARY KEY (model, text_hash)
+            )
+            """
+        )
+        self._conn.execute(
+            "CREATE INDEX IF NOT EXISTS embeddings_last_used ON embeddings (last_used)"
+        )
+        self._conn.commit()
+        (self._count,) = self._conn.execute(
+            "SELECT COUNT(*) FROM embeddings"
+        ).fetchone()
+
+    def get_many(self, text_hashes: Sequence[str]) -> Dict[str, np.ndarray]:
+        """
+        Look up vectors for the given text hashes, counting hits and misses.
+        Returns only the hashes that were found.
+        """
+        unique_hashes = list(dict.fromkeys(text_hashes))
+        found: Dict[str, np.ndarray] = {}
+        with self._lock:
+            # Stay well below SQLite's host parameter limit
+            for i in range(0, len(unique_hashes), 500):
+                chunk = unique_hashes[i:i + 500]
+                placeholders = ", ".join("?" for _ in chunk)
+                rows = self._conn.execute(
+                    f"SELECT text_hash, vector FROM embeddings "
+                    f"WHERE model = ? AND text_hash IN ({placeholders})",
+                    [self.model_name, *chunk],
+                ).fetchall()
+                for text_hash, blob in rows:
+                    found[text_hash] = np.frombuffer(blob, dtype=np.float32)
+
+            if found:
+                now = time.time()
+                self._conn.executemany(
+                    "UPDATE embeddings SET last_used = ? WHERE model = ? AND text_hash "
+                    "= ?",
+                    [(now, self.model_name, h) for h in found],
+                )
+                self._conn.commit()
+
+            self.hits += sum(1 for h in text_hashes if h in found)
+            self.misses += sum(1 for h in text_hashes if h not in found)
+        return found
+
+    def put_many(
+        self, text_hashes: Sequence[str], vectors: Sequence[Sequence[float]]
+    ) -> None:
+        """
+        Store vectors for the given text hashes, then evict old entries if over budget.
+        """
+        now = time.time()
+        rows = [
+            (self.model_name, h, np.asarray(v, dtype=np.float32).tobytes(), now)
+            for h, v in zip(text_hashes, vectors)
+        ]
+        with self._lock:
+            cursor = self._conn.executemany(
+                "INSERT OR IGNORE INTO embeddings (model, text_hash, vector, "
+                "last_used) "
+                "VALUES (?, ?, ?, ?)",
+                rows,
+            )
+            self._count += max(cursor.rowcount, 0)
+            self._evict()
+            self._conn.commit()
+
+    def _evict(self) -> None:
+        """Drop the least recently used entries beyond max_entries"""
+        excess = self._count - self.max_entries
+        if excess > 0:
+            cursor = self._conn.execute(
+                "DELETE FROM embeddings WHERE rowid IN "
+                "(SELECT rowid FROM embeddings ORDER BY last_used LIMIT ?)",
+                (excess,),
+            )
+            self._count -= cursor.rowcount
+
+    def __len__(self) -> int:
+        return self._count
+
+    @property
+    def hit_rate(self) -> float:
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
+
+    def stats(self) -> Dict[str, float]:
+        """Hit/miss counters for reporting"""
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hit_rate,
+            "entries": len(self),
+            "max_entries": self.max_entries,
+        }
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+
+def embed_with_cache(
+    texts: List[str],
+    embed: Callable[[List[str]], Sequence[Sequence[float]]],
+    cache: Optional[EmbeddingCache] = None,
+) -> List[Sequence[float]]:
+    """
+    Embed texts, computing vectors only for texts that are not already cached.
+    Duplicate texts within the call are embedded once.
+
+    Args:
+        texts: Fragment texts to embed
+        embed: Function that computes vectors for a list of texts
+        cache: Optional embedding cache consulted before computing
+
+    Returns:
+        One vector per input text, in input order
+    """
+    if cache is None:
+        return list(embed(texts))
+
+    text_hashes = [hash_text(t) for t in texts]
+    vectors = cache.get_many(text_hashes)
+
+    missing: Dict[str, str] = {}
+    for text, text_hash in zip(texts, text_hashes):
+        if text_hash not in vectors:
+            missing.setdefault(text_hash, text)
+
+    if missing:
+        missing_hashes = list(missing)
+        computed = embed([missing[h] for h in missing_hashes])
+        cache.put_many(missing_hashes, computed)
+        for text_hash, vector in zip(missing_hashes, computed):
+            vectors[text_hash] = np.asarray(vector, dtype=np.float32)
+
+    return [vectors[h] for h in text_hashes]
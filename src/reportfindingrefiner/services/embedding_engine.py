@@ -0,0 +1,126 @@
+from typing import Dict, List, Optional, Sequence
+import numpy as np
+
+from ..config import (
+    DEFAULT_EMBED_MAX_TOKENS_PER_BATCH,
+    DEFAULT_EMBED_MAX_BATCH_SIZE,
+    DEFAULT_EMBED_NUM_THREADS,
+)
+from ..data_models import get_embedding_function
+
+
+def plan_length_buckets(
+    token_lengths: Sequence[int],
+    max_tokens_per_batch: int = DEFAULT_EMBED_MAX_TOKENS_PER_BATCH,
+    max_batch_size: int = DEFAULT_EMBED_MAX_BATCH_SIZE,
+) -> List[List[int]]:
+    """
+    Group text indices into batches of similar token length.
+
+    Texts are sorted by length and added to the current batch while
+    (longest length in batch x batch size) stays within the token budget, so
+    short fragments are embedded in large batches and long ones in small batches,
+    with little padding in either.
+    """
+    order = sorted(range(len(token_lengths)), key=lambda i: token_lengths[i])
+    batches: List[List[int]] = []
+    current: List[int] = []
+    for i in order:
+        # Lengths are ascending, so the newest text is always the longest in the batch
+        padded_tokens = max(token_lengths[i], 1) * (len(current) + 1)
+        if current and (
+            padded_tokens > max_tokens_per_batch or len(current) >= max_batch_size
+        ):
+            batches.append(current)
+            current = []
+        current.append(i)
+    if current:
+        batches.append(current)
+    return batches
+
+
+def set_embedding_threads(num_threads: int = DEFAULT_EMBED_NUM_THREADS) -> None:
+    """
+    Set torch's intra-op thread count for embedding (0 = leave torch's default).
+    The setting is process-wide, so it is applied once when an ingestion starts
+    rather than by every EmbeddingEngine.
+    """
+    if num_threads > 0:
+        # Imported here rather than at module level: importing torch takes seconds
+        import torch
+
+        torch.set_num_threads(num_threads)
+
+
+class EmbeddingEngine:
+    """
+    Batched CPU embedding of fragment texts.
+
+    Wraps the tokenizer and model behind `get_embedding_function()` and produces the
+    same mean-pooled vectors, but tokenizes once, buckets texts by length, picks
+    batch sizes from a token budget and runs the model under `torch.inference_mode`.
+    """
+
+    def __init__(
+        self,
+        embed_fcn=None,
+        max_tokens_per_batch: int = DEFAULT_EMBED_MAX_TOKENS_PER_BATCH,
+        max_batch_size: int = DEFAULT_EMBED_MAX_BATCH_SIZE,
+    ):
+        self.embed_fcn = embed_fcn or get_embedding_function()
+        self.tokenizer = self.embed_fcn.tokenizer
+        self.model = self.embed_fcn.model
+        self.device = self.embed_fcn.device
+        self.max_tokens_per_batch = max_tokens_per_batch
+        self.max_batch_size = max_batch_size
+        self.model.eval()
+
+    @property
+    def model_name(self) -> str:
+        return self.embed_fcn.name
+
+    def ndims(self) -> int:
+        return self.embed_fcn.ndims()
+
+    def _embed_batch(
+        self, encodings: Dict[str, List[List[int]]], indices: List[int]
+    ) -> np.ndarray:
+        """Pad one length bucket, run the model and mean-pool over real tokens"""
+        features = {
+            key: [values[i] for i in indices] for key, values in encodings.items()
+        }
+        batch = self.tokenizer.pad(features, return_tensors="pt").to(self.device)
+        hidden = self.model(**batch).last_hidden_state
+        # Mask out padding so results match embedding each text on its own
+        mask = batch["attention_mask"].unsqueeze(-1).to(hidden.dtype)
+        pooled = (hidden * mask).sum(dim=1) / mask.sum(dim=1).clamp(min=1)
+        return pooled.float().cpu().numpy()
+
+    def embed(self, texts: List[str]) -> List[np.ndarray]:
+        """
+        Embed a list of texts.
+
+        Args:
+            texts: Texts to embed
+
+        Returns:
+            One float32 vector per text, in input order
+        """
+        import torch
+
+        if not texts:
+            return []
+
+        encodings = self.tokenizer(list(texts), truncation=True, padding=False)
+        encodings = {key: encodings[key] for key in encodings.keys()}
+        lengths = [len(ids) for ids in encodings["input_ids"]]
+
+        vectors: List[Optional[np.ndarray]] = [None] * len(texts)
+        with torch.inference_mode():
+            for indices in plan_length_buckets(
+                lengths, self.max_tokens_per_batch, self.max_batch_size
+            ):
+                pooled = self._embed_batch(encodings, indices)
+                for row, i in enumerate(indices):
+                    vectors[i] = pooled[row]
+        return vectors
@@ -1,17 +1,22 @@
 from typing import List, Optional
 import requests
 from jinja2 import Template
-import lancedb
 import os
 
-from .config import (
+from ..config import (
     DEFAULT_MODEL,
     DEFAULT_DB_PATH,
     DEFAULT_LIMIT,
     DEFAULT_SEARCH_MODE
 )
-from .models.finding_model import FindingModelBase
-from .data_models import FindingModelSchema
+from ..models.finding_model import FindingModelBase
+
+def _connect_db(path: str):
+    """
+    Connect to LanceDB, importing it only when a command actually needs the database
+    """
+    import lancedb
+    return lancedb.connect(path)
 
 def generate_finding_description(finding_name: str, model: str = DEFAULT_MODEL) -> str:
     """Generate a description for a finding using the LLM"""
@@ -75,7 +80,7 @@ def generate_finding_outline(
         finding_model = FindingModelBase.model_validate_json(model_json)
         
         # Save to findings database
-        findings_db = lancedb.connect(os.path.join(db_path, "findings"))
+        findings_db = _connect_db(os.path.join(db_path, "findings"))
         findings_table = findings_db.open_table("findings")
         findings_table.add([{
             "model_name": finding_model.name,
@@ -110,16 +115,17 @@ def generate_finding_outline_with_context(
         
         # Search for relevant context
         search_query = f"{name} {description}"
-        reports_db = lancedb.connect(db_path)
+        reports_db = _connect_db(db_path)
         reports_table = reports_db.open_table("reports")
         
         # Perform search based on specified mode
+        from .search import basic_search, hybrid_search, vector_search
         if search_mode == "basic":
-            results = reports_table.search(search_query).limit(limit).to_list()
+            results = basic_search(reports_table, search_query, limit)
         elif search_mode == "hybrid":
-            results = reports_table.search(search_query, query_type="hybrid").limit(limit).to_list()
+            results = hybrid_search(reports_table, search_query, limit)
         elif search_mode == "vector":
-            results = reports_table.search(search_query, query_type="vector").limit(limit).to_list()
+            results = vector_search(reports_table, search_query, limit)
         else:
             raise ValueError(f"Unknown search mode: {search_mode}")
 
@@ -144,7 +150,7 @@ def generate_finding_outline_with_context(
         finding_model = FindingModelBase.model_validate_json(model_json)
         
         # Save to findings database
-        findings_db = lancedb.connect(os.path.join(db_path, "findings"))
+        findings_db = _connect_db(os.path.join(db_path, "findings"))
         findings_table = findings_db.open_table("findings")
         findings_table.add([{
             "model_name": finding_model.name,
@@ -160,7 +166,7 @@ def generate_finding_outline_with_context(
 def list_finding_models(db_path: str = DEFAULT_DB_PATH) -> List[dict]:
     """Retrieve all finding models from the database"""
     try:
-        findings_db = lancedb.connect(os.path.join(db_path, "findings"))
+        findings_db = _connect_db(os.path.join(db_path, "findings"))
         findings_table = findings_db.open_table("findings")
         df = findings_table.to_pandas()
         
@@ -1,90 +1,767 @@
 import os
-from typing import List
-from .data_models import Report
-from .section_splitter import SectionSplitter, create_fragments_from_report
-from .lance_db import connect_db, create_fragment_table, insert_fragments
+from typing import Dict, Iterable, Iterator, List, NamedTuple, Optional, Set, Tuple
+import pyarrow as pa
+from pydantic import BaseModel
+from ..config import (
+    DEFAULT_INGEST_BATCH_SIZE,
+    DEFAULT_MAX_IN_FLIGHT_BATCHES,
+    DEFAULT_INGEST_WORKERS,
+    DEFAULT_SPLIT_CHUNK_SIZE,
+    DEFAULT_EMBEDDING_MODEL,
+    DEFAULT_EMBEDDING_BACKEND,
+    DEFAULT_EMBEDDING_CACHE_ENABLED,
+    DEFAULT_EMBED_MAX_TOKENS_PER_BATCH,
+    DEFAULT_EMBED_NUM_THREADS,
+    DEFAULT_DEDUP_ENABLED,
+    DEFAULT_DEDUP_THRESHOLD,
+    DEFAULT_CHUNK_BY_TOKENS,
+)
+from ..data_models import Report
+from ..section_splitter import SectionSplitter, init_split_worker, split_texts_in_worker
+from ..token_chunker import TokenBudgetChunker
+from ..lance_db import (
+    connect_db,
+    create_fragment_table,
+    open_or_create_fragment_table,
+    delete_report_fragments,
+    ensure_fts_index,
+    ensure_scalar_indices,
+    ensure_vector_index,
+    FragmentColumns,
+    quote_sql_string,
+    scan_fragments,
+)
+from .manifest import IngestionManifest, hash_text, manifest_path_for
+from .checkpoint import CheckpointHeader, IngestionCheckpoint, checkpoint_path_for
+from .embedding_cache import EmbeddingCache, embed_with_cache, embedding_cache_path_for
+from .embedding_engine import EmbeddingEngine, set_embedding_threads
+from .dedup import NearDuplicateIndex, dedup_index_path_for
+from .pipeline import batched, map_chunks_in_processes, prefetch
+from .report_sources import (
+    SourceReport,
+    iter_folder_reports,
+    iter_report_files,
+    open_report_source,
+)
 from tqdm import tqdm
 
+
+class ReportToIngest(NamedTuple):
+    """A new or changed report on its way through the ingestion pipeline."""
+    report: Report
+    content_hash: str
+    mtime: float
+    stale: bool  # existing fragments for this report_id must be deleted first
+    # set when the report is a near-duplicate and is not embedded
+    duplicate_of: Optional[str] = None
+    source: Optional[str] = None  # recorded in the manifest (see `ManifestEntry`)
+
+
+class FragmentBatch(NamedTuple):
+    """Fragments for a group of whole reports, written to the table together."""
+    fragments: FragmentColumns
+    reports: List[Tuple[ReportToIngest, int]]  # each report with its fragment count
+
+
+class IngestionStats(BaseModel):
+    """
+    Running counters for an ingestion run.
+    """
+    reports_total: Optional[int] = None  # set when the folder was counted up front
+    reports_scanned: int = 0
+    reports_unchanged: int = 0
+    reports_ingested: int = 0
+    reports_duplicate: int = 0
+    reports_removed: int = 0  # in the manifest but no longer in the source
+    fragments_written: int = 0
+    batches_written: int = 0
+
+
+def count_report_files(folder_path: str) -> int:
+    """
+    Count the .txt files in a folder without reading them.
+    """
+    return sum(1 for _ in iter_report_files(folder_path))
+
+def iter_reports_from_folder(folder_path: str) -> Iterator[Report]:
+    """
+    Lazily read .txt files from a folder, yielding one `Report` at a time.
+    """
+    for report_id, path, _ in iter_report_files(folder_path):
+        with open(path, "r", encoding="utf-8") as f:
+            yield Report(id=report_id, text=f.read())
+
 def read_reports_from_folder(folder_path: str) -> List[Report]:
     """
     Read .txt files from a folder, return a list of `Report` objects.
     """
-    reports = []
-    for filename in os.listdir(folder_path):
-        if filename.endswith(".txt"):
-            with open(os.path.join(folder_path, filename), "r", encoding="utf-8") as f:
-                text = f.read()
-                reports.append(Report(id=filename, text=text))
-    return reports
+    return list(iter_reports_from_folder(folder_path))
+
+def iter_reports_to_ingest(
+    source: Iterable[SourceReport],
+    manifest: IngestionManifest,
+    stats: IngestionStats,
+    incremental: bool = True,
+    replace_untracked: bool = False,
+    seen: Optional[Set[str]] = None,
+    source_id: Optional[str] = None,
+) -> Iterator[ReportToIngest]:
+    """
+    Yield the reports from a report source that need to be (re)ingested.
+
+    In incremental mode, reports whose mtime or content hash match the manifest are
+    skipped; sources without mtimes are always compared by hash. With
+    replace_untracked, reports missing from the manifest are also marked stale, so
+    fragments already in the table for them are replaced. The ID of every report
+    still in the source is added to `seen`. With a `source_id`, every report in the
+    source is recorded as coming from it, including unchanged ones.
+
+    A report ID that appears more than once in the source is always yielded
+    again, marked stale: the last copy replaces any earlier one.
+    """
+    seen = seen if seen is not None else set()
+    for report_id, mtime, read_text in source:
+        stats.reports_scanned += 1
+        repeated = report_id in seen
+        seen.add(report_id)
+        entry = manifest.get(report_id) if incremental else None
+        source = source_id
+        if source is None and entry is not None:
+            source = entry.source
+        if repeated:
+            entry = None
+        if entry is not None and mtime is not None and entry.mtime == mtime:
+            if entry.source != source:
+                manifest.update(
+                    report_id,
+                    entry.content_hash,
+                    entry.mtime,
+                    entry.fragment_count,
+                    entry.duplicate_of,
+                    source,
+                )
+            stats.reports_unchanged += 1
+            continue
+        # The manifest records 0.0 when the modification time is unknown
+        mtime = mtime if mtime is not None else 0.0
+
+        try:
+            text = read_text()
+        except FileNotFoundError:
+            # Removed since it was listed
+            seen.discard(report_id)
+            continue
+        content_hash = hash_text(text)
+
+        if entry is not None and entry.content_hash == content_hash:
+            # Touched but not modified; remember the new mtime so we
+            # skip the read next time
+            manifest.update(
+                report_id,
+                content_hash,
+                mtime,
+                entry.fragment_count,
+                entry.duplicate_of,
+                source,
+            )
+            stats.reports_unchanged += 1
+            continue
+
+        yield ReportToIngest(
+            report=Report(id=report_id, text=text),
+            content_hash=content_hash,
+            mtime=mtime,
+            stale=entry is not None or replace_untracked or repeated,
+            source=source,
+        )
+
+def iter_split_reports(
+    reports: Iterable[ReportToIngest],
+    splitter: SectionSplitter,
+    workers: int = DEFAULT_INGEST_WORKERS,
+    chunk_size: int = DEFAULT_SPLIT_CHUNK_SIZE,
+    ordered: bool = True,
+) -> Iterator[Tuple[ReportToIngest, List[Tuple[Optional[str], str]]]]:
+    """
+    Split reports into (section_label, text) fragments.
+
+    With workers > 1 the splitting runs in a process pool, `chunk_size` reports per
+    work unit. With ordered=False reports are yielded in completion order.
+    """
+    if workers <= 1:
+        for item in reports:
+            yield item, splitter.split_into_fragments(item.report.text)
+        return
+
+    results = map_chunks_in_processes(
+        split_texts_in_worker,
+        batched(reports, chunk_size),
+        workers,
+        ordered=ordered,
+        payload=lambda chunk: [item.report.text for item in chunk],
+        initializer=init_split_worker,
+        initargs=(splitter,),
+    )
+    for chunk, sections in results:
+        yield from zip(chunk, sections)
+
+def iter_deduplicated(
+    split_reports: Iterable[Tuple[ReportToIngest, List[Tuple[Optional[str], str]]]],
+    index: NearDuplicateIndex,
+    stats: IngestionStats,
+) -> Iterator[Tuple[ReportToIngest, List[Tuple[Optional[str], str]]]]:
+    """
+    Drop the fragments of reports that nearly duplicate an earlier report, pointing
+    them at that report instead, so only representatives are embedded and stored.
+    Duplicates still flow through the pipeline so stale rows are deleted and the
+    manifest records them.
+    """
+    for item, fragments in split_reports:
+        if item.stale:
+            # A changed representative no longer stands for its old text
+            index.remove(item.report.id)
+        representative = index.find_or_add(item.report.id, item.report.text)
+        if representative is None:
+            yield item, fragments
+        else:
+            stats.reports_duplicate += 1
+            yield item._replace(duplicate_of=representative), []
+
+def iter_fragment_batches(
+    split_reports: Iterable[Tuple[ReportToIngest, List[Tuple[Optional[str], str]]]],
+    batch_size: int = DEFAULT_INGEST_BATCH_SIZE,
+) -> Iterator[FragmentBatch]:
+    """
+    Collect split reports into column buffers, grouped into batches of roughly
+    `batch_size` fragments. Batches always contain whole reports, so a report is
+    either fully written or not written at all.
+
+    A report ID seen before starts a new batch and is marked stale, so its
+    fragments replace those of the earlier copy instead of being added next to them.
+    """
+    columns = FragmentColumns()
+    batch_reports: List[Tuple[ReportToIngest, int]] = []
+    batched_ids: Set[str] = set()
+    for item, fragments in split_reports:
+        if item.report.id in batched_ids:
+            if any(batched.report.id == item.report.id for batched, _ in batch_reports):
+                yield FragmentBatch(fragments=columns, reports=batch_reports)
+                columns, batch_reports = FragmentColumns(), []
+            item = item._replace(stale=True)
+        batched_ids.add(item.report.id)
+        columns.append_report(item.report.id, fragments)
+        batch_reports.append((item, len(fragments)))
+        if len(columns) >= batch_size:
+            yield FragmentBatch(fragments=columns, reports=batch_reports)
+            columns, batch_reports = FragmentColumns(), []
+    if batch_reports:
+        yield FragmentBatch(fragments=columns, reports=batch_reports)
+
+def open_embedding_cache(db_path: str) -> EmbeddingCache:
+    """
+    Open the embedding cache stored alongside the tables in a LanceDB folder.
+    Vectors are cached per model and backend, since quantized backends produce
+    slightly different vectors for the same model.
+    """
+    model_name = DEFAULT_EMBEDDING_MODEL
+    if DEFAULT_EMBEDDING_BACKEND != "huggingface":
+        model_name = f"{DEFAULT_EMBEDDING_BACKEND}:{model_name}"
+    return EmbeddingCache(embedding_cache_path_for(db_path), model_name=model_name)
+
+def map_duplicates(manifest: IngestionManifest) -> Dict[str, List[str]]:
+    """Map each representative report to the near-duplicate reports pointing to it"""
+    duplicates: Dict[str, List[str]] = {}
+    for report_id, entry in manifest.entries.items():
+        if entry.duplicate_of is not None:
+            duplicates.setdefault(entry.duplicate_of, []).append(report_id)
+    return duplicates
+
+def promote_duplicates(
+    table,
+    manifest: IngestionManifest,
+    report_ids: Iterable[str],
+    duplicates: Dict[str, List[str]],
+    dedup_index: Optional[NearDuplicateIndex] = None,
+) -> List[str]:
+    """
+    Before the fragments of representative reports are deleted or replaced, hand
+    them to one of each representative's near-duplicates (whose own text was never
+    embedded) and point the other near-duplicates at it. Otherwise they would
+    resolve to a report that no longer exists or now says something else.
+
+    `duplicates` (see `map_duplicates`) is updated in place. With `dedup_index`, the
+    reports also stop being representatives there and successors take over their
+    signatures.
+
+    Returns:
+        IDs of the reports whose manifest entries changed
+    """
+    report_ids = set(report_ids)
+    promoted_rows = []
+    changed: List[str] = []
+    for representative in report_ids:
+        followers = [
+            report_id for report_id in duplicates.pop(representative, [])
+            if report_id not in report_ids
+            and manifest.get(report_id) is not None
+            and manifest.get(report_id).duplicate_of == representative
+        ]
+        successor = followers[0] if followers else None
+        if dedup_index is not None:
+            dedup_index.remove(representative, successor=successor)
+        if successor is None:
+            continue
+
+        rows = scan_fragments(table, f"report_id = {quote_sql_string(representative)}")
+        report_ids_column = pa.array(
+            [successor] * rows.num_rows, rows.schema.field("report_id").type
+        )
+        promoted_rows.append(
+            rows.set_column(
+                rows.schema.get_field_index("report_id"), "report_id", report_ids_column
+            )
+        )
+
+        entry = manifest.get(successor)
+        manifest.update(
+            successor,
+            entry.content_hash,
+            entry.mtime,
+            rows.num_rows,
+            source=entry.source,
+        )
+        for report_id in followers[1:]:
+            entry = manifest.get(report_id)
+            manifest.update(
+                report_id,
+                entry.content_hash,
+                entry.mtime,
+                entry.fragment_count,
+                successor,
+                entry.source,
+            )
+        if followers[1:]:
+            duplicates[successor] = followers[1:]
+        changed.extend(followers)
+
+    if promoted_rows:
+        table.add(pa.concat_tables(promoted_rows))
+    return changed
+
+def write_fragment_batch(
+    table,
+    batch: FragmentBatch,
+    manifest: IngestionManifest,
+    engine: EmbeddingEngine,
+    embedding_cache: Optional[EmbeddingCache] = None,
+    checkpoint: Optional[IngestionCheckpoint] = None,
+    duplicates: Optional[Dict[str, List[str]]] = None,
+    dedup_index: Optional[NearDuplicateIndex] = None,
+) -> None:
+    """
+    Replace the fragments of stale reports in the batch, embed and insert the new
+    ones, then record the batch's reports in the checkpoint and the manifest.
+
+    Vectors are computed by the embedding engine (or taken from the embedding
+    cache) and written with the rows as one Arrow RecordBatch, so the table never
+    embeds on add and no per-row dicts are built.
+
+    With `duplicates` (see `map_duplicates`), near-duplicates of stale reports are
+    promoted first (see `promote_duplicates`) and new near-duplicates are added to it.
+    The batch's reports are committed in the `dedup_index` once they are written,
+    so it is saved with their new representatives.
+    """
+    stale_ids = [item.report.id for item, _ in batch.reports if item.stale]
+    promoted: List[str] = []
+    if stale_ids and duplicates is not None:
+        representatives = {
+            follower: report_id
+            for report_id in stale_ids
+            for follower in duplicates.get(report_id, [])
+        }
+        promoted = promote_duplicates(table, manifest, stale_ids, duplicates)
+        if dedup_index is not None:
+            # iter_deduplicated already removed the stale representatives; the
+            # near-duplicates promoted in their place take over their old signatures
+            for report_id in promoted:
+                if manifest.get(report_id).duplicate_of is None:
+                    dedup_index.remove(
+                        representatives[report_id], successor=report_id
+                    )
+    if stale_ids:
+        delete_report_fragments(table, stale_ids)
+    if len(batch.fragments):
+        vectors = embed_with_cache(batch.fragments.texts, engine.embed, embedding_cache)
+        table.add(batch.fragments.to_record_batch(vectors, table.schema))
+    # Only record reports once their fragments are stored
+    if checkpoint is not None:
+        entries = [
+            (
+                item.report.id,
+                item.content_hash,
+                item.mtime,
+                count,
+                item.duplicate_of,
+                item.source,
+            )
+            for item, count in batch.reports
+        ]
+        for report_id in promoted:
+            entry = manifest.get(report_id)
+            entries.append(
+                (
+                    report_id,
+                    entry.content_hash,
+                    entry.mtime,
+                    entry.fragment_count,
+                    entry.duplicate_of,
+                    entry.source,
+                )
+            )
+        checkpoint.record_batch(table.version, entries)
+    for item, count in batch.reports:
+        manifest.update(
+            item.report.id,
+            item.content_hash,
+            item.mtime,
+            count,
+            item.duplicate_of,
+            item.source,
+        )
+        if duplicates is not None and item.duplicate_of is not None:
+            duplicates.setdefault(item.duplicate_of, []).append(item.report.id)
+    if dedup_index is not None:
+        dedup_index.commit(item.report.id for item, _ in batch.reports)
+
+
+def should_replace_untracked(
+    table, manifest: IngestionManifest, incremental: bool
+) -> bool:
+    """
+    Full re-ingests into a non-empty table, and tables written before the manifest
+    existed, may hold fragments for any report: replace them rather than duplicate.
+    """
+    return (not incremental or len(manifest) == 0) and table.count_rows() > 0
+
+def ingest_source(
+    table,
+    source: Iterable[SourceReport],
+    manifest: IngestionManifest,
+    splitter: SectionSplitter,
+    incremental: bool = True,
+    batch_size: int = DEFAULT_INGEST_BATCH_SIZE,
+    max_in_flight: int = DEFAULT_MAX_IN_FLIGHT_BATCHES,
+    workers: int = DEFAULT_INGEST_WORKERS,
+    ordered: bool = True,
+    embedding_cache: Optional[EmbeddingCache] = None,
+    engine: Optional[EmbeddingEngine] = None,
+    stats: Optional[IngestionStats] = None,
+    replace_untracked: Optional[bool] = None,
+    checkpoint: Optional[IngestionCheckpoint] = None,
+    dedup_index: Optional[NearDuplicateIndex] = None,
+    purge_missing: bool = False,
+    train_vector_index: bool = False,
+    source_id: Optional[str] = None,
+) -> int:
+    """
+    Stream the reports from a report source through read -> split -> batch ->
+    embed -> insert, recording them in the manifest.
+
+    Only one batch is embedded at a time and at most `max_in_flight` further batches
+    are buffered by the read/split stage, so memory use is bounded by the batch size
+    rather than the size of the folder. With workers > 1, splitting runs in a process
+    pool that overlaps with embedding in this process. Fragments are embedded by
+    the batched embedding engine; an embedding cache lets fragments whose text was
+    embedded before skip the model. Pass `stats` to watch progress from another thread,
+    and a `checkpoint` to record every committed batch durably for `--resume`. With a
+    `dedup_index`, near-duplicate reports are detected after splitting and only
+    their representative is embedded. The table's full-text, vector and scalar
+    indices are then created or extended to cover the new fragments (see
+    `ensure_vector_index` and `ensure_scalar_indices`). The vector index is only
+    trained (created, or retrained for a grown table) with train_vector_index, since
+    that reads every vector; small incremental batches leave it to `optimize_table`.
+
+    `source_id` (e.g. the absolute path of the folder or report file) is recorded
+    in the manifest for every report of the source. Set purge_missing when the
+    source holds every report (a whole folder or file, not a batch of changed
+    paths): reports recorded from the same `source_id` that it no longer contains,
+    e.g. deleted files, then have their fragments removed. Reports from other
+    sources and upserted reports are left alone. Near-duplicates of
+    representatives that are replaced or removed are promoted in their place (see
+    `promote_duplicates`).
+
+    Returns:
+        Number of fragments inserted
+    """
+    if purge_missing and source_id is None:
+        raise ValueError("purge_missing needs the source_id of the reports to purge")
+    if replace_untracked is None:
+        replace_untracked = should_replace_untracked(table, manifest, incremental)
+
+    engine = engine or EmbeddingEngine()
+
+    stats = stats if stats is not None else IngestionStats()
+    seen: Set[str] = set()
+    reports = iter_reports_to_ingest(
+        source, manifest, stats,
+        incremental=incremental,
+        replace_untracked=replace_untracked,
+        seen=seen,
+        source_id=source_id,
+    )
+    split_reports = iter_split_reports(
+        reports, splitter, workers=workers, ordered=ordered
+    )
+    if dedup_index is not None:
+        split_reports = iter_deduplicated(split_reports, dedup_index, stats)
+    batches = prefetch(iter_fragment_batches(split_reports, batch_size), max_in_flight)
+    duplicates = map_duplicates(manifest)
+
+    print(f"\n💾 Streaming reports into the table (batch size {batch_size})...")
+    try:
+        with tqdm(desc="Embedding fragments", unit="frag") as pbar:
+            for batch in batches:
+                write_fragment_batch(
+                    table,
+                    batch,
+                    manifest,
+                    engine,
+                    embedding_cache,
+                    checkpoint,
+                    duplicates,
+                    dedup_index,
+                )
+                stats.reports_ingested += len(batch.reports)
+                stats.fragments_written += len(batch.fragments)
+                stats.batches_written += 1
+                pbar.update(len(batch.fragments))
+
+        # Only once the whole source was read, so an interrupted run removes nothing
+        if purge_missing:
+            missing = [
+                report_id
+                for report_id, entry in manifest.entries.items()
+                if entry.source == source_id and report_id not in seen
+            ]
+            if missing:
+                promote_duplicates(table, manifest, missing, duplicates, dedup_index)
+                delete_report_fragments(table, missing)
+                for report_id in missing:
+                    manifest.remove(report_id)
+                if dedup_index is not None:
+                    dedup_index.commit(missing)
+                stats.reports_removed += len(missing)
+    finally:
+        # Persist progress for the batches that made it into the table
+        manifest.save()
+        if dedup_index is not None:
+            dedup_index.save()
+
+    print(
+        f"\n📄 Ingested {stats.reports_ingested} new or changed reports "
+        f"({stats.reports_unchanged} unchanged, {stats.fragments_written} fragments)"
+    )
+    if stats.reports_removed:
+        print(f"🗑️ Removed {stats.reports_removed} reports no longer in the source")
+    if dedup_index is not None:
+        print(
+            f"🧬 Near-duplicates: {stats.reports_duplicate} reports not embedded "
+            f"({len(dedup_index)} representatives)"
+        )
+    if embedding_cache is not None:
+        print(
+            f"🧠 Embedding cache: {embedding_cache.hits} hits, "
+            f"{embedding_cache.misses} misses "
+            f"({embedding_cache.hit_rate:.0%} hit rate, {len(embedding_cache)} entries)"
+        )
+
+    # Index the new fragments now rather than on the first search
+    if ensure_fts_index(table) != "current":
+        print("🔤 Full-text index brought up to date")
+    vector_index = ensure_vector_index(table, train=train_vector_index)
+    if vector_index in ("created", "rebuilt", "updated"):
+        print("🧭 Vector index brought up to date")
+    elif vector_index == "deferred":
+        print(
+            "🧭 Vector index needs training; it is built when the table is next "
+            "optimized"
+        )
+    if any(
+        status in ("created", "updated")
+        for status in ensure_scalar_indices(table).values()
+    ):
+        print("🗂️ report_id/section indices brought up to date")
+    return stats.fragments_written
+
+def ingest_folder(
+    table,
+    reports_folder: str,
+    manifest: IngestionManifest,
+    splitter: SectionSplitter,
+    **kwargs,
+) -> int:
+    """
+    Stream every report in a folder into the table; see `ingest_source`. The
+    reports are recorded as coming from the folder's absolute path.
+
+    Returns:
+        Number of fragments inserted
+    """
+    kwargs.setdefault("source_id", os.path.abspath(reports_folder))
+    return ingest_source(
+        table, iter_folder_reports(reports_folder), manifest, splitter, **kwargs
+    )
 
 def ingest_reports(
     reports_folder: str = "./reports",
     db_path: str = "./data/lancedb",
     table_name: str = "table",
+    incremental: bool = False,
+    batch_size: int = DEFAULT_INGEST_BATCH_SIZE,
+    max_in_flight: int = DEFAULT_MAX_IN_FLIGHT_BATCHES,
+    workers: int = DEFAULT_INGEST_WORKERS,
+    ordered: bool = True,
+    use_embedding_cache: bool = DEFAULT_EMBEDDING_CACHE_ENABLED,
+    max_tokens_per_batch: int = DEFAULT_EMBED_MAX_TOKENS_PER_BATCH,
+    embed_threads: int = DEFAULT_EMBED_NUM_THREADS,
+    resume: bool = False,
+    source_format: str = "auto",
+    id_field: str = "id",
+    text_field: str = "text",
+    dedup: bool = DEFAULT_DEDUP_ENABLED,
+    dedup_threshold: float = DEFAULT_DEDUP_THRESHOLD,
+    chunk_by_tokens: bool = DEFAULT_CHUNK_BY_TOKENS,
 ) -> None:
     """
     Orchestrates reading from folder, creating fragments, and storing in LanceDB.
+
+    `reports_folder` may also be a JSON Lines file, tar archive or Parquet file
+    (see `open_report_source`); reports are streamed out of it without extracting
+    anything to disk.
+
+    With incremental=True the existing table is kept and only new or changed
+    reports are processed; otherwise the table is recreated from scratch. With
+    dedup=True, near-duplicate reports are not embedded (see `NearDuplicateIndex`).
+    With chunk_by_tokens=True, fragments are re-chunked to the embedding model's
+    token budget (see `TokenBudgetChunker`).
+
+    Every committed batch is recorded in a checkpoint next to the table. With
+    resume=True an interrupted run continues from its last committed batch: the
+    table is rolled back to that batch's version, the reports it had stored are
+    skipped, and the remaining ones are ingested as the original run would have.
     """
     try:
-        print(f"\n🔍 Scanning reports folder: {reports_folder}")
-        
         # 1. Connect to DB
         db = connect_db(db_path)
         print(f"📦 Connected to database: {db_path}")
 
-        # 2. Create or overwrite the table schema
-        table = create_fragment_table(db, table_name=table_name)
-        print(f"📋 Created/opened table: {table_name}")
-
-        # 3. Read local .txt files
-        reports_list = read_reports_from_folder(reports_folder)
-        print(f"\n📄 Found {len(reports_list)} reports to process")
-
-        # 4. Create all fragments
-        splitter = SectionSplitter()
-        print("\n🔄 Processing reports:")
-        all_fragments = []
-        
-        for i, report in enumerate(reports_list, 1):
-            print(f"\n⮡ Starting report {i}/{len(reports_list)}: {report.id}")
-            
-            # Process the report and show section splitting progress
-            fragments = create_fragments_from_report(report, splitter)
-            all_fragments.extend(fragments)
-            
-            # Show completion for this report
-            print(f"✓ Completed report: {report.id} (created {len(fragments)} fragments)")
-
-        # 5. Prepare docs for insertion
-        print(f"\n📝 Preparing {len(all_fragments)} total fragments for insertion...")
-        auto_inserts = []
-        with tqdm(total=len(all_fragments), desc="Preparing fragments") as pbar:
-            for frag in all_fragments:
-                doc = {
-                    "report_id": frag.report_id,
-                    "section": frag.section,
-                    "sequence_number": frag.sequence_number,
-                    "text": frag.text
-                }
-                auto_inserts.append(doc)
-                pbar.update(1)
-
-        # 6. Insert into table (auto-embedding)
-        print(f"\n💾 Starting database insertion...")
-        insert_fragments(table, auto_inserts)
+        manifest = IngestionManifest.load(manifest_path_for(db_path, table_name))
+        checkpoint_path = checkpoint_path_for(db_path, table_name)
+        dedup_path = dedup_index_path_for(db_path, table_name)
+        checkpoint = IngestionCheckpoint.load(checkpoint_path) if resume else None
+        if resume and (checkpoint is None or table_name not in db.table_names()):
+            print("\n⚠️  No interrupted ingestion to resume, starting a new run")
+
+        if checkpoint is not None and table_name in db.table_names():
+            # 2a. Pick up where the interrupted run stopped
+            reports_folder = checkpoint.header.reports_folder
+            source_format = checkpoint.header.source_format
+            id_field = checkpoint.header.id_field
+            text_field = checkpoint.header.text_field
+            chunk_by_tokens = checkpoint.header.chunk_by_tokens
+            table = db.open_table(table_name)
+            checkpoint.apply_to(manifest)
+            # Drop anything written after the last recorded batch (e.g. a batch
+            # that was inserted but not yet checkpointed when the run died)
+            if table.version != checkpoint.table_version:
+                table.restore(checkpoint.table_version)
+                print(f"⏪ Rolled table back to version {checkpoint.table_version}")
+            manifest.save()
+            print(
+                f"\n♻️  Resuming ingestion of {reports_folder}: "
+                f"{len(checkpoint.batches)} batches "
+                f"({checkpoint.reports_committed} reports) already committed, "
+                f"last report {checkpoint.last_report_id}"
+            )
+            # Committed reports are now in the manifest, so they are skipped
+            run_incremental = True
+            replace_untracked = checkpoint.header.replace_untracked
+        else:
+            # 2b. Open the table for incremental runs, otherwise create or overwrite it
+            if incremental:
+                table = open_or_create_fragment_table(db, table_name=table_name)
+            else:
+                table = create_fragment_table(db, table_name=table_name)
+                manifest.clear()
+                # The old manifest no longer describes the table, even if this run dies
+                manifest.save()
+                if os.path.exists(dedup_path):
+                    os.remove(dedup_path)
+            print(f"📋 Created/opened table: {table_name}")
+            run_incremental = incremental
+            replace_untracked = should_replace_untracked(table, manifest, incremental)
+            checkpoint = IngestionCheckpoint.start(
+                checkpoint_path,
+                CheckpointHeader(
+                    reports_folder=reports_folder,
+                    source_format=source_format,
+                    id_field=id_field,
+                    text_field=text_field,
+                    chunk_by_tokens=chunk_by_tokens,
+                    incremental=incremental,
+                    replace_untracked=replace_untracked,
+                    table_version=table.version,
+                ),
+            )
+
+        print(f"\n🔍 Scanning reports from: {reports_folder}")
+        source = open_report_source(
+            reports_folder, source_format, id_field=id_field, text_field=text_field
+        )
 
+        # 3. Stream new or changed reports into the table
+        set_embedding_threads(embed_threads)
+        engine = EmbeddingEngine(max_tokens_per_batch=max_tokens_per_batch)
+        splitter = SectionSplitter(
+            chunker=TokenBudgetChunker(engine.tokenizer) if chunk_by_tokens else None
+        )
+        embedding_cache = open_embedding_cache(db_path) if use_embedding_cache else None
+        dedup_index = (
+            NearDuplicateIndex.load(dedup_path, threshold=dedup_threshold)
+            if dedup
+            else None
+        )
+        if not dedup and os.path.exists(dedup_path):
+            # Representatives changed or removed by this run would
+            # stay in the saved index
+            os.remove(dedup_path)
+        try:
+            ingest_source(
+                table, source, manifest, splitter,
+                incremental=run_incremental,
+                batch_size=batch_size,
+                max_in_flight=max_in_flight,
+                workers=workers,
+                ordered=ordered,
+                embedding_cache=embedding_cache,
+                engine=engine,
+                replace_untracked=replace_untracked,
+                checkpoint=checkpoint,
+                dedup_index=dedup_index,
+                purge_missing=True,
+                train_vector_index=True,
+                source_id=os.path.abspath(reports_folder),
+            )
+        finally:
+            if embedding_cache is not None:
+                embedding_cache.close()
+
+        # The manifest now records the whole run
+        checkpoint.remove()
         print("\n✅ Report ingestion complete!")
-        
+
     except KeyboardInterrupt:
-        print("\n\n⚠️  Operation cancelled by user")
+        print(
+            "\n\n⚠️  Operation cancelled by user (run again with --resume to continue)"
+        )
         raise
-
-def insert_fragments(table, docs: List[dict]) -> None:
-    """
-    Insert fragment documents into the specified LanceDB table.
-    """
-    print(f"\n💾 Starting embedding and insertion of {len(docs)} fragments...")
-    for i in tqdm(range(0, len(docs), 32), desc="Embedding fragments"):
-        batch = docs[i:i+32]
-        table.add(batch)
-    print("✅ Embedding and insertion complete!")
\ No newline at end of file
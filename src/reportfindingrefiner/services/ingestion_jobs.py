@@ -0,0 +1,132 @@
+import time
+import uuid
+import threading
+import traceback
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, List, Optional
+from pydantic import BaseModel, Field
+
+from ..config import DEFAULT_DB_PATH, DEFAULT_TABLE_NAME
+from .ingestion import IngestionStats, count_report_files
+from .report_service import ReportService
+
+
+class IngestionJob(BaseModel):
+    """
+    A queued or running ingestion of a reports folder, with live progress counters.
+    """
+    job_id: str
+    reports_folder: str
+    incremental: bool = True
+    status: str = "queued"  # queued | running | completed | failed
+    created_at: float = Field(default_factory=time.time)
+    started_at: Optional[float] = None
+    finished_at: Optional[float] = None
+    fragments_ingested: Optional[int] = None
+    error: Optional[str] = None
+    stats: IngestionStats = Field(default_factory=IngestionStats)
+
+    def progress(self) -> Dict[str, Any]:
+        """Status, counters, throughput and ETA for reporting over the API"""
+        stats = self.stats
+        elapsed = 0.0
+        if self.started_at is not None:
+            elapsed = (self.finished_at or time.time()) - self.started_at
+
+        reports_per_second = stats.reports_scanned / elapsed if elapsed > 0 else 0.0
+        fragments_per_second = stats.fragments_written / elapsed if elapsed > 0 else 0.0
+
+        eta_seconds = None
+        if (
+            self.status == "running"
+            and stats.reports_total is not None
+            and reports_per_second > 0
+        ):
+            remaining = max(stats.reports_total - stats.reports_scanned, 0)
+            eta_seconds = remaining / reports_per_second
+        elif self.status == "completed":
+            eta_seconds = 0.0
+
+        return {
+            "job_id": self.job_id,
+            "status": self.status,
+            "reports_folder": self.reports_folder,
+            "incremental": self.incremental,
+            "reports_total": stats.reports_total,
+            "reports_scanned": stats.reports_scanned,
+            "reports_unchanged": stats.reports_unchanged,
+            "reports_ingested": stats.reports_ingested,
+            "reports_removed": stats.reports_removed,
+            "fragments_embedded": stats.fragments_written,
+            "batches_written": stats.batches_written,
+            "elapsed_seconds": elapsed,
+            "reports_per_second": reports_per_second,
+            "fragments_per_second": fragments_per_second,
+            "eta_seconds": eta_seconds,
+            "error": self.error,
+        }
+
+
+class IngestionJobManager:
+    """
+    Runs report ingestion jobs in a background worker thread.
+
+    Jobs run one at a time, in submission order, through the incremental
+    ReportService path. Every batch is committed as a new table version, so
+    searches keep being served from the latest committed version while a job runs.
+    """
+
+    def __init__(
+        self, db_path: str = DEFAULT_DB_PATH, table_name: str = DEFAULT_TABLE_NAME
+    ):
+        self.report_service = ReportService(db_path=db_path, table_name=table_name)
+        self._jobs: Dict[str, IngestionJob] = {}
+        self._lock = threading.Lock()
+        self._executor = ThreadPoolExecutor(
+            max_workers=1, thread_name_prefix="ingestion-job"
+        )
+
+    def submit(self, reports_folder: str, incremental: bool = True) -> IngestionJob:
+        """
+        Queue an ingestion of `reports_folder` and return the job immediately.
+        """
+        job = IngestionJob(
+            job_id=uuid.uuid4().hex,
+            reports_folder=reports_folder,
+            incremental=incremental,
+        )
+        with self._lock:
+            self._jobs[job.job_id] = job
+        self._executor.submit(self._run, job)
+        return job
+
+    def _run(self, job: IngestionJob) -> None:
+        job.status = "running"
+        job.started_at = time.time()
+        try:
+            job.stats.reports_total = count_report_files(job.reports_folder)
+            job.fragments_ingested = self.report_service.ingest_reports(
+                job.reports_folder,
+                incremental=job.incremental,
+                stats=job.stats,
+            )
+            job.status = "completed"
+        except Exception as e:
+            job.status = "failed"
+            job.error = str(e)
+            print(f"\n❌ Ingestion job {job.job_id} failed: {str(e)}")
+            traceback.print_exc()
+        finally:
+            job.finished_at = time.time()
+
+    def get(self, job_id: str) -> Optional[IngestionJob]:
+        with self._lock:
+            return self._jobs.get(job_id)
+
+    def list_jobs(self) -> List[IngestionJob]:
+        with self._lock:
+            return sorted(self._jobs.values(), key=lambda j: j.created_at)
+
+    def shutdown(self, wait: bool = False) -> None:
+        """Stop accepting jobs; queued jobs that have not started are cancelled"""
+        self._executor.shutdown(wait=wait, cancel_futures=True)
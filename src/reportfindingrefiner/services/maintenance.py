@@ -0,0 +1,268 @@
+import os
+import time
+import threading
+import traceback
+from datetime import timedelta
+from typing import Any, Dict, List, Optional, Tuple
+from pydantic import BaseModel
+
+from ..config import (
+    DEFAULT_OPTIMIZE_RETENTION_HOURS,
+    DEFAULT_OPTIMIZE_INTERVAL_HOURS,
+)
+from ..lance_db import (
+    create_vector_index,
+    ensure_fts_index,
+    ensure_scalar_indices,
+    ensure_vector_index,
+)
+
+class TableStorageStats(BaseModel):
+    """
+    On-disk layout of a LanceDB table. Many small data files and versions
+    slow down scans and searches; compaction and pruning bring them back down.
+    """
+    rows: int
+    fragments: int
+    data_files: int
+    data_bytes: int
+    total_files: int
+    total_bytes: int
+    versions: int
+    indices: int
+
+
+class OptimizeReport(BaseModel):
+    """
+    What one maintenance run did, with the table's storage before and after.
+    """
+    table_name: str
+    before: TableStorageStats
+    after: TableStorageStats
+    fragments_removed: int = 0
+    fragments_added: int = 0
+    versions_removed: int = 0
+    bytes_removed: int = 0
+    pruned: bool = False
+    indices_optimized: List[str] = []
+    indices_rebuilt: List[str] = []
+    indices_created: List[str] = []
+    seconds: float = 0.0
+
+
+def _folder_usage(path: str) -> Tuple[int, int]:
+    """(file count, total bytes) of every file below `path`"""
+    files = 0
+    size = 0
+    for root, _, names in os.walk(path):
+        for name in names:
+            try:
+                size += os.path.getsize(os.path.join(root, name))
+            except FileNotFoundError:
+                # Removed by a concurrent cleanup
+                continue
+            files += 1
+    return files, size
+
+
+def table_storage_stats(table) -> TableStorageStats:
+    """
+    Count the rows, fragments, files, bytes, versions and indices of a table.
+    """
+    dataset = table.to_lance()
+    data_files, data_bytes = _folder_usage(os.path.join(dataset.uri, "data"))
+    total_files, total_bytes = _folder_usage(dataset.uri)
+    return TableStorageStats(
+        rows=dataset.count_rows(),
+        fragments=len(dataset.get_fragments()),
+        data_files=data_files,
+        data_bytes=data_bytes,
+        total_files=total_files,
+        total_bytes=total_bytes,
+        versions=len(dataset.versions()),
+        indices=len(dataset.list_indices()),
+    )
+
+
+def optimize_table(
+    table,
+    table_name: str,
+    retention: Optional[timedelta] = timedelta(hours=DEFAULT_OPTIMIZE_RETENTION_HOURS),
+    rebuild_indices: bool = False,
+) -> OptimizeReport:
+    """
+    Compact a table's small data files, prune old versions and bring its indices
+    up to date. The vector index is created or retrained here once the table has
+    outgrown it, since incremental ingestion only extends it.
+
+    Args:
+        table: LanceDB table
+        table_name: Name reported back in the result
+        retention: Versions older than this are removed (the latest version is always
+            kept); None skips pruning, e.g. while an interrupted ingestion may still
+            need to roll back to an older version
+        rebuild_indices: Recreate full-text indices and retrain the vector index
+            (with partitions sized for the current table) instead of only adding
+            new rows to them
+
+    Returns:
+        OptimizeReport with storage statistics before and after
+    """
+    start = time.perf_counter()
+    before = table_storage_stats(table)
+    report = OptimizeReport(table_name=table_name, before=before, after=before)
+
+    # 1. Merge small fragments (one per table.add) into larger ones
+    compaction = table.compact_files()
+    report.fragments_removed = compaction.fragments_removed
+    report.fragments_added = compaction.fragments_added
+
+    # 2. Remove versions, and the files only they reference, beyond the retention window
+    if retention is not None:
+        cleanup = table.cleanup_old_versions(older_than=retention)
+        report.versions_removed = cleanup.old_versions
+        report.bytes_removed = cleanup.bytes_removed
+        report.pruned = True
+
+    # 3. Index the rows added since the indices were built
+    dataset = table.to_lance()
+    indices = dataset.list_indices()
+    if rebuild_indices:
+        for index in indices:
+            if index["type"] == "Inverted":
+                table.create_fts_index(
+                    index["fields"][0], use_tantivy=False, replace=True
+                )
+                report.indices_rebuilt.append(index["name"])
+            elif index["fields"] == ["vector"]:
+                create_vector_index(table)
+                report.indices_rebuilt.append(index["name"])
+        dataset = table.to_lance()
+    remaining = [
+        index["name"]
+        for index in indices
+        if index["name"] not in report.indices_rebuilt
+    ]
+    if remaining:
+        dataset.optimize.optimize_indices(index_names=remaining)
+        report.indices_optimized = remaining
+
+    # 4. Tables written before the full-text and report_id/section
+    # indices existed get them now
+    table.checkout_latest()
+    if ensure_fts_index(table) == "created":
+        report.indices_created.append("text_idx")
+    statuses = ensure_scalar_indices(table)
+    report.indices_created += [
+        f"{column}_idx" for column, status in statuses.items() if status == "created"
+    ]
+
+    # 5. Train the vector index once the table is big enough, or has
+    # outgrown its partitions
+    vector_index = ensure_vector_index(table)
+    if vector_index == "created":
+        report.indices_created.append("vector_idx")
+    elif vector_index == "rebuilt":
+        report.indices_rebuilt.append("vector_idx")
+
+    table.checkout_latest()
+    report.after = table_storage_stats(table)
+    report.seconds = time.perf_counter() - start
+    return report
+
+
+def print_optimize_report(report: OptimizeReport) -> None:
+    before, after = report.before, report.after
+    print(f"\n🧹 Optimized table {report.table_name} in {report.seconds:.1f}s")
+    print(f"{'':<14} {'before':>14} {'after':>14}")
+    for label, field in [
+        ("rows", "rows"),
+        ("fragments", "fragments"),
+        ("data files", "data_files"),
+        ("data bytes", "data_bytes"),
+        ("total files", "total_files"),
+        ("total bytes", "total_bytes"),
+        ("versions", "versions"),
+        ("indices", "indices"),
+    ]:
+        print(f"{label:<14} {getattr(before, field):>14,} {getattr(after, field):>14,}")
+    if not report.pruned:
+        print(
+            "⚠️  Old versions were kept (an interrupted ingestion may still need them)"
+        )
+    if report.indices_rebuilt:
+        print(f"🔁 Rebuilt indices: {', '.join(report.indices_rebuilt)}")
+    if report.indices_optimized:
+        print(f"📇 Updated indices: {', '.join(report.indices_optimized)}")
+    if report.indices_created:
+        print(f"🗂️ Created indices: {', '.join(report.indices_created)}")
+
+
+class TableMaintenanceScheduler:
+    """
+    Runs ReportService.optimize() in a background thread every `interval_hours`.
+    A run waits for any ingestion in progress, since both hold the service's
+    ingestion lock.
+    """
+
+    def __init__(
+        self,
+        report_service,
+        interval_hours: float = DEFAULT_OPTIMIZE_INTERVAL_HOURS,
+        retention_hours: float = DEFAULT_OPTIMIZE_RETENTION_HOURS,
+    ):
+        self.report_service = report_service
+        self.interval_hours = interval_hours
+        self.retention_hours = retention_hours
+        self.runs = 0
+        self.last_report: Optional[OptimizeReport] = None
+        self.last_run_at: Optional[float] = None
+        self.last_error: Optional[str] = None
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def run_once(self) -> Optional[OptimizeReport]:
+        try:
+            report = self.report_service.optimize(
+                retention=timedelta(hours=self.retention_hours)
+            )
+        except Exception as e:
+            # Keep the schedule; the next run tries again
+            self.last_error = str(e)
+            print(f"\n❌ Error optimizing table: {str(e)}")
+            traceback.print_exc()
+            return None
+        self.runs += 1
+        self.last_report = report
+        self.last_run_at = time.time()
+        self.last_error = None
+        return report
+
+    def run(self) -> None:
+        while not self._stop.wait(self.interval_hours * 3600):
+            self.run_once()
+
+    def start(self) -> None:
+        """Optimize the table every interval in a background thread"""
+        self._stop.clear()
+        self._thread = threading.Thread(
+            target=self.run, name="table-maintenance", daemon=True
+        )
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+
+    def status(self) -> Dict[str, Any]:
+        """Schedule and last run for reporting over the API"""
+        return {
+            "interval_hours": self.interval_hours,
+            "retention_hours": self.retention_hours,
+            "running": self._thread is not None and self._thread.is_alive(),
+            "runs": self.runs,
+            "last_run_at": self.last_run_at,
+            "last_error": self.last_error,
+            "last_report": (
+                self.last_report.model_dump() if self.last_report is not None else None
+            ),
+        }
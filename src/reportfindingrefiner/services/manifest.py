@@ -0,0 +1,104 @@
+import os
+import json
+import hashlib
+from typing import Dict, Optional
+from pydantic import BaseModel
+
+
+class ManifestEntry(BaseModel):
+    """
+    What was last ingested for a single report.
+    """
+    content_hash: str
+    mtime: float
+    fragment_count: int
+    # representative report, if this one was deduplicated
+    duplicate_of: Optional[str] = None
+    # folder or report file it was ingested from; None for upserted reports
+    source: Optional[str] = None
+
+
+def hash_text(text: str) -> str:
+    """Return the SHA-256 hex digest of a report's text"""
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+
+def manifest_path_for(db_path: str, table_name: str) -> str:
+    """Location of the ingestion manifest, stored next to the LanceDB table"""
+    return os.path.join(db_path, f"{table_name}.manifest.json")
+
+
+class IngestionManifest:
+    """
+    Tracks report_id -> (content hash, mtime, fragment count) for a fragment table,
+    so that incremental ingestion only splits and embeds new or changed reports.
+    Entries also record the source each report came from, since a table can be fed
+    from several folders, report files and upserts.
+    """
+
+    def __init__(self, path: str, entries: Optional[Dict[str, ManifestEntry]] = None):
+        self.path = path
+        self.entries: Dict[str, ManifestEntry] = entries or {}
+
+    @classmethod
+    def load(cls, path: str) -> "IngestionManifest":
+        """Load a manifest from disk, or return an empty one if none exists yet"""
+        if not os.path.exists(path):
+            return cls(path)
+        with open(path, "r", encoding="utf-8") as f:
+            raw = json.load(f)
+        entries = {
+            report_id: ManifestEntry(**entry)
+            for report_id, entry in raw.get("reports", {}).items()
+        }
+        return cls(path, entries)
+
+    def save(self) -> None:
+        """Atomically write the manifest to disk"""
+        os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+        tmp_path = f"{self.path}.tmp"
+        # Snapshot first: the ingestion pipeline may update entries from another thread
+        entries = dict(self.entries)
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(
+                {
+                    "reports": {
+                        rid: e.model_dump(exclude_none=True)
+                        for rid, e in entries.items()
+                    }
+                },
+                f,
+            )
+        os.replace(tmp_path, self.path)
+
+    def get(self, report_id: str) -> Optional[ManifestEntry]:
+        return self.entries.get(report_id)
+
+    def update(
+        self,
+        report_id: str,
+        content_hash: str,
+        mtime: float,
+        fragment_count: int,
+        duplicate_of: Optional[str] = None,
+        source: Optional[str] = None,
+    ) -> None:
+        self.entries[report_id] = ManifestEntry(
+            content_hash=content_hash,
+            mtime=mtime,
+            fragment_count=fragment_count,
+            duplicate_of=duplicate_of,
+            source=source,
+        )
+
+    def remove(self, report_id: str) -> None:
+        self.entries.pop(report_id, None)
+
+    def clear(self) -> None:
+        self.entries = {}
+
+    def __contains__(self, report_id: str) -> bool:
+        return report_id in self.entries
+
+    def __len__(self) -> int:
+        return len(self.entries)
@@ -0,0 +1,136 @@
+import queue
+import threading
+import multiprocessing
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from typing import Any, Callable, Iterable, Iterator, List, Optional, Tuple, TypeVar
+
+T = TypeVar("T")
+R = TypeVar("R")
+
+_DONE = object()
+
+
+class _StageError:
+    """Carries an exception raised by a producer thread over to the consumer."""
+
+    def __init__(self, error: BaseException):
+        self.error = error
+
+
+def batched(items: Iterable[T], batch_size: int) -> Iterator[List[T]]:
+    """
+    Group an iterable into lists of at most `batch_size` items.
+    """
+    batch: List[T] = []
+    for item in items:
+        batch.append(item)
+        if len(batch) >= batch_size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+def prefetch(items: Iterable[T], max_in_flight: int) -> Iterator[T]:
+    """
+    Run an iterable in a background thread, buffering at most `max_in_flight` items.
+
+    This lets an upstream stage (e.g. reading and splitting reports) overlap with a
+    downstream stage (e.g. embedding) while keeping memory bounded by the buffer size.
+    With max_in_flight <= 0 the iterable is consumed inline.
+    """
+    if max_in_flight <= 0:
+        yield from items
+        return
+
+    buffer: queue.Queue = queue.Queue(maxsize=max_in_flight)
+    stop = threading.Event()
+
+    def put(item) -> bool:
+        while not stop.is_set():
+            try:
+                buffer.put(item, timeout=0.1)
+                return True
+            except queue.Full:
+                continue
+        return False
+
+    def produce():
+        try:
+            for item in items:
+                if not put(item):
+                    return
+            put(_DONE)
+        except BaseException as e:
+            put(_StageError(e))
+
+    producer = threading.Thread(target=produce, name="ingest-prefetch", daemon=True)
+    producer.start()
+    try:
+        while True:
+            item = buffer.get()
+            if item is _DONE:
+                return
+            if isinstance(item, _StageError):
+                raise item.error
+            yield item
+    finally:
+        # Unblocks the producer if the consumer stops early
+        stop.set()
+
+
+def map_chunks_in_processes(
+    fn: Callable[[Any], R],
+    chunks: Iterable[List[T]],
+    workers: int,
+    ordered: bool = True,
+    payload: Optional[Callable[[List[T]], Any]] = None,
+    initializer: Optional[Callable[..., None]] = None,
+    initargs: Tuple = (),
+) -> Iterator[Tuple[List[T], R]]:
+    """
+    Apply `fn` to chunks of work in a process pool, yielding (chunk, result) pairs.
+
+    Each chunk is one work unit; `payload` optionally maps a chunk to the (smaller,
+    picklable) value actually sent to the worker. At most two chunks per worker are
+    pending at any time, so the input is consumed lazily and memory stays bounded.
+    With ordered=False results are yielded as soon as any chunk completes.
+    """
+    max_pending = workers * 2
+    # Spawn rather than fork: the pool may be started from a pipeline thread
+    context = multiprocessing.get_context("spawn")
+    chunk_iter = iter(chunks)
+    pending: deque = deque()
+
+    with ProcessPoolExecutor(
+        max_workers=workers,
+        mp_context=context,
+        initializer=initializer,
+        initargs=initargs,
+    ) as executor:
+        try:
+            while True:
+                while len(pending) < max_pending:
+                    chunk = next(chunk_iter, None)
+                    if chunk is None:
+                        break
+                    work = payload(chunk) if payload is not None else chunk
+                    pending.append((executor.submit(fn, work), chunk))
+
+                if not pending:
+                    return
+
+                if ordered:
+                    future, chunk = pending.popleft()
+                    yield chunk, future.result()
+                else:
+                    done, _ = wait([f for f, _ in pending], return_when=FIRST_COMPLETED)
+                    finished = [entry for entry in pending if entry[0] in done]
+                    for entry in finished:
+                        pending.remove(entry)
+                    for future, chunk in finished:
+                        yield chunk, future.result()
+        finally:
+            for future, _ in pending:
+                future.cancel()
@@ -0,0 +1,145 @@
+import time
+import threading
+from collections import OrderedDict
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+import numpy as np
+
+from ..config import (
+    DEFAULT_QUERY_EMBEDDING_CACHE_SIZE,
+    DEFAULT_QUERY_EMBEDDING_CACHE_TTL_SECONDS,
+)
+
+class QueryEmbeddingCache:
+    """
+    In-memory LRU cache of search query embeddings keyed by (model, query text).
+
+    Users search for the same finding names and synonyms over and over, and
+    embedding the query on the CPU is most of a vector search's latency. The least
+    recently used entry is evicted once `max_entries` is exceeded; with a TTL,
+    entries older than `ttl_seconds` are recomputed.
+    """
+
+    def __init__(
+        self,
+        max_entries: int = DEFAULT_QUERY_EMBEDDING_CACHE_SIZE,
+        ttl_seconds: float = DEFAULT_QUERY_EMBEDDING_CACHE_TTL_SECONDS,
+    ):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+        self._entries: "OrderedDict[Tuple[str, str], Tuple[np.ndarray, float]]" = (
+            OrderedDict()
+        )
+        self._lock = threading.Lock()
+
+    def _lookup(self, key: Tuple[str, str]) -> Optional[np.ndarray]:
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        vector, created_at = entry
+        if self.ttl_seconds > 0 and time.monotonic() - created_at > self.ttl_seconds:
+            del self._entries[key]
+            self.expirations += 1
+            return None
+        self._entries.move_to_end(key)
+        return vector
+
+    def get_or_compute(
+        self, model: str, query: str, compute: Callable[[str], Any]
+    ) -> np.ndarray:
+        """
+        Return the cached vector for `query`, or compute, store and return it.
+        The model is not run under the lock, so hits are never held up by a miss.
+        """
+        key = (model, query)
+        with self._lock:
+            vector = self._lookup(key)
+            if vector is not None:
+                self.hits += 1
+                return vector
+            self.misses += 1
+
+        return self._store(key, compute(query))
+
+    def get_or_compute_many(
+        self,
+        model: str,
+        queries: Sequence[str],
+        compute_many: Callable[[List[str]], Sequence[Any]],
+    ) -> List[np.ndarray]:
+        """
+        Like `get_or_compute` for a list of queries: the ones not cached are
+        computed together in a single `compute_many` call. Vectors are returned in
+        input order.
+        """
+        vectors: Dict[str, np.ndarray] = {}
+        with self._lock:
+            for query in dict.fromkeys(queries):
+                vector = self._lookup((model, query))
+                if vector is not None:
+                    vectors[query] = vector
+            self.hits += sum(1 for query in queries if query in vectors)
+            self.misses += sum(1 for query in queries if query not in vectors)
+
+        missing = [query for query in dict.fromkeys(queries) if query not in vectors]
+        if missing:
+            for query, vector in zip(missing, compute_many(missing)):
+                vectors[query] = self._store((model, query), vector)
+        return [vectors[query] for query in queries]
+
+    def _store(self, key: Tuple[str, str], vector: Any) -> np.ndarray:
+        vector = np.asarray(vector, dtype=np.float32)
+        # Shared between callers, so nobody may modify it in place
+        vector.flags.writeable = False
+        if self.max_entries <= 0:
+            return vector
+
+        with self._lock:
+            self._entries[key] = (vector, time.monotonic())
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+        return vector
+
+    @property
+    def hit_rate(self) -> float:
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        """Size, limits and hit/miss counters for reporting"""
+        with self._lock:
+            return {
+                "entries": len(self._entries),
+                "max_entries": self.max_entries,
+                "ttl_seconds": self.ttl_seconds,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": self.hit_rate,
+                "evictions": self.evictions,
+                "expirations": self.expirations,
+            }
+
+
+_shared_cache: Optional[QueryEmbeddingCache] = None
+_shared_cache_lock = threading.Lock()
+
+
+def get_query_embedding_cache() -> QueryEmbeddingCache:
+    """The query embedding cache shared by every search in this process"""
+    global _shared_cache
+    with _shared_cache_lock:
+        if _shared_cache is None:
+            _shared_cache = QueryEmbeddingCache()
+        return _shared_cache
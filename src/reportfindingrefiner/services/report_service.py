@@ -1,15 +1,59 @@
 import os
-from typing import List, Dict, Any, Optional
+import threading
+from datetime import timedelta
+from typing import Iterable, List, Dict, Any, Optional, Tuple
 import pandas as pd
 import lancedb
 
 from ..config import (
     DEFAULT_DB_PATH,
-    DEFAULT_TABLE_NAME
+    DEFAULT_TABLE_NAME,
+    DEFAULT_INGEST_WORKERS,
+    DEFAULT_INGEST_BATCH_SIZE,
+    DEFAULT_EMBEDDING_CACHE_ENABLED,
+    DEFAULT_EMBED_MAX_TOKENS_PER_BATCH,
+    DEFAULT_EMBED_NUM_THREADS,
+    DEFAULT_DEDUP_ENABLED,
+    DEFAULT_DEDUP_THRESHOLD,
+    DEFAULT_CHUNK_BY_TOKENS,
+    DEFAULT_OPTIMIZE_RETENTION_HOURS
 )
 from ..section_splitter import SectionSplitter
-from ..data_models import FragmentSchema
-from ..services.ingestion import read_reports_from_folder, create_fragments_from_reports
+from ..token_chunker import TokenBudgetChunker
+from ..data_models import FragmentSchema, Report
+from ..lance_db import (
+    FragmentColumns,
+    delete_fragment_tails,
+    delete_report_fragments,
+    ensure_fts_index,
+    ensure_scalar_indices,
+    ensure_vector_index,
+    FRAGMENT_TEXT_COLUMNS,
+    quote_sql_string,
+    scan_fragments,
+    upsert_report_fragments,
+)
+from ..services.ingestion import (
+    IngestionStats,
+    ReportToIngest,
+    ingest_source,
+    iter_deduplicated,
+    map_duplicates,
+    open_embedding_cache,
+    promote_duplicates,
+)
+from ..services.report_sources import (
+    iter_file_reports,
+    iter_folder_reports,
+    stat_report_files,
+)
+from ..services.embedding_cache import embed_with_cache
+from ..services.embedding_engine import EmbeddingEngine, set_embedding_threads
+from ..services.dedup import NearDuplicateIndex, dedup_index_path_for
+from ..services.manifest import IngestionManifest, hash_text, manifest_path_for
+from ..services.checkpoint import checkpoint_path_for
+from ..services.maintenance import OptimizeReport, optimize_table
+from ..services.pipeline import batched
 
 class ReportService:
     """
@@ -17,13 +61,43 @@ class ReportService:
     This class centralizes all report-related functionality for both API and CLI.
     """
     
-    def __init__(self, db_path: str = DEFAULT_DB_PATH, table_name: str = DEFAULT_TABLE_NAME):
-        """Initialize the report service with database connection details"""
+    def __init__(
+        self,
+        db_path: str = DEFAULT_DB_PATH,
+        table_name: str = DEFAULT_TABLE_NAME,
+        workers: int = DEFAULT_INGEST_WORKERS,
+        batch_size: int = DEFAULT_INGEST_BATCH_SIZE,
+        use_embedding_cache: bool = DEFAULT_EMBEDDING_CACHE_ENABLED,
+        max_tokens_per_batch: int = DEFAULT_EMBED_MAX_TOKENS_PER_BATCH,
+        embed_threads: int = DEFAULT_EMBED_NUM_THREADS,
+        dedup: bool = DEFAULT_DEDUP_ENABLED,
+        dedup_threshold: float = DEFAULT_DEDUP_THRESHOLD,
+        chunk_by_tokens: bool = DEFAULT_CHUNK_BY_TOKENS
+    ):
+        """
+        Initialize the report service with database connection details and the
+        ingestion options used by `ingest_reports`, `ingest_report_files` and the
+        folder watcher (see `services.ingestion.ingest_reports`)
+        """
         self.db_path = db_path
         self.table_name = table_name
+        self.workers = workers
+        self.batch_size = batch_size
+        self.use_embedding_cache = use_embedding_cache
+        self.max_tokens_per_batch = max_tokens_per_batch
+        self.embed_threads = embed_threads
+        self.dedup = dedup
+        self.dedup_threshold = dedup_threshold
+        self.chunk_by_tokens = chunk_by_tokens
         self.db = None
         self.table = None
         self.splitter = SectionSplitter()
+        self.embedding_engine = None
+        self.dedup_index = None
+        # Manifest read by lookups, with the (mtime, size) of the file it was read from
+        self._manifest_cache: Optional[Tuple[Tuple[int, int], IngestionManifest]] = None
+        # Background jobs and the folder watcher share the table and its manifest
+        self._ingest_lock = threading.Lock()
     
     def _ensure_connection(self):
         """Ensure connection to the database and table"""
@@ -39,86 +113,420 @@ class ReportService:
             else:
                 self.table = self.db.create_table(
                     self.table_name,
-                    schema=FragmentSchema,
+                    schema=FragmentSchema.with_embedding(),
                     mode="create"
                 )
         
         return self.table
     
-    def ingest_reports(self, reports_folder: str) -> int:
+    def _ensure_embedding_engine(self) -> EmbeddingEngine:
+        """Load the embedding model once; token-budget chunking needs its tokenizer"""
+        if self.embedding_engine is None:
+            set_embedding_threads(self.embed_threads)
+            self.embedding_engine = EmbeddingEngine(
+                max_tokens_per_batch=self.max_tokens_per_batch
+            )
+            if self.chunk_by_tokens:
+                self.splitter = SectionSplitter(
+                    chunker=TokenBudgetChunker(self.embedding_engine.tokenizer)
+                )
+        return self.embedding_engine
+    
+    def _load_dedup_index(self) -> Optional[NearDuplicateIndex]:
+        """
+        Load the near-duplicate index once and keep it between watcher micro-batches.
+        Without deduplication a saved index is dropped, since the ingestion would
+        change or remove representatives behind its back.
+        """
+        path = dedup_index_path_for(self.db_path, self.table_name)
+        if not self.dedup:
+            self.dedup_index = None
+            if os.path.exists(path):
+                os.remove(path)
+        elif self.dedup_index is None:
+            self.dedup_index = NearDuplicateIndex.load(
+                path, threshold=self.dedup_threshold
+            )
+        return self.dedup_index
+    
+    def ingest_reports(
+        self,
+        reports_folder: str,
+        incremental: bool = True,
+        workers: Optional[int] = None,
+        use_embedding_cache: Optional[bool] = None,
+        stats: Optional[IngestionStats] = None
+    ) -> int:
         """
         Ingest reports from a folder into the database.
         
         Args:
             reports_folder: Path to folder containing report text files
+            incremental: Only process reports that are new or changed since the
+                last ingestion, replacing the fragments of changed reports
+            workers: Number of processes used to split reports into fragments
+                (defaults to the service's setting)
+            use_embedding_cache: Reuse cached vectors for previously embedded fragment
+                texts (defaults to the service's setting)
+            stats: Optional counters updated as the ingestion progresses
+            
+        Reports whose files were removed from the folder since the last ingestion
+        have their fragments deleted. Only reports ingested from this folder are
+        considered; upserted reports and reports from other sources are kept.
             
         Returns:
             Number of fragments ingested
         """
-        # Make sure the connection is established
-        table = self._ensure_connection()
+        return self._ingest(
+            iter_folder_reports(reports_folder),
+            incremental=incremental,
+            workers=workers,
+            use_embedding_cache=use_embedding_cache,
+            stats=stats,
+            purge_missing=True,
+            source_id=os.path.abspath(reports_folder)
+        )
+    
+    def ingest_report_files(
+        self,
+        paths: Iterable[str],
+        use_embedding_cache: Optional[bool] = None,
+        stats: Optional[IngestionStats] = None,
+        reports_folder: Optional[str] = None
+    ) -> int:
+        """
+        Incrementally ingest specific report files, appending new reports and
+        replacing the fragments of changed ones. Used by the folder watcher so a
+        micro-batch never rescans the whole folder.
         
-        # Read and process reports
-        reports_list = read_reports_from_folder(reports_folder)
-        all_fragments = create_fragments_from_reports(reports_list, self.splitter)
+        Args:
+            paths: Paths of report text files; files that no longer exist are skipped
+            use_embedding_cache: Reuse cached vectors for previously embedded fragment
+                texts (defaults to the service's setting)
+            stats: Optional counters updated as the ingestion progresses
+            reports_folder: Folder the files belong to, recorded as their source so
+                a later `ingest_reports` of that folder purges them once deleted
+            
+        Returns:
+            Number of fragments ingested
+        """
+        return self._ingest(
+            iter_file_reports(stat_report_files(paths)),
+            incremental=True,
+            use_embedding_cache=use_embedding_cache,
+            stats=stats,
+            source_id=os.path.abspath(reports_folder) if reports_folder else None
+        )
+    
+    def _ingest(
+        self,
+        source,
+        incremental: bool = True,
+        workers: Optional[int] = None,
+        use_embedding_cache: Optional[bool] = None,
+        stats: Optional[IngestionStats] = None,
+        purge_missing: bool = False,
+        source_id: Optional[str] = None
+    ) -> int:
+        """Run one ingestion at a time against the table and its manifest"""
+        if workers is None:
+            workers = self.workers
+        if use_embedding_cache is None:
+            use_embedding_cache = self.use_embedding_cache
+        with self._ingest_lock:
+            # Make sure the connection is established
+            table = self._ensure_connection()
+
+            manifest = IngestionManifest.load(
+                manifest_path_for(self.db_path, self.table_name)
+            )
+            # Load the embedding model once per service, not once per ingestion
+            self._ensure_embedding_engine()
+            
+            dedup_index = self._load_dedup_index()
+            embedding_cache = (
+                open_embedding_cache(self.db_path) if use_embedding_cache else None
+            )
+            try:
+                return ingest_source(
+                    table,
+                    source,
+                    manifest,
+                    self.splitter,
+                    incremental=incremental,
+                    batch_size=self.batch_size,
+                    workers=workers,
+                    embedding_cache=embedding_cache,
+                    engine=self.embedding_engine,
+                    stats=stats,
+                    dedup_index=dedup_index,
+                    purge_missing=purge_missing,
+                    source_id=source_id
+                )
+            except BaseException:
+                # Reload the saved index next time rather than keep representatives
+                # whose fragments were never written
+                self.dedup_index = None
+                raise
+            finally:
+                if embedding_cache is not None:
+                    embedding_cache.close()
+    
+    def upsert_reports(
+        self,
+        reports: Iterable[Report],
+        batch_size: int = 500,
+        use_embedding_cache: Optional[bool] = None
+    ) -> int:
+        """
+        Insert new reports and replace the fragments of existing ones, e.g. for
+        addenda and corrections.
         
-        # Prepare and insert documents
-        docs = [{
-            "report_id": frag.report_id,
-            "section": frag.section,
-            "sequence_number": frag.sequence_number,
-            "text": frag.text
-        } for frag in all_fragments]
+        Each batch of reports is written with one merge-insert keyed on
+        (report_id, sequence_number). Reports that now have fewer fragments than
+        before only have their leftover tail deleted; the rest of the table is
+        untouched. Reports whose text is unchanged are skipped. With deduplication
+        on, near-duplicates of a stored report are not embedded, exactly as in
+        `ingest_reports`.
         
-        table.add(docs)
-        return len(docs)
+        Args:
+            reports: Reports to insert or replace
+            batch_size: Reports written per merge-insert
+            use_embedding_cache: Reuse cached vectors for previously embedded fragment
+                texts (defaults to the service's setting)
+            
+        Returns:
+            Number of fragments written
+        """
+        if use_embedding_cache is None:
+            use_embedding_cache = self.use_embedding_cache
+        with self._ingest_lock:
+            table = self._ensure_connection()
+            manifest = IngestionManifest.load(
+                manifest_path_for(self.db_path, self.table_name)
+            )
+            self._ensure_embedding_engine()
+            dedup_index = self._load_dedup_index()
+            duplicates = map_duplicates(manifest)
+
+            embedding_cache = (
+                open_embedding_cache(self.db_path) if use_embedding_cache else None
+            )
+            written = 0
+            try:
+                for chunk in batched(reports, batch_size):
+                    # The last version of a report wins if it appears twice in a batch
+                    chunk = list({report.id: report for report in chunk}.values())
+                    items = []
+                    for report in chunk:
+                        content_hash = hash_text(report.text)
+                        entry = manifest.get(report.id)
+                        if entry is not None and entry.content_hash == content_hash:
+                            continue
+                        # Keep the file mtime and source of known reports, so an
+                        # unchanged copy in the reports folder does not overwrite the
+                        # correction
+                        items.append(ReportToIngest(
+                            report=report,
+                            content_hash=content_hash,
+                            mtime=entry.mtime if entry is not None else 0.0,
+                            stale=entry is not None,
+                            source=entry.source if entry is not None else None,
+                        ))
+                    if not items:
+                        continue
+                    # Near-duplicates of a corrected report keep its previous text
+                    promote_duplicates(
+                        table,
+                        manifest,
+                        [item.report.id for item in items if item.stale],
+                        duplicates,
+                        dedup_index,
+                    )
+                    split_reports = [
+                        (item, self.splitter.split_into_fragments(item.report.text))
+                        for item in items
+                    ]
+                    if dedup_index is not None:
+                        split_reports = list(iter_deduplicated(
+                            split_reports, dedup_index, IngestionStats()
+                        ))
+                    columns = FragmentColumns()
+                    tails = {}
+                    for item, fragments in split_reports:
+                        columns.append_report(item.report.id, fragments)
+                        entry = manifest.get(item.report.id)
+                        # Without a manifest entry the old fragment count is unknown
+                        if entry is None or entry.fragment_count > len(fragments):
+                            tails[item.report.id] = len(fragments)
+                    
+                    if len(columns):
+                        vectors = embed_with_cache(
+                            columns.texts, self.embedding_engine.embed, embedding_cache
+                        )
+                        upsert_report_fragments(
+                            table, columns.to_record_batch(vectors, table.schema)
+                        )
+                    if tails:
+                        delete_fragment_tails(table, tails)
+                    
+                    for item, fragments in split_reports:
+                        manifest.update(
+                            item.report.id,
+                            item.content_hash,
+                            item.mtime,
+                            len(fragments),
+                            item.duplicate_of,
+                            item.source,
+                        )
+                        if item.duplicate_of is not None:
+                            duplicates.setdefault(item.duplicate_of, []).append(
+                                item.report.id
+                            )
+                    if dedup_index is not None:
+                        dedup_index.commit(item.report.id for item in items)
+                    written += len(columns)
+            except BaseException:
+                self.dedup_index = None
+                raise
+            finally:
+                manifest.save()
+                if dedup_index is not None:
+                    dedup_index.save()
+                if embedding_cache is not None:
+                    embedding_cache.close()
+            ensure_fts_index(table)
+            # Only extend the vector index; optimize() trains it
+            ensure_vector_index(table, train=False)
+            ensure_scalar_indices(table)
+            return written
     
-    def get_all_reports(self) -> List[Dict[str, Any]]:
+    def delete_reports(self, report_ids: Iterable[str]) -> int:
         """
-        Get all report IDs with their fragment counts
+        Delete all fragments of the given reports. A near-duplicate of a deleted
+        report takes over its fragments (see `promote_duplicates`).
         
+        Args:
+            report_ids: IDs of the reports to delete
+            
         Returns:
-            List of dictionaries with report information
+            Number of fragments deleted
         """
-        table = self._ensure_connection()
-        df = table.to_pandas()
+        report_ids = list(dict.fromkeys(report_ids))
+        with self._ingest_lock:
+            table = self._ensure_connection()
+            manifest = IngestionManifest.load(
+                manifest_path_for(self.db_path, self.table_name)
+            )
+
+            dedup_index = self._load_dedup_index()
+
+            promote_duplicates(
+                table, manifest, report_ids, map_duplicates(manifest), dedup_index
+            )
+            rows_before = table.count_rows()
+            delete_report_fragments(table, report_ids)
+            for report_id in report_ids:
+                manifest.remove(report_id)
+            manifest.save()
+            if dedup_index is not None:
+                dedup_index.commit(report_ids)
+                dedup_index.save()
+            return rows_before - table.count_rows()
+    
+    def optimize(
+        self,
+        retention: timedelta = timedelta(hours=DEFAULT_OPTIMIZE_RETENTION_HOURS),
+        rebuild_indices: bool = False
+    ) -> OptimizeReport:
+        """
+        Compact the table's data files, prune versions older than `retention` and
+        update its indices (see `optimize_table`).
         
-        # Get unique report IDs and count fragments
-        report_stats = df.groupby('report_id').agg({
-            'text': 'count'
-        }).reset_index()
+        Runs under the ingestion lock, so it never overlaps a background ingestion.
+        Old versions are kept while an interrupted ingestion's checkpoint exists,
+        since resuming it rolls the table back to an earlier version.
         
-        return report_stats.rename(columns={'text': 'fragment_count'}).to_dict('records')
-    
-    def get_report_fragments(self, report_id: str) -> pd.DataFrame:
+        Returns:
+            OptimizeReport with file counts and bytes before and after
+        """
+        with self._ingest_lock:
+            table = self._ensure_connection()
+            if os.path.exists(checkpoint_path_for(self.db_path, self.table_name)):
+                retention = None
+            return optimize_table(
+                table,
+                self.table_name,
+                retention=retention,
+                rebuild_indices=rebuild_indices,
+            )
+
+    def get_all_reports(self, where: Optional[str] = None) -> List[Dict[str, Any]]:
         """
-        Get all fragments for a specific report
+        Get all report IDs with their fragment counts
         
         Args:
-            report_id: ID of the report to retrieve
+            where: Optional SQL filter on the fragments counted,
+                e.g. "section = 'Impression:'"
             
         Returns:
-            DataFrame containing the report fragments
+            List of dictionaries with report information
         """
         table = self._ensure_connection()
-        df = table.to_pandas()
+        df = scan_fragments(table, where, columns=["report_id"]).to_pandas()
         
-        # Filter by report ID and sort by sequence number
-        fragments = df[df['report_id'] == report_id].sort_values('sequence_number')
-        return fragments
+        # Get unique report IDs and count fragments
+        report_stats = df.groupby('report_id').size().reset_index(name='fragment_count')
+        return report_stats.to_dict('records')
+    
+    def _load_cached_manifest(self) -> IngestionManifest:
+        """The manifest for read-only lookups, only read again once its file changes"""
+        path = manifest_path_for(self.db_path, self.table_name)
+        try:
+            st = os.stat(path)
+            signature = (st.st_mtime_ns, st.st_size)
+        except FileNotFoundError:
+            signature = (0, 0)
+        if self._manifest_cache is None or self._manifest_cache[0] != signature:
+            self._manifest_cache = (signature, IngestionManifest.load(path))
+        return self._manifest_cache[1]
     
-    def get_report_as_markdown(self, report_id: str) -> str:
+    def get_duplicate_of(self, report_id: str) -> Optional[str]:
         """
-        Get a report formatted as markdown
+        Return the representative report that a near-duplicate report points to,
+        or None if the report was stored in its own right
+        """
+        entry = self._load_cached_manifest().get(report_id)
+        return entry.duplicate_of if entry is not None else None
+
+    def get_report_fragments(
+        self, report_id: str, where: Optional[str] = None
+    ) -> pd.DataFrame:
+        """
+        Get all fragments for a specific report, looked up through the report_id index
         
         Args:
-            report_id: ID of the report to retrieve
+            report_id: ID of the report to retrieve; near-duplicates resolve to
+                the fragments of their representative report
+            where: Optional further SQL filter, e.g. "section = 'Impression:'"
             
         Returns:
-            Markdown-formatted report
+            DataFrame containing the report fragments
         """
-        fragments = self.get_report_fragments(report_id)
+        report_id = self.get_duplicate_of(report_id) or report_id
+        table = self._ensure_connection()
+        condition = f"report_id = {quote_sql_string(report_id)}"
+        if where:
+            condition = f"{condition} AND ({where})"
         
+        # Sort by sequence number
+        return (
+            scan_fragments(table, condition).to_pandas().sort_values('sequence_number')
+        )
+
+    @staticmethod
+    def _fragments_as_markdown(report_id: str, fragments: pd.DataFrame) -> str:
+        """Format one report's fragments, in sequence order, as markdown"""
         markdown_report = f"# Report: {report_id}\n\n## Sections\n"
         
         current_section = None
@@ -129,22 +537,43 @@ class ReportService:
             markdown_report += f"{fragment['text']}\n"
         
         return markdown_report
-    
-    def get_all_reports_as_markdown(self) -> Dict[str, str]:
+
+    def get_report_as_markdown(
+        self, report_id: str, where: Optional[str] = None
+    ) -> str:
+        """
+        Get a report formatted as markdown
+        
+        Args:
+            report_id: ID of the report to retrieve
+            where: Optional SQL filter on the fragments included
+            
+        Returns:
+            Markdown-formatted report
+        """
+        return self._fragments_as_markdown(
+            report_id, self.get_report_fragments(report_id, where)
+        )
+
+    def get_all_reports_as_markdown(
+        self, where: Optional[str] = None
+    ) -> Dict[str, str]:
         """
         Get all reports formatted as markdown
         
+        Args:
+            where: Optional SQL filter on the fragments included
+            
         Returns:
             Dictionary mapping report_id to markdown-formatted report
         """
         table = self._ensure_connection()
-        df = table.to_pandas()
-        
-        # Get unique report IDs
-        unique_reports = df['report_id'].unique()
-        
-        markdown_reports = {}
-        for report_id in unique_reports:
-            markdown_reports[report_id] = self.get_report_as_markdown(report_id)
+        # One read of the text columns rather than a lookup per report
+        df = scan_fragments(table, where, columns=FRAGMENT_TEXT_COLUMNS).to_pandas()
+        # A stable sort keeps reports in table order when grouped
+        df = df.sort_values('sequence_number', kind='stable')
         
-        return markdown_reports 
\ No newline at end of file
+        return {
+            report_id: self._fragments_as_markdown(report_id, fragments)
+            for report_id, fragments in df.groupby('report_id', sort=False)
+        }
@@ -0,0 +1,227 @@
+import io
+import os
+import bz2
+import gzip
+import json
+import lzma
+import tarfile
+from functools import partial
+from typing import BinaryIO, Callable, Iterable, Iterator, NamedTuple, Optional, Tuple
+import pyarrow.parquet as pq
+
+try:
+    # Optional: .zst compressed exports
+    import zstandard
+except ImportError:
+    zstandard = None
+
+SOURCE_FORMATS = ["auto", "folder", "jsonl", "tar", "parquet"]
+
+JSONL_SUFFIXES = (".jsonl", ".ndjson")
+TAR_SUFFIXES = (".tar", ".tgz", ".tbz2", ".txz")
+COMPRESSION_SUFFIXES = (".gz", ".bz2", ".xz", ".zst")
+
+
+class SourceReport(NamedTuple):
+    """
+    A report as listed by a report source, before its text is read.
+
+    `read_text` must be called before the next report is requested, since
+    streaming sources (e.g. tar archives) move past a report's data once the
+    iterator advances.
+    """
+    report_id: str
+    mtime: Optional[float]  # None when the source has no modification times
+    read_text: Callable[[], str]
+
+
+def iter_report_files(folder_path: str) -> Iterator[Tuple[str, str, float]]:
+    """
+    Lazily list .txt files in a folder as (report_id, path, mtime) tuples without
+    reading them.
+    """
+    with os.scandir(folder_path) as it:
+        for entry in it:
+            if entry.is_file() and entry.name.endswith(".txt"):
+                yield entry.name, entry.path, entry.stat().st_mtime
+
+def stat_report_files(paths: Iterable[str]) -> Iterator[Tuple[str, str, float]]:
+    """
+    Describe specific report files as (report_id, path, mtime) tuples, skipping
+    files that no longer exist.
+    """
+    for path in paths:
+        try:
+            mtime = os.stat(path).st_mtime
+        except FileNotFoundError:
+            continue
+        yield os.path.basename(path), path, mtime
+
+def _read_text_file(path: str) -> str:
+    with open(path, "r", encoding="utf-8") as f:
+        return f.read()
+
+
+def iter_file_reports(
+    report_files: Iterable[Tuple[str, str, float]],
+) -> Iterator[SourceReport]:
+    """
+    Turn (report_id, path, mtime) tuples into source reports that read the file on
+    demand.
+    """
+    for report_id, path, mtime in report_files:
+        yield SourceReport(report_id, mtime, partial(_read_text_file, path))
+
+def iter_folder_reports(folder_path: str) -> Iterator[SourceReport]:
+    """
+    Stream the .txt reports in a folder.
+    """
+    return iter_file_reports(iter_report_files(folder_path))
+
+def _strip_compression(path: str) -> str:
+    for suffix in COMPRESSION_SUFFIXES:
+        if path.endswith(suffix):
+            return path[:-len(suffix)]
+    return path
+
+def _require_zstandard(path: str) -> None:
+    if zstandard is None:
+        raise ImportError(
+            f"Reading {path} requires the 'zstandard' package; "
+            "install it with `pip install reportfindingrefiner[archives]`"
+        )
+
+def open_compressed(path: str) -> BinaryIO:
+    """
+    Open a file for binary reading, decompressing .gz, .bz2, .xz and .zst on the fly.
+    """
+    if path.endswith(".gz"):
+        return gzip.open(path, "rb")
+    if path.endswith(".bz2"):
+        return bz2.open(path, "rb")
+    if path.endswith(".xz"):
+        return lzma.open(path, "rb")
+    if path.endswith(".zst"):
+        _require_zstandard(path)
+        return zstandard.ZstdDecompressor().stream_reader(
+            open(path, "rb"), closefd=True
+        )
+    return open(path, "rb")
+
+
+def iter_jsonl_reports(
+    path: str, id_field: str = "id", text_field: str = "text"
+) -> Iterator[SourceReport]:
+    """
+    Stream reports from a JSON Lines file (optionally compressed), one object per line.
+    """
+    with open_compressed(path) as raw:
+        for line_number, line in enumerate(
+            io.TextIOWrapper(raw, encoding="utf-8"), start=1
+        ):
+            if not line.strip():
+                continue
+            record = json.loads(line)
+            try:
+                report_id, text = str(record[id_field]), record[text_field]
+            except KeyError as e:
+                raise ValueError(f"{path}:{line_number} has no {str(e)} field") from e
+            # A null text is an empty report, as in Parquet sources
+            yield SourceReport(report_id, None, lambda text=text: text or "")
+
+def iter_tar_reports(path: str) -> Iterator[SourceReport]:
+    """
+    Stream the .txt members of a tar archive (optionally compressed) without
+    extracting it. Report IDs are member file names, matching reports read from an
+    extracted folder.
+    """
+    if path.endswith(".zst"):
+        _require_zstandard(path)
+        raw = zstandard.ZstdDecompressor().stream_reader(open(path, "rb"), closefd=True)
+        archive = tarfile.open(fileobj=raw, mode="r|")
+    else:
+        raw = None
+        # Streaming mode reads the archive front to back, whatever its compression
+        archive = tarfile.open(path, mode="r|*")
+
+    try:
+        for member in archive:
+            if not member.isfile() or not member.name.endswith(".txt"):
+                continue
+
+            def read_text(member=member) -> str:
+                with archive.extractfile(member) as f:
+                    return f.read().decode("utf-8")
+
+            yield SourceReport(
+                os.path.basename(member.name), float(member.mtime), read_text
+            )
+    finally:
+        archive.close()
+        if raw is not None:
+            raw.close()
+
+def iter_parquet_reports(
+    path: str,
+    id_field: str = "id",
+    text_field: str = "text",
+    batch_size: int = 10000,
+) -> Iterator[SourceReport]:
+    """
+    Stream reports from a Parquet file, reading only the ID and text columns a
+    batch of rows at a time.
+    """
+    parquet_file = pq.ParquetFile(path)
+    for batch in parquet_file.iter_batches(
+        batch_size=batch_size, columns=[id_field, text_field]
+    ):
+        ids = batch.column(id_field).to_pylist()
+        texts = batch.column(text_field).to_pylist()
+        for report_id, text in zip(ids, texts):
+            yield SourceReport(str(report_id), None, lambda text=text: text or "")
+
+def detect_source_format(source: str) -> str:
+    """
+    Guess the format of a report source from its path.
+    """
+    if os.path.isdir(source):
+        return "folder"
+    name = _strip_compression(source.lower())
+    if name.endswith(TAR_SUFFIXES):
+        return "tar"
+    if name.endswith(JSONL_SUFFIXES):
+        return "jsonl"
+    if name.endswith(".parquet"):
+        return "parquet"
+    raise ValueError(
+        f"Cannot tell the format of {source}; pass one of "
+        f"{', '.join(SOURCE_FORMATS[1:])}"
+    )
+
+def open_report_source(
+    source: str,
+    source_format: str = "auto",
+    id_field: str = "id",
+    text_field: str = "text",
+) -> Iterator[SourceReport]:
+    """
+    Stream reports from a folder of .txt files, a JSON Lines file, a tar archive or a
+    Parquet file, without extracting anything to disk.
+
+    Args:
+        source: Path to the folder or file
+        source_format: One of SOURCE_FORMATS; "auto" detects it from the path
+        id_field: Report ID field (JSON Lines) or column (Parquet)
+        text_field: Report text field (JSON Lines) or column (Parquet)
+    """
+    if source_format == "auto":
+        source_format = detect_source_format(source)
+    if source_format == "folder":
+        return iter_folder_reports(source)
+    if source_format == "jsonl":
+        return iter_jsonl_reports(source, id_field=id_field, text_field=text_field)
+    if source_format == "tar":
+        return iter_tar_reports(source)
+    if source_format == "parquet":
+        return iter_parquet_reports(source, id_field=id_field, text_field=text_field)
+    raise ValueError(f"Unknown report source format: {source_format}")
@@ -0,0 +1,235 @@
+import os
+import time
+import threading
+import traceback
+from typing import Any, Dict, List, Optional, Tuple
+
+from ..config import (
+    DEFAULT_WATCH_DEBOUNCE_SECONDS,
+    DEFAULT_WATCH_POLL_INTERVAL,
+    DEFAULT_WATCH_MAX_BATCH_REPORTS,
+)
+from .ingestion import IngestionStats
+from .report_service import ReportService
+
+try:
+    # Optional: inotify (or the platform equivalent) instead of polling the folder
+    from watchdog.events import FileSystemEventHandler
+    from watchdog.observers import Observer
+except ImportError:
+    FileSystemEventHandler = object
+    Observer = None
+
+
+class _ReportEventHandler(FileSystemEventHandler):
+    """Forwards created, modified and moved-in .txt files to the watcher"""
+
+    def __init__(self, watcher: "ReportFolderWatcher"):
+        self.watcher = watcher
+
+    def on_created(self, event):
+        if not event.is_directory:
+            self.watcher.mark_changed(event.src_path)
+
+    def on_modified(self, event):
+        if not event.is_directory:
+            self.watcher.mark_changed(event.src_path)
+
+    def on_moved(self, event):
+        if not event.is_directory:
+            self.watcher.mark_changed(event.dest_path)
+
+
+class ReportFolderWatcher:
+    """
+    Watches a reports folder and ingests new or modified .txt files in micro-batches.
+
+    Changes are picked up through inotify when the optional `watchdog` package is
+    installed, and by polling the folder otherwise. A file is ingested once it has
+    been quiet for `debounce_seconds`, so reports that are still being written are not
+    read half-way; all files that settle together are appended to the table in one
+    incremental ingestion through the ReportService, without rewriting the table.
+    """
+
+    def __init__(
+        self,
+        reports_folder: str,
+        report_service: ReportService,
+        debounce_seconds: float = DEFAULT_WATCH_DEBOUNCE_SECONDS,
+        poll_interval: float = DEFAULT_WATCH_POLL_INTERVAL,
+        max_batch_reports: int = DEFAULT_WATCH_MAX_BATCH_REPORTS,
+        use_inotify: bool = True,
+    ):
+        self.reports_folder = os.path.abspath(reports_folder)
+        self.report_service = report_service
+        self.debounce_seconds = debounce_seconds
+        self.poll_interval = poll_interval
+        self.max_batch_reports = max_batch_reports
+        self.use_inotify = use_inotify and Observer is not None
+
+        self.batches_ingested = 0
+        self.reports_ingested = 0
+        self.fragments_ingested = 0
+        self.last_batch_at: Optional[float] = None
+        self.last_error: Optional[str] = None
+
+        self._pending: Dict[str, float] = {}  # path -> time of its latest change
+        # polling: path -> (mtime, size)
+        self._snapshot: Dict[str, Tuple[float, int]] = {}
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._observer = None
+
+    @property
+    def mode(self) -> str:
+        return "inotify" if self.use_inotify else "polling"
+
+    def mark_changed(self, path: str) -> None:
+        """Record a change to `path`, restarting its debounce period"""
+        if (
+            path.endswith(".txt")
+            and os.path.dirname(os.path.abspath(path)) == self.reports_folder
+        ):
+            with self._lock:
+                self._pending[path] = time.monotonic()
+
+    def _poll(self, mark: bool = True) -> None:
+        """Compare the folder against the last snapshot and mark changed files"""
+        snapshot: Dict[str, Tuple[float, int]] = {}
+        with os.scandir(self.reports_folder) as it:
+            for entry in it:
+                if entry.is_file() and entry.name.endswith(".txt"):
+                    st = entry.stat()
+                    snapshot[entry.path] = (st.st_mtime, st.st_size)
+
+        previous, self._snapshot = self._snapshot, snapshot
+        if not mark:
+            return
+        for path, signature in snapshot.items():
+            if previous.get(path) != signature:
+                self.mark_changed(path)
+
+    def _take_settled(self) -> List[str]:
+        """
+        Remove and return up to max_batch_reports files that have been quiet long enough
+        """
+        now = time.monotonic()
+        with self._lock:
+            settled = [
+                path for path, changed_at in self._pending.items()
+                if now - changed_at >= self.debounce_seconds
+            ][:self.max_batch_reports]
+            for path in settled:
+                del self._pending[path]
+        return settled
+
+    def _ingest_settled(self) -> None:
+        paths = self._take_settled()
+        if not paths:
+            return
+        print(
+            f"\n👀 Detected {len(paths)} new or modified reports in "
+            f"{self.reports_folder}"
+        )
+        try:
+            stats = IngestionStats()
+            self.report_service.ingest_report_files(
+                paths, stats=stats, reports_folder=self.reports_folder
+            )
+        except Exception as e:
+            # Keep watching and retry the reports after another debounce period;
+            # polling already recorded their new signature, so they would
+            # otherwise never be seen as changed again
+            self.last_error = str(e)
+            print(f"\n❌ Error ingesting watched reports: {str(e)}")
+            traceback.print_exc()
+            retry_at = time.monotonic()
+            with self._lock:
+                for path in paths:
+                    self._pending.setdefault(path, retry_at)
+            return
+        self.batches_ingested += 1
+        self.reports_ingested += stats.reports_ingested
+        self.fragments_ingested += stats.fragments_written
+        self.last_batch_at = time.time()
+
+    def _start_observer(self) -> None:
+        self._observer = Observer()
+        self._observer.schedule(
+            _ReportEventHandler(self), self.reports_folder, recursive=False
+        )
+        self._observer.start()
+
+    def run(self, catch_up: bool = True) -> None:
+        """
+        Watch the folder until `stop()` is called.
+
+        Args:
+            catch_up: First ingest reports that changed while nobody was watching
+        """
+        # Start listening before the catch-up scan so nothing that
+        # lands during it is missed
+        if self.use_inotify:
+            try:
+                self._start_observer()
+            except OSError as e:
+                # e.g. the inotify watch limit is exhausted
+                print(
+                    f"\n⚠️  Could not watch {self.reports_folder} with inotify "
+                    f"({str(e)}), polling instead"
+                )
+                self.use_inotify = False
+        if not self.use_inotify:
+            # Baseline only: files already present are covered by the catch-up scan
+            self._poll(mark=False)
+        print(f"\n👀 Watching {self.reports_folder} for new reports ({self.mode})")
+
+        try:
+            if catch_up:
+                self.report_service.ingest_reports(
+                    self.reports_folder, incremental=True
+                )
+            while not self._stop.is_set():
+                if not self.use_inotify:
+                    self._poll()
+                self._ingest_settled()
+                self._stop.wait(self.poll_interval)
+        finally:
+            if self._observer is not None:
+                self._observer.stop()
+                self._observer.join()
+                self._observer = None
+
+    def start(self, catch_up: bool = True) -> None:
+        """Watch the folder in a background thread"""
+        self._stop.clear()
+        self._thread = threading.Thread(
+            target=self.run,
+            kwargs={"catch_up": catch_up},
+            name="report-watcher",
+            daemon=True,
+        )
+        self._thread.start()
+
+    def stop(self, wait: bool = True) -> None:
+        """Stop watching; an ingestion that is already running finishes first"""
+        self._stop.set()
+        if wait and self._thread is not None:
+            self._thread.join()
+
+    def status(self) -> Dict[str, Any]:
+        """Watcher mode and counters for reporting over the API"""
+        with self._lock:
+            pending = len(self._pending)
+        return {
+            "reports_folder": self.reports_folder,
+            "mode": self.mode,
+            "running": self._thread is not None and self._thread.is_alive(),
+            "pending_reports": pending,
+            "batches_ingested": self.batches_ingested,
+            "reports_ingested": self.reports_ingested,
+            "fragments_ingested": self.fragments_ingested,
+            "last_batch_at": self.last_batch_at,
+            "last_error": self.last_error,
+        }
@@ -1,67 +1,361 @@
-from typing import List
-from .lance_db import connect_db
-import pandas as pd
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, List, Optional, Tuple
+import numpy as np
+from ..config import (
+    DEFAULT_LIMIT,
+    DEFAULT_NPROBES,
+    DEFAULT_REFINE_FACTOR,
+    DEFAULT_SEARCH_BATCH_WORKERS,
+)
+from ..lance_db import connect_db, require_fts_index, scan_fragments
+from .embedding_engine import EmbeddingEngine
+from .query_embedding_cache import QueryEmbeddingCache, get_query_embedding_cache
+from .search_result_cache import (
+    SearchResultCache,
+    get_search_result_cache,
+    search_cache_key,
+)
 
-#TODO: Refactor this so that a new Index isnt created every time; move to search_in_db function
+# Table handles kept open between search_in_db calls, by (db path, table name)
+_open_tables: Dict[Tuple[str, str], Any] = {}
+_open_tables_lock = threading.Lock()
 
-def basic_search(table, query: str, limit: int = 10):
+def _query_embedding_function(table) -> Tuple[Any, str]:
+    """The table's embedding function and the model key it is cached under"""
+    function = table.embedding_functions["vector"].function
+    alias = getattr(
+        function, "__embedding_function_registry_alias__", type(function).__name__
+    )
+    return function, f"{alias}:{getattr(function, 'name', '')}"
+
+
+def embed_query(
+    table, query: str, cache: Optional[QueryEmbeddingCache] = None
+) -> np.ndarray:
+    """
+    Embed a search query with the table's embedding function, through the query
+    embedding cache (the process-wide one unless `cache` is given).
+    """
+    function, model = _query_embedding_function(table)
+    cache = cache or get_query_embedding_cache()
+    return cache.get_or_compute(
+        model, query, lambda text: function.compute_query_embeddings(text)[0]
+    )
+
+
+def embed_queries(
+    table, queries: List[str], cache: Optional[QueryEmbeddingCache] = None
+) -> List[np.ndarray]:
+    """
+    Embed many search queries at once: the ones not in the query embedding cache
+    go through the model together, in length-bucketed batches (see `EmbeddingEngine`).
+    """
+    function, model = _query_embedding_function(table)
+    cache = cache or get_query_embedding_cache()
+    return cache.get_or_compute_many(
+        model, queries, lambda texts: EmbeddingEngine(function).embed(texts)
+    )
+
+
+def tune_vector_query(
+    builder, nprobes: int = DEFAULT_NPROBES, refine_factor: int = DEFAULT_REFINE_FACTOR
+):
+    """
+    Set the ANN recall/latency knobs on a vector or hybrid query: the number of IVF
+    partitions probed, and re-ranking refine_factor x limit candidates with exact
+    distances (0 = off). Both are ignored while the table has no vector index.
+    """
+    builder = builder.nprobes(nprobes)
+    if refine_factor > 0:
+        builder = builder.refine_factor(refine_factor)
+    return builder
+
+def filter_query(builder, where: Optional[str] = None):
+    """
+    Restrict a query to rows matching a SQL filter such as "section = 'Impression:'"
+    or "report_id IN ('a.txt', 'b.txt')". The filter is applied before the search
+    (prefilter), through the report_id/section indices, so `limit` results are
+    returned whenever that many rows match.
+    """
+    return builder.where(where, prefilter=True) if where else builder
+
+def basic_search(table, query: str, limit: int = 10, where: Optional[str] = None):
     """
     Perform a basic full-text search.
     """
-    # If needed, create or replace an FTS index:
-    table.create_fts_index("text", use_tantivy=False, replace=True)
-    return table.search(query).limit(limit).to_list()
+    # The index is built and extended at ingest time
+    require_fts_index(table)
+    return (
+        filter_query(table.search(query, query_type="fts"), where)
+        .limit(limit)
+        .to_list()
+    )
 
-def hybrid_search(table, query: str, limit: int = 10):
+def hybrid_search(
+    table,
+    query: str,
+    limit: int = 10,
+    nprobes: int = DEFAULT_NPROBES,
+    refine_factor: int = DEFAULT_REFINE_FACTOR,
+    where: Optional[str] = None,
+):
     """
     Perform a hybrid (keyword + vector) search.
     """
-    return table.search(query, query_type="hybrid").limit(limit).to_list()
+    require_fts_index(table)
+    return hybrid_query(
+        table, query, embed_query(table, query), limit, nprobes, refine_factor, where
+    )
+
+def hybrid_query(
+    table,
+    query: str,
+    vector: np.ndarray,
+    limit: int = 10,
+    nprobes: int = DEFAULT_NPROBES,
+    refine_factor: int = DEFAULT_REFINE_FACTOR,
+    where: Optional[str] = None,
+):
+    """
+    Hybrid search with an already embedded query (the FTS index must be current).
+    """
+    builder = tune_vector_query(
+        table.search(query_type="hybrid").vector(vector).text(query),
+        nprobes,
+        refine_factor,
+    )
+    return filter_query(builder, where).limit(limit).to_list()
 
-def vector_search(table, query: str, limit: int = 10):
+def vector_search(
+    table,
+    query: str,
+    limit: int = 10,
+    nprobes: int = DEFAULT_NPROBES,
+    refine_factor: int = DEFAULT_REFINE_FACTOR,
+    where: Optional[str] = None,
+):
     """
     Perform a vector-based semantic search.
     """
-    return table.search(query, query_type="vector").limit(limit).to_list()
+    return vector_query(
+        table, embed_query(table, query), limit, nprobes, refine_factor, where
+    )
+
+def vector_query(
+    table,
+    vector: np.ndarray,
+    limit: int = 10,
+    nprobes: int = DEFAULT_NPROBES,
+    refine_factor: int = DEFAULT_REFINE_FACTOR,
+    where: Optional[str] = None,
+):
+    """
+    Nearest-neighbour search for an already embedded query.
+    """
+    builder = tune_vector_query(
+        table.search(vector, query_type="vector"), nprobes, refine_factor
+    )
+    return filter_query(builder, where).limit(limit).to_list()
 
 def find_fragments_containing_text(table, search_text: str):
     """
     Example of filtering the entire table by a substring match (case-insensitive).
     """
-    df = table.to_pandas()
+    df = scan_fragments(table, columns=['text', 'section']).to_pandas()
     filtered = df[df['text'].str.contains(search_text, case=False, na=False)]
     return filtered[['text', 'section']]
 
-def search_in_db(db_path: str, table_name: str, query_str: str, mode: str = "basic"):
+def open_latest_table(db_path: str, table_name: str):
+    """
+    Open a table once per process and move the handle to the table's latest version
+    on every later call, so repeated searches skip connecting and opening the table.
+    """
+    key = (os.path.abspath(db_path), table_name)
+    with _open_tables_lock:
+        table = _open_tables.get(key)
+        if table is not None:
+            try:
+                table.checkout_latest()
+                return table
+            except Exception:
+                # Dropped or replaced since it was opened
+                del _open_tables[key]
+        table = connect_db(db_path).open_table(table_name)
+        _open_tables[key] = table
+        return table
+
+def search_in_db(
+    db_path: str,
+    table_name: str,
+    query_str: str,
+    mode: str = "basic",
+    limit: int = DEFAULT_LIMIT,
+    nprobes: int = DEFAULT_NPROBES,
+    refine_factor: int = DEFAULT_REFINE_FACTOR,
+    cache: Optional[SearchResultCache] = None,
+    where: Optional[str] = None,
+):
     """
     High-level function to connect to DB, run a search, and return results.
+    `nprobes` and `refine_factor` tune vector and hybrid searches (see
+    `tune_vector_query`); `where` restricts any search to matching fragments (see
+    `filter_query`).
+
+    Results are cached (in the process-wide result cache unless `cache` is given)
+    under the table version, so they are served from memory until the table changes.
     """
-    db = connect_db(db_path)
-    table = db.open_table(table_name)
+    table = open_latest_table(db_path, table_name)
+    if mode in ("basic", "hybrid"):
+        require_fts_index(table)
+    cache = cache or get_search_result_cache()
+    key = search_cache_key(
+        table,
+        query=query_str,
+        mode=mode,
+        limit=limit,
+        nprobes=nprobes,
+        refine_factor=refine_factor,
+        where=where,
+    )
+    results = cache.get(key)
+    if results is None:
+        results = run_search(
+            table, query_str, mode, limit, nprobes, refine_factor, where
+        )
+        cache.put(key, results)
+    return results
 
+def run_search(
+    table,
+    query_str: str,
+    mode: str = "basic",
+    limit: int = DEFAULT_LIMIT,
+    nprobes: int = DEFAULT_NPROBES,
+    refine_factor: int = DEFAULT_REFINE_FACTOR,
+    where: Optional[str] = None,
+):
+    """
+    Run a search of the given mode on an open table.
+    """
     if mode == "basic":
-        return basic_search(table, query_str)
+        return basic_search(table, query_str, limit, where)
     elif mode == "hybrid":
-        return hybrid_search(table, query_str)
+        return hybrid_search(table, query_str, limit, nprobes, refine_factor, where)
     elif mode == "vector":
-        return vector_search(table, query_str)
+        return vector_search(table, query_str, limit, nprobes, refine_factor, where)
     else:
         raise ValueError(f"Unknown search mode: {mode}")
 
-def compare_search_methods(table, query: str, limit: int = 5):
+def search_many(
+    table,
+    queries: List[str],
+    mode: str = "basic",
+    limit: int = DEFAULT_LIMIT,
+    nprobes: int = DEFAULT_NPROBES,
+    refine_factor: int = DEFAULT_REFINE_FACTOR,
+    max_workers: int = DEFAULT_SEARCH_BATCH_WORKERS,
+    query_cache: Optional[QueryEmbeddingCache] = None,
+    result_cache: Optional[SearchResultCache] = None,
+    where: Optional[str] = None,
+) -> Dict[str, List[Dict[str, Any]]]:
     """
-    Compare results from different search methods for debugging.
+    Run the same kind of search for many queries on an open table.
+
+    Results already in the result cache are reused; the remaining queries are
+    embedded together in one batched pass (vector and hybrid modes) and looked up
+    on `max_workers` threads. `where` restricts every query (see `filter_query`).
+
+    Returns:
+        Results of each distinct query, keyed by query string, in input order
     """
-    # Create fresh FTS index for basic search
-    table.create_fts_index("text", use_tantivy=False, replace=True)
+    if mode not in ("basic", "vector", "hybrid"):
+        raise ValueError(f"Unknown search mode: {mode}")
+    result_cache = result_cache or get_search_result_cache()
+    if mode in ("basic", "hybrid"):
+        require_fts_index(table)
 
-    
+    keys = {
+        query: search_cache_key(
+            table,
+            query=query,
+            mode=mode,
+            limit=limit,
+            nprobes=nprobes,
+            refine_factor=refine_factor,
+            where=where,
+        )
+        for query in dict.fromkeys(queries)
+    }
+    results: Dict[str, List[Dict[str, Any]]] = {}
+    for query, key in keys.items():
+        cached = result_cache.get(key)
+        if cached is not None:
+            results[query] = cached
+
+    pending = [query for query in keys if query not in results]
+    if pending:
+        if mode == "basic":
+            vectors = [None] * len(pending)
+        else:
+            vectors = embed_queries(table, pending, query_cache)
+
+        def lookup(query: str, vector: Optional[np.ndarray]) -> List[Dict[str, Any]]:
+            if mode == "basic":
+                return (
+                    filter_query(table.search(query, query_type="fts"), where)
+                    .limit(limit)
+                    .to_list()
+                )
+            if mode == "vector":
+                return vector_query(table, vector, limit, nprobes, refine_factor, where)
+            return hybrid_query(
+                table, query, vector, limit, nprobes, refine_factor, where
+            )
+
+        with ThreadPoolExecutor(
+            max_workers=max(1, min(max_workers, len(pending)))
+        ) as executor:
+            for query, found in zip(pending, executor.map(lookup, pending, vectors)):
+                result_cache.put(keys[query], found)
+                results[query] = found
 
+    return {query: results[query] for query in keys}
+
+def search_many_in_db(
+    db_path: str,
+    table_name: str,
+    queries: List[str],
+    mode: str = "basic",
+    limit: int = DEFAULT_LIMIT,
+    nprobes: int = DEFAULT_NPROBES,
+    refine_factor: int = DEFAULT_REFINE_FACTOR,
+    max_workers: int = DEFAULT_SEARCH_BATCH_WORKERS,
+    where: Optional[str] = None,
+) -> Dict[str, List[Dict[str, Any]]]:
+    """
+    `search_many` on the latest version of a table, like `search_in_db` for one query.
+    """
+    table = open_latest_table(db_path, table_name)
+    return search_many(
+        table, queries, mode, limit, nprobes, refine_factor, max_workers, where=where
+    )
+
+def compare_search_methods(table, query: str, limit: int = 5):
+    """
+    Compare results from different search methods for debugging.
+    """
+    require_fts_index(table)
 
     # Perform searches
-    basic_results = table.search(query).limit(limit).to_list()
-    vector_results = table.search(query, query_type="vector").limit(limit).to_list()
-    
+    basic_results = table.search(query, query_type="fts").limit(limit).to_list()
+    vector_results = (
+        table.search(embed_query(table, query), query_type="vector")
+        .limit(limit)
+        .to_list()
+    )
+
     print(f"\nSearch Query: '{query}'\n")
     
     # Compare result sets
@@ -93,8 +387,12 @@ def compare_search_methods(table, query: str, limit: int = 5):
     
     # Test semantic understanding with a variation of the original query
     semantic_query = f"complications related to {query}"  # Semantic variation of user query
-    semantic_results = table.search(semantic_query, query_type="vector").limit(limit).to_list()
-    
+    semantic_results = (
+        table.search(embed_query(table, semantic_query), query_type="vector")
+        .limit(limit)
+        .to_list()
+    )
+
     print(f"\nSemantic query test: '{semantic_query}'")
     for r in semantic_results:
         print(f"Distance: {r.get('_distance', 'N/A')}")
@@ -0,0 +1,141 @@
+import sys
+import threading
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional, Tuple
+
+from ..config import DEFAULT_SEARCH_CACHE_MAX_ENTRIES, DEFAULT_SEARCH_CACHE_MAX_BYTES
+
+
+def search_cache_key(table, **params: Any) -> Tuple:
+    """
+    Cache key of a search on `table`: the dataset URI and version plus every search
+    parameter (query, mode, limit, filters, ...). Any write to the table creates a new
+    version, so a cached result can never outlive the data it was computed from.
+    """
+    return (table._dataset_uri, table.version, tuple(sorted(params.items())))
+
+
+def estimate_size(value: Any) -> int:
+    """Approximate memory held by a search result (rows of str/float/list values)"""
+    if isinstance(value, dict):
+        return sys.getsizeof(value) + sum(
+            estimate_size(k) + estimate_size(v) for k, v in value.items()
+        )
+    if isinstance(value, (list, tuple)):
+        return sys.getsizeof(value) + sum(estimate_size(item) for item in value)
+    return sys.getsizeof(value)
+
+
+class SearchResultCache:
+    """
+    In-memory LRU cache of search results keyed by `search_cache_key`.
+
+    Bounded by both `max_entries` and `max_bytes` (estimated); the least recently
+    used results are evicted first. When a newer version of a table is seen, the
+    entries of its older versions are dropped straight away since they can no
+    longer be hit. Cached result lists are shared between callers and must not be
+    modified.
+    """
+
+    def __init__(
+        self,
+        max_entries: int = DEFAULT_SEARCH_CACHE_MAX_ENTRIES,
+        max_bytes: int = DEFAULT_SEARCH_CACHE_MAX_BYTES,
+    ):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.invalidations = 0
+        self.bytes = 0
+        self._entries: "OrderedDict[Tuple, Tuple[List[Dict[str, Any]], int]]" = (
+            OrderedDict()
+        )
+        self._latest_versions: Dict[str, int] = {}
+        self._lock = threading.Lock()
+
+    def get(self, key: Tuple) -> Optional[List[Dict[str, Any]]]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[0]
+
+    def _drop(self, key: Tuple) -> None:
+        _, size = self._entries.pop(key)
+        self.bytes -= size
+
+    def _invalidate_older_versions(self, uri: str, version: int) -> None:
+        latest = self._latest_versions.get(uri)
+        if latest is not None and version <= latest:
+            return
+        self._latest_versions[uri] = version
+        if latest is None:
+            return
+        stale = [key for key in self._entries if key[0] == uri and key[1] < version]
+        for key in stale:
+            self._drop(key)
+        self.invalidations += len(stale)
+
+    def put(self, key: Tuple, results: List[Dict[str, Any]]) -> None:
+        if self.max_entries <= 0:
+            return
+        size = estimate_size(results)
+        if size > self.max_bytes:
+            return
+        with self._lock:
+            uri, version, _ = key
+            self._invalidate_older_versions(uri, version)
+            if version < self._latest_versions[uri]:
+                # Computed from a version that has been superseded meanwhile
+                return
+            if key in self._entries:
+                self._drop(key)
+            self._entries[key] = (results, size)
+            self.bytes += size
+            while len(self._entries) > self.max_entries or self.bytes > self.max_bytes:
+                self._drop(next(iter(self._entries)))
+                self.evictions += 1
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._latest_versions.clear()
+            self.bytes = 0
+
+    @property
+    def hit_rate(self) -> float:
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
+
+    def stats(self) -> Dict[str, Any]:
+        """Size, limits and hit/miss counters for reporting"""
+        with self._lock:
+            return {
+                "entries": len(self._entries),
+                "bytes": self.bytes,
+                "max_entries": self.max_entries,
+                "max_bytes": self.max_bytes,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": self.hit_rate,
+                "evictions": self.evictions,
+                "invalidations": self.invalidations,
+            }
+
+
+_shared_cache: Optional[SearchResultCache] = None
+_shared_cache_lock = threading.Lock()
+
+
+def get_search_result_cache() -> SearchResultCache:
+    """The search result cache shared by every search in this process"""
+    global _shared_cache
+    with _shared_cache_lock:
+        if _shared_cache is None:
+            _shared_cache = SearchResultCache()
+        return _shared_cache
@@ -1,10 +1,27 @@
 from typing import List, Dict, Any, Optional
 import pandas as pd
-from ..lance_db import connect_db
+from ..lance_db import require_fts_index, scan_fragments
+from .search import (
+    embed_query,
+    filter_query,
+    hybrid_query,
+    open_latest_table,
+    search_many,
+    vector_query,
+)
+from .query_embedding_cache import QueryEmbeddingCache, get_query_embedding_cache
+from .search_result_cache import (
+    SearchResultCache,
+    get_search_result_cache,
+    search_cache_key,
+)
 from ..config import (
     DEFAULT_DB_PATH, 
     DEFAULT_TABLE_NAME,
-    DEFAULT_LIMIT
+    DEFAULT_LIMIT,
+    DEFAULT_NPROBES,
+    DEFAULT_REFINE_FACTOR,
+    DEFAULT_SEARCH_BATCH_WORKERS
 )
 
 class SearchService:
@@ -14,39 +31,73 @@ class SearchService:
     consistent interface for both the API and CLI.
     """
     
-    def __init__(self, db_path: str = DEFAULT_DB_PATH, table_name: str = DEFAULT_TABLE_NAME):
-        """Initialize the search service with database connection details"""
+    def __init__(
+        self,
+        db_path: str = DEFAULT_DB_PATH,
+        table_name: str = DEFAULT_TABLE_NAME,
+        query_cache: Optional[QueryEmbeddingCache] = None,
+        result_cache: Optional[SearchResultCache] = None
+    ):
+        """
+        Initialize the search service with database connection details.
+        Query embeddings are cached in `query_cache` and search results in
+        `result_cache`, by default the caches shared by every search in the process.
+        """
         self.db_path = db_path
         self.table_name = table_name
-        self.db = None
-        self.table = None
+        self.query_cache = query_cache or get_query_embedding_cache()
+        self.result_cache = result_cache or get_search_result_cache()
         
     def _ensure_connection(self):
-        """Ensure connection to the database and table"""
-        if self.db is None:
-            self.db = connect_db(self.db_path)
-        if self.table is None:
-            self.table = self.db.open_table(self.table_name)
-        return self.table
-    
-    def search_basic(self, query: str, limit: int = DEFAULT_LIMIT) -> List[Dict[str, Any]]:
-        """Perform a basic full-text search"""
-        table = self._ensure_connection()
-        # Create or replace an FTS index
-        table.create_fts_index("text", use_tantivy=False, replace=True)
-        return table.search(query).limit(limit).to_list()
-    
-    def search_vector(self, query: str, limit: int = DEFAULT_LIMIT) -> List[Dict[str, Any]]:
-        """Perform a vector-based semantic search"""
-        table = self._ensure_connection()
-        return table.search(query, query_type="vector").limit(limit).to_list()
+        """
+        The table at its latest version, so searches (and result cache keys) see
+        reports ingested since the previous call
+        """
+        return open_latest_table(self.db_path, self.table_name)
+
+    def search_basic(
+        self, query: str, limit: int = DEFAULT_LIMIT, where: Optional[str] = None
+    ) -> List[Dict[str, Any]]:
+        """Perform a basic full-text search (results cached as in `search`)"""
+        return self._cached_search(
+            query, "basic", limit, DEFAULT_NPROBES, DEFAULT_REFINE_FACTOR, where
+        )
+
+    def search_vector(
+        self,
+        query: str,
+        limit: int = DEFAULT_LIMIT,
+        nprobes: int = DEFAULT_NPROBES,
+        refine_factor: int = DEFAULT_REFINE_FACTOR,
+        where: Optional[str] = None
+    ) -> List[Dict[str, Any]]:
+        """Perform a vector-based semantic search (results cached as in `search`)"""
+        return self._cached_search(
+            query, "vector", limit, nprobes, refine_factor, where
+        )
     
-    def search_hybrid(self, query: str, limit: int = DEFAULT_LIMIT) -> List[Dict[str, Any]]:
-        """Perform a hybrid (keyword + vector) search"""
-        table = self._ensure_connection()
-        return table.search(query, query_type="hybrid").limit(limit).to_list()
+    def search_hybrid(
+        self,
+        query: str,
+        limit: int = DEFAULT_LIMIT,
+        nprobes: int = DEFAULT_NPROBES,
+        refine_factor: int = DEFAULT_REFINE_FACTOR,
+        where: Optional[str] = None
+    ) -> List[Dict[str, Any]]:
+        """Perform a hybrid (keyword + vector) search (results cached as in `search`)"""
+        return self._cached_search(
+            query, "hybrid", limit, nprobes, refine_factor, where
+        )
     
-    def search(self, query: str, mode: str = "basic", limit: int = DEFAULT_LIMIT) -> List[Dict[str, Any]]:
+    def search(
+        self,
+        query: str,
+        mode: str = "basic",
+        limit: int = DEFAULT_LIMIT,
+        nprobes: int = DEFAULT_NPROBES,
+        refine_factor: int = DEFAULT_REFINE_FACTOR,
+        where: Optional[str] = None
+    ) -> List[Dict[str, Any]]:
         """
         High-level search function that determines which search method to use based on mode.
         
@@ -54,18 +105,97 @@ class SearchService:
             query: The search query string
             mode: Search mode - "basic", "vector", or "hybrid"
             limit: Maximum number of results to return
+            nprobes: Vector index partitions probed (vector and hybrid modes)
+            refine_factor: Re-rank refine_factor x limit candidates with exact
+                distances (vector and hybrid modes; 0 = off)
+            where: Optional SQL filter applied before the search, e.g.
+                "section = 'Impression:'" or "report_id IN ('a.txt', 'b.txt')"
             
         Returns:
-            List of matching documents
+            List of matching documents, cached until the table version changes
+            (shared with other callers, so not to be modified)
         """
+        if mode not in ("basic", "vector", "hybrid"):
+            raise ValueError(f"Unknown search mode: {mode}")
+        return self._cached_search(query, mode, limit, nprobes, refine_factor, where)
+
+    def _cached_search(
+        self,
+        query: str,
+        mode: str,
+        limit: int,
+        nprobes: int,
+        refine_factor: int,
+        where: Optional[str]
+    ) -> List[Dict[str, Any]]:
+        """Run one search mode against the latest table version, through the cache"""
+        table = self._ensure_connection()
+        if mode in ("basic", "hybrid"):
+            # The index is built and extended at ingest time
+            require_fts_index(table)
+        key = search_cache_key(
+            table,
+            query=query,
+            mode=mode,
+            limit=limit,
+            nprobes=nprobes,
+            refine_factor=refine_factor,
+            where=where,
+        )
+        results = self.result_cache.get(key)
+        if results is not None:
+            return results
+
+        # Search the same table version the cache key was computed from
         if mode == "basic":
-            return self.search_basic(query, limit)
+            results = (
+                filter_query(table.search(query, query_type="fts"), where)
+                .limit(limit)
+                .to_list()
+            )
         elif mode == "vector":
-            return self.search_vector(query, limit)
-        elif mode == "hybrid":
-            return self.search_hybrid(query, limit)
+            vector = embed_query(table, query, self.query_cache)
+            results = vector_query(table, vector, limit, nprobes, refine_factor, where)
         else:
-            raise ValueError(f"Unknown search mode: {mode}")
+            vector = embed_query(table, query, self.query_cache)
+            results = hybrid_query(
+                table, query, vector, limit, nprobes, refine_factor, where
+            )
+        self.result_cache.put(key, results)
+        return results
+
+    def search_many(
+        self,
+        queries: List[str],
+        mode: str = "basic",
+        limit: int = DEFAULT_LIMIT,
+        nprobes: int = DEFAULT_NPROBES,
+        refine_factor: int = DEFAULT_REFINE_FACTOR,
+        max_workers: int = DEFAULT_SEARCH_BATCH_WORKERS,
+        where: Optional[str] = None
+    ) -> Dict[str, List[Dict[str, Any]]]:
+        """
+        Search for many queries in one call, e.g. a list of finding names or synonyms.
+
+        Queries are embedded in one batched forward pass and the index lookups run
+        concurrently on `max_workers` threads; cached results are reused. `where`
+        restricts every query, as in `search`.
+
+        Returns:
+            Results of each distinct query, keyed by query string
+        """
+        return search_many(
+            self._ensure_connection(),
+            queries,
+            mode,
+            limit,
+            nprobes,
+            refine_factor,
+            max_workers,
+            query_cache=self.query_cache,
+            result_cache=self.result_cache,
+            where=where,
+        )
     
     def find_fragments_containing_text(self, search_text: str) -> pd.DataFrame:
         """
@@ -75,7 +205,7 @@ class SearchService:
             DataFrame with matching fragments
         """
         table = self._ensure_connection()
-        df = table.to_pandas()
+        df = scan_fragments(table, columns=['text', 'section']).to_pandas()
         filtered = df[df['text'].str.contains(search_text, case=False, na=False)]
         return filtered[['text', 'section']]
     
@@ -88,20 +218,27 @@ class SearchService:
         """
         table = self._ensure_connection()
         
-        # Create fresh FTS index for basic search
-        table.create_fts_index("text", use_tantivy=False, replace=True)
+        require_fts_index(table)
         
         # Perform searches
-        basic_results = table.search(query).limit(limit).to_list()
-        vector_results = table.search(query, query_type="vector").limit(limit).to_list()
-        
+        basic_results = table.search(query, query_type="fts").limit(limit).to_list()
+        vector_results = (
+            table.search(
+                embed_query(table, query, self.query_cache), query_type="vector"
+            )
+            .limit(limit)
+            .to_list()
+        )
+
         # Extract text for comparison
         basic_texts = {r['text'] for r in basic_results}
         vector_texts = {r['text'] for r in vector_results}
         
         # Test semantic understanding with a variation of the original query
         semantic_query = f"complications related to {query}"
-        semantic_results = table.search(semantic_query, query_type="vector").limit(limit).to_list()
+        semantic_results = table.search(
+            embed_query(table, semantic_query, self.query_cache), query_type="vector"
+        ).limit(limit).to_list()
         
         return {
             "query": query,
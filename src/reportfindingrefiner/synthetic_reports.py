@@ -0,0 +1,162 @@
+import os
+import gzip
+import json
+import random
+from typing import Dict, Iterable, Iterator, List, Tuple
+from pydantic import BaseModel
+
+from .data_models import Report
+
+EXAMS = [
+    "CT abdomen and pelvis with contrast",
+    "CT chest without contrast",
+    "MRI brain with and without contrast",
+    "MRI lumbar spine without contrast",
+    "Ultrasound abdomen complete",
+    "Chest radiograph, two views",
+]
+ORGANS = [
+    "Liver",
+    "Gallbladder",
+    "Spleen",
+    "Pancreas",
+    "Adrenals",
+    "Kidneys",
+    "Bladder",
+    "Bowel",
+    "Lungs",
+    "Pleura",
+    "Heart",
+    "Mediastinum",
+    "Lymph nodes",
+    "Bones",
+    "Soft tissues",
+]
+STATEMENTS = [
+    "Normal in size and attenuation.",
+    "No focal lesion identified.",
+    "Unremarkable.",
+    "Mild diffuse fatty infiltration.",
+    "Small simple cyst, likely benign.",
+    "No acute abnormality.",
+    "Subcentimeter hypodensity, too small to characterize.",
+    "Postsurgical changes without evidence of recurrence.",
+    "Stable compared with the prior examination.",
+    "Scattered calcifications, likely sequela of prior granulomatous disease.",
+    "No free fluid or free air.",
+    "Mild degenerative changes.",
+    "Recommend follow-up imaging in 6 months.",
+    "Findings are otherwise within normal limits.",
+]
+_STUDY_PLACEHOLDER = "{study}"
+
+
+class SyntheticCorpusSpec(BaseModel):
+    """
+    Shape of a synthetic radiology report corpus.
+
+    `section_mix` maps each section heading to the probability that a report has it,
+    in report order; sections listed in `subsection_headings` get one "Organ: text"
+    line per finding, the others a single paragraph. Fragment lengths are drawn
+    uniformly from `fragment_words`. A `duplication_rate` share of reports re-use an
+    earlier report's text with a new study number, like templated normal reports.
+    """
+    count: int = 10000
+    seed: int = 0
+    section_mix: Dict[str, float] = {
+        "Header:": 0.9,
+        "Findings:": 1.0,
+        "Impression:": 0.95,
+    }
+    subsection_headings: List[str] = ["Findings:"]
+    findings_per_report: Tuple[int, int] = (3, 8)
+    fragment_words: Tuple[int, int] = (4, 24)
+    duplication_rate: float = 0.0
+    duplicate_pool_size: int = 1000  # earlier reports kept as duplication sources
+
+
+def _fragment_text(rng: random.Random, words: int) -> str:
+    """Statements joined until the text has about `words` words"""
+    parts: List[str] = []
+    count = 0
+    while count < words:
+        statement = rng.choice(STATEMENTS)
+        parts.append(statement)
+        count += len(statement.split())
+    return " ".join(" ".join(parts).split()[:words])
+
+
+def make_synthetic_report(
+    rng: random.Random, spec: SyntheticCorpusSpec, study: object
+) -> str:
+    """Build the text of one synthetic report"""
+    lines = []
+    for heading, probability in spec.section_mix.items():
+        if rng.random() >= probability:
+            continue
+        if heading in spec.subsection_headings:
+            lines.append(heading)
+            organs = rng.sample(
+                ORGANS, k=min(len(ORGANS), rng.randint(*spec.findings_per_report))
+            )
+            for organ in organs:
+                lines.append(
+                    f"{organ}: {_fragment_text(rng, rng.randint(*spec.fragment_words))}"
+                )
+        elif heading == "Header:":
+            lines.append(f"{heading} {rng.choice(EXAMS)}, study {study}.")
+        else:
+            lines.append(
+                f"{heading} {_fragment_text(rng, rng.randint(*spec.fragment_words))}"
+            )
+    return "\n".join(lines) + "\n"
+
+
+def generate_synthetic_reports(spec: SyntheticCorpusSpec) -> Iterator[Report]:
+    """
+    Yield `spec.count` synthetic reports, reproducibly for a given seed. Reports are
+    generated one at a time, so corpora larger than memory can be streamed.
+    """
+    rng = random.Random(spec.seed)
+    # Reports are kept with a placeholder study number, filled in per copy
+    pool: List[str] = []
+    for i in range(spec.count):
+        if pool and rng.random() < spec.duplication_rate:
+            # Same report, new study number: identical fragments apart from the header
+            template = rng.choice(pool)
+        else:
+            template = make_synthetic_report(rng, spec, _STUDY_PLACEHOLDER)
+            if len(pool) < spec.duplicate_pool_size:
+                pool.append(template)
+            else:
+                pool[rng.randrange(spec.duplicate_pool_size)] = template
+        yield Report(
+            id=f"synthetic_{i:07d}.txt",
+            text=template.replace(_STUDY_PLACEHOLDER, str(i)),
+        )
+
+
+def write_synthetic_reports(reports: Iterable[Report], path: str) -> int:
+    """
+    Write reports to a .jsonl or .jsonl.gz file ({"id", "text"} per line), or as
+    one .txt file per report into a folder.
+
+    Returns:
+        Number of reports written
+    """
+    written = 0
+    if path.endswith((".jsonl", ".jsonl.gz")):
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        opener = gzip.open if path.endswith(".gz") else open
+        with opener(path, "wt", encoding="utf-8") as f:
+            for report in reports:
+                f.write(json.dumps({"id": report.id, "text": report.text}) + "\n")
+                written += 1
+        return written
+
+    os.makedirs(path, exist_ok=True)
+    for report in reports:
+        with open(os.path.join(path, report.id), "w", encoding="utf-8") as f:
+            f.write(report.text)
+        written += 1
+    return written
@@ -0,0 +1,110 @@
+from typing import List, Optional, Tuple
+from .config import (
+    DEFAULT_CHUNK_MAX_TOKENS,
+    DEFAULT_CHUNK_MIN_TOKENS,
+    DEFAULT_CHUNK_OVERLAP_TOKENS,
+)
+
+# Tokenizers without a real limit report a huge model_max_length
+_UNBOUNDED_MODEL_LENGTH = 1_000_000
+
+
+class TokenBudgetChunker:
+    """
+    Re-chunks (section_label, text) fragments so each one fits the embedding model.
+
+    Lengths are measured with the embedding model's own tokenizer. Consecutive
+    fragments of the same section are merged while one of them is shorter than
+    `min_tokens` and the result stays within `max_tokens`; fragments longer than
+    `max_tokens` are cut into windows of `max_tokens` that overlap by
+    `overlap_tokens`. Windows are sliced out of the original text by token offsets,
+    and fragments never cross a section boundary, so sequence numbers assigned
+    afterwards still follow the report's reading order.
+    """
+
+    def __init__(
+        self,
+        tokenizer,
+        max_tokens: int = DEFAULT_CHUNK_MAX_TOKENS,
+        min_tokens: int = DEFAULT_CHUNK_MIN_TOKENS,
+        overlap_tokens: int = DEFAULT_CHUNK_OVERLAP_TOKENS,
+        merge_separator: str = "\n",
+    ):
+        model_max_length = getattr(tokenizer, "model_max_length", None)
+        if model_max_length and model_max_length < _UNBOUNDED_MODEL_LENGTH:
+            max_tokens = min(max_tokens, model_max_length)
+        # Budget for the text itself; the engine adds e.g. [CLS]/[SEP] around it
+        self.max_tokens = max_tokens - tokenizer.num_special_tokens_to_add()
+        if self.max_tokens <= 0:
+            raise ValueError(f"max_tokens ({max_tokens}) leaves no room for text")
+        if not 0 <= overlap_tokens < self.max_tokens:
+            raise ValueError(
+                f"overlap_tokens ({overlap_tokens}) must be below max_tokens "
+                f"({self.max_tokens})"
+            )
+        self.tokenizer = tokenizer
+        self.min_tokens = min_tokens
+        self.overlap_tokens = overlap_tokens
+        self.merge_separator = merge_separator
+
+    def _split_oversize(
+        self, label: Optional[str], text: str, offsets: List[Tuple[int, int]]
+    ) -> List[Tuple[Optional[str], str, int]]:
+        """Cut a fragment into overlapping windows of at most max_tokens"""
+        windows = []
+        step = self.max_tokens - self.overlap_tokens
+        for start in range(0, len(offsets), step):
+            window = offsets[start:start + self.max_tokens]
+            windows.append(
+                (label, text[window[0][0] : window[-1][1]].strip(), len(window))
+            )
+            if start + self.max_tokens >= len(offsets):
+                break
+        return windows
+
+    def chunk(
+        self, fragments: List[Tuple[Optional[str], str]]
+    ) -> List[Tuple[Optional[str], str]]:
+        """
+        Merge undersized and split oversize fragments of one report.
+
+        Args:
+            fragments: (section_label, text) fragments in reading order
+
+        Returns:
+            (section_label, text) fragments of at most max_tokens tokens each
+        """
+        if not fragments:
+            return fragments
+
+        # One tokenizer call for the whole report
+        encodings = self.tokenizer(
+            [text for _, text in fragments],
+            add_special_tokens=False,
+            return_offsets_mapping=True,
+        )
+
+        pieces: List[Tuple[Optional[str], str, int]] = []
+        for (label, text), offsets in zip(fragments, encodings["offset_mapping"]):
+            if len(offsets) > self.max_tokens:
+                pieces.extend(self._split_oversize(label, text, offsets))
+            else:
+                pieces.append((label, text, len(offsets)))
+
+        chunks: List[Tuple[Optional[str], str]] = []
+        current_label, current_text, current_tokens = pieces[0]
+        for label, text, tokens in pieces[1:]:
+            if (
+                label == current_label
+                and min(current_tokens, tokens) < self.min_tokens
+                # Merged token counts can differ slightly at the
+                # seam; keep one token spare
+                and current_tokens + tokens < self.max_tokens
+            ):
+                current_text = current_text + self.merge_separator + text
+                current_tokens += tokens
+            else:
+                chunks.append((current_label, current_text))
+                current_label, current_text, current_tokens = label, text, tokens
+        chunks.append((current_label, current_text))
+        return chunks
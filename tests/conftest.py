@@ -0,0 +1,99 @@
+import os
+import zlib
+from typing import List
+
+import numpy as np
+import pytest
+from lancedb.embeddings import TextEmbeddingFunction
+from lancedb.embeddings.registry import register
+
+from reportfindingrefiner import data_models
+from reportfindingrefiner.config import (
+    DEFAULT_EMBEDDING_BACKEND,
+    DEFAULT_EMBEDDING_MODEL,
+)
+from reportfindingrefiner.services import ingestion, report_service
+from reportfindingrefiner.services.report_service import ReportService
+
+NDIMS = 16
+
+
+@register("test-hashing")
+class HashingEmbeddingFunction(TextEmbeddingFunction):
+    """
+    Hashed bag-of-words vectors: deterministic and instant, so tests need no model
+    """
+
+    name: str = "hashing"
+
+    def ndims(self) -> int:
+        return NDIMS
+
+    def generate_embeddings(self, texts) -> List[np.ndarray]:
+        vectors = []
+        for text in texts:
+            vector = np.zeros(NDIMS, dtype=np.float32)
+            for word in text.lower().split():
+                vector[zlib.crc32(word.encode("utf-8")) % NDIMS] += 1.0
+            vectors.append(vector)
+        return vectors
+
+
+class HashingEngine:
+    """Stands in for EmbeddingEngine, which runs a transformers model"""
+
+    tokenizer = None
+
+    def __init__(self, embed_fcn=None, **kwargs):
+        self.embed_fcn = embed_fcn or data_models.get_embedding_function()
+
+    def embed(self, texts: List[str]) -> List[np.ndarray]:
+        return self.embed_fcn.compute_source_embeddings(list(texts))
+
+
+@pytest.fixture(autouse=True)
+def hashing_embeddings(monkeypatch):
+    """Embed with `HashingEmbeddingFunction` instead of the configured model"""
+    monkeypatch.setitem(
+        data_models._embedding_functions,
+        (DEFAULT_EMBEDDING_BACKEND, DEFAULT_EMBEDDING_MODEL),
+        HashingEmbeddingFunction(),
+    )
+    monkeypatch.setattr(ingestion, "EmbeddingEngine", HashingEngine)
+    monkeypatch.setattr(report_service, "EmbeddingEngine", HashingEngine)
+
+
+@pytest.fixture
+def reports_folder(tmp_path):
+    folder = tmp_path / "reports"
+    folder.mkdir()
+    return folder
+
+
+def write_reports(folder, reports) -> None:
+    """Write {report_id: text} as report files"""
+    for report_id, text in reports.items():
+        with open(os.path.join(folder, report_id), "w", encoding="utf-8") as f:
+            f.write(text)
+
+
+@pytest.fixture
+def service(tmp_path):
+    return ReportService(
+        db_path=str(tmp_path / "lancedb"),
+        table_name="reports",
+        workers=1,
+        use_embedding_cache=False,
+        dedup=False,
+    )
+
+
+@pytest.fixture
+def dedup_service(tmp_path):
+    return ReportService(
+        db_path=str(tmp_path / "lancedb"),
+        table_name="reports",
+        workers=1,
+        use_embedding_cache=False,
+        dedup=True,
+    )
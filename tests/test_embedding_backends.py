@@ -0,0 +1,70 @@
+import numpy as np
+import pytest
+
+pytest.importorskip("onnxruntime")
+pytest.importorskip("onnx")
+transformers = pytest.importorskip("transformers")
+
+from reportfindingrefiner.embedding_backends import (  # noqa: E402
+    OnnxEmbeddingFunction,
+    _OnnxEncoder,
+)
+from reportfindingrefiner.services.embedding_engine import (  # noqa: E402
+    EmbeddingEngine,
+)
+
+TEXTS = [
+    "Impression: no acute finding.",
+    "Findings: liver normal, spleen normal, kidneys normal, no free fluid.",
+    "Lungs clear.",
+]
+
+
+@pytest.fixture(scope="module")
+def tiny_encoder(tmp_path_factory):
+    """A small randomly initialised BERT saved locally, so no download is needed"""
+    path = tmp_path_factory.mktemp("tiny-bert")
+    words = sorted({word for text in TEXTS for word in text.lower().split()})
+    vocab = ["[PAD]", "[UNK]", "[CLS]", "[SEP]", "[MASK]", *words, ".", ",", ":"]
+    (path / "vocab.txt").write_text("\n".join(vocab), encoding="utf-8")
+    transformers.BertTokenizerFast(str(path / "vocab.txt")).save_pretrained(path)
+    config = transformers.BertConfig(
+        vocab_size=len(vocab),
+        hidden_size=32,
+        num_hidden_layers=2,
+        num_attention_heads=2,
+        intermediate_size=64,
+    )
+    transformers.BertModel(config).save_pretrained(path)
+    return OnnxEmbeddingFunction(
+        name=str(path), onnx_path=str(path / "model.onnx"), quantize=False
+    )
+
+
+def test_onnx_source_embeddings_match_the_embedding_engine(tiny_encoder, monkeypatch):
+    calls = []
+    run = _OnnxEncoder.__call__
+    monkeypatch.setattr(
+        _OnnxEncoder,
+        "__call__",
+        lambda self, **inputs: calls.append(1) or run(self, **inputs),
+    )
+
+    vectors = tiny_encoder.compute_source_embeddings(TEXTS)
+
+    # The short texts share one length bucket
+    assert len(calls) == 1
+
+    np.testing.assert_allclose(
+        vectors, EmbeddingEngine(tiny_encoder).embed(TEXTS), rtol=1e-5, atol=1e-6
+    )
+    # Padding in a batch does not change a text's vector
+    for text, vector in zip(TEXTS, vectors):
+        (alone,) = tiny_encoder.compute_source_embeddings([text])
+        np.testing.assert_allclose(vector, alone, rtol=1e-4, atol=1e-5)
+
+
+def test_onnx_query_embedding_matches_source_embedding(tiny_encoder):
+    (query,) = tiny_encoder.compute_query_embeddings(TEXTS[0])
+    (source,) = tiny_encoder.compute_source_embeddings([TEXTS[0]])
+    np.testing.assert_allclose(query, source)
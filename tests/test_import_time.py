@@ -0,0 +1,23 @@
+import importlib.util
+import os
+
+SCRIPT = os.path.join(
+    os.path.dirname(__file__), "..", "scripts", "benchmark_import_time.py"
+)
+
+
+def load_benchmark():
+    spec = importlib.util.spec_from_file_location("benchmark_import_time", SCRIPT)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+def test_imports_within_budget():
+    """
+    The package and its config stay cheap to import (see
+    scripts/benchmark_import_time.py)
+    """
+    benchmark = load_benchmark()
+    over_budget = benchmark.check_budgets(benchmark.DEFAULT_BUDGETS)
+    assert not over_budget, f"Over the import time budget (ms): {over_budget}"
@@ -0,0 +1,119 @@
+from collections import Counter
+from functools import partial
+
+import pytest
+from conftest import HashingEngine, write_reports
+
+from reportfindingrefiner.lance_db import connect_db, open_or_create_fragment_table
+from reportfindingrefiner.section_splitter import SectionSplitter
+from reportfindingrefiner.services.checkpoint import (
+    IngestionCheckpoint,
+    checkpoint_path_for,
+)
+from reportfindingrefiner.services.ingestion import ingest_reports, ingest_source
+from reportfindingrefiner.services.manifest import (
+    IngestionManifest,
+    hash_text,
+    manifest_path_for,
+)
+from reportfindingrefiner.services.report_sources import SourceReport
+
+FIRST = "Findings:\nLiver: normal.\nSpleen: normal.\nImpression: No acute finding."
+SECOND = "Impression: Second copy of the report."
+
+
+def source_of(reports) -> list:
+    """SourceReports without mtimes, as read from JSON Lines or Parquet"""
+    return [
+        SourceReport(report_id, None, lambda text=text: text)
+        for report_id, text in reports
+    ]
+
+
+def fragment_keys(table) -> list:
+    rows = table.to_arrow().select(["report_id", "sequence_number"]).to_pylist()
+    return [(row["report_id"], row["sequence_number"]) for row in rows]
+
+
+@pytest.fixture
+def table(tmp_path):
+    return open_or_create_fragment_table(
+        connect_db(str(tmp_path / "lancedb")), "reports"
+    )
+
+
+@pytest.mark.parametrize("batch_size", [1, 100])
+def test_repeated_report_id_keeps_the_last_copy(table, tmp_path, batch_size):
+    manifest = IngestionManifest(str(tmp_path / "manifest.json"))
+    source = source_of([("r1", FIRST), ("r2", SECOND), ("r1", SECOND)])
+
+    ingest_source(table, source, manifest, SectionSplitter(), batch_size=batch_size)
+
+    keys = fragment_keys(table)
+    assert max(Counter(keys).values()) == 1
+    assert sorted(keys) == [("r1", 0), ("r2", 0)]
+    assert manifest.get("r1").content_hash == hash_text(SECOND)
+    assert manifest.get("r1").fragment_count == 1
+
+
+class Interrupted(Exception):
+    pass
+
+
+def fail_on_call(monkeypatch, owner, name, call) -> None:
+    """Make owner.name raise Interrupted on its `call`-th call"""
+    original = getattr(owner, name)
+    calls = Counter()
+
+    def wrapper(*args, **kwargs):
+        calls[name] += 1
+        if calls[name] == call:
+            raise Interrupted(f"{name} call {call}")
+        return original(*args, **kwargs)
+
+    monkeypatch.setattr(owner, name, wrapper)
+
+
+@pytest.mark.parametrize("stop_in", ["embed", "checkpoint"])
+def test_resumed_ingestion_stores_every_fragment_once(
+    tmp_path, reports_folder, monkeypatch, stop_in
+):
+    write_reports(
+        reports_folder,
+        {f"r{i:02}.txt": f"Impression: Finding number {i}." for i in range(20)},
+    )
+    db_path = str(tmp_path / "lancedb")
+    run = partial(
+        ingest_reports,
+        str(reports_folder),
+        db_path,
+        "reports",
+        batch_size=4,
+        workers=1,
+        use_embedding_cache=False,
+        embed_threads=0,
+    )
+
+    # Stop during the third batch: before it is embedded, or after it is written
+    # but before the checkpoint records it
+    with monkeypatch.context() as patch:
+        if stop_in == "embed":
+            fail_on_call(patch, HashingEngine, "embed", 3)
+        else:
+            fail_on_call(patch, IngestionCheckpoint, "record_batch", 3)
+        with pytest.raises(Interrupted):
+            run()
+    checkpoint = IngestionCheckpoint.load(checkpoint_path_for(db_path, "reports"))
+    assert len(checkpoint.batches) == 2
+
+    run(resume=True)
+
+    table = connect_db(db_path).open_table("reports")
+    keys = fragment_keys(table)
+    assert len(keys) == 20
+    assert max(Counter(keys).values()) == 1
+    assert {report_id for report_id, _ in keys} == {
+        f"r{i:02}.txt" for i in range(20)
+    }
+    assert len(IngestionManifest.load(manifest_path_for(db_path, "reports"))) == 20
+    assert IngestionCheckpoint.load(checkpoint_path_for(db_path, "reports")) is None
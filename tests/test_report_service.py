@@ -0,0 +1,205 @@
+import pytest
+from conftest import HashingEngine, write_reports
+
+from reportfindingrefiner.data_models import Report
+from reportfindingrefiner.services.dedup import NearDuplicateIndex, dedup_index_path_for
+from reportfindingrefiner.services.manifest import IngestionManifest, manifest_path_for
+
+REPORTS = {
+    "a.txt": (
+        "Findings:\nLiver: normal.\nSpleen: normal.\nImpression: No acute finding."
+    ),
+    "b.txt": "Findings:\nLungs: clear.\nImpression: Normal chest.",
+}
+
+
+def load_manifest(service) -> IngestionManifest:
+    path = manifest_path_for(service.db_path, service.table_name)
+    return IngestionManifest.load(path)
+
+
+def stored_report_ids(service) -> set:
+    return {report["report_id"] for report in service.get_all_reports()}
+
+
+def test_folder_reingest_keeps_upserted_reports(service, reports_folder):
+    write_reports(reports_folder, REPORTS)
+    service.ingest_reports(str(reports_folder))
+    service.upsert_reports([Report(id="api-1", text="Impression: Added over the API.")])
+
+    service.ingest_reports(str(reports_folder))
+
+    assert stored_report_ids(service) == {"a.txt", "b.txt", "api-1"}
+    assert "api-1" in load_manifest(service)
+
+
+def test_folder_reingest_purges_only_its_own_deleted_reports(
+    service, reports_folder, tmp_path
+):
+    other_folder = tmp_path / "other_reports"
+    other_folder.mkdir()
+    write_reports(reports_folder, REPORTS)
+    write_reports(other_folder, {"c.txt": "Impression: From another folder."})
+    service.ingest_reports(str(reports_folder))
+    service.ingest_reports(str(other_folder))
+
+    (reports_folder / "b.txt").unlink()
+    service.ingest_reports(str(reports_folder))
+
+    assert stored_report_ids(service) == {"a.txt", "c.txt"}
+    assert "b.txt" not in load_manifest(service)
+
+
+def fragment_rows(service, report_id) -> list:
+    table = service._ensure_connection()
+    rows = table.to_arrow().to_pylist()
+    return sorted(
+        row["sequence_number"] for row in rows if row["report_id"] == report_id
+    )
+
+
+def test_upserting_a_shorter_report_removes_its_stale_tail(service):
+    service.upsert_reports([Report(id="r1", text=REPORTS["a.txt"])])
+    assert fragment_rows(service, "r1") == [0, 1, 2]
+
+    service.upsert_reports([Report(id="r1", text="Impression: Corrected.")])
+
+    assert fragment_rows(service, "r1") == [0]
+    assert load_manifest(service).get("r1").fragment_count == 1
+
+
+def test_upserting_an_unchanged_report_is_a_no_op(service):
+    service.upsert_reports([Report(id="r1", text=REPORTS["a.txt"])])
+    version = service._ensure_connection().version
+
+    written = service.upsert_reports([Report(id="r1", text=REPORTS["a.txt"])])
+
+    assert written == 0
+    assert service._ensure_connection().version == version
+    assert fragment_rows(service, "r1") == [0, 1, 2]
+
+
+def test_delete_reports_removes_fragments_and_manifest_entry(service, reports_folder):
+    write_reports(reports_folder, REPORTS)
+    service.ingest_reports(str(reports_folder))
+
+    deleted = service.delete_reports(["a.txt"])
+
+    assert deleted == 3
+    assert fragment_rows(service, "a.txt") == []
+    assert "a.txt" not in load_manifest(service)
+    assert stored_report_ids(service) == {"b.txt"}
+
+
+def test_upserted_near_duplicate_is_not_embedded(dedup_service):
+    service = dedup_service
+    service.upsert_reports([Report(id="r1", text=REPORTS["a.txt"])])
+
+    written = service.upsert_reports([Report(id="r2", text=REPORTS["a.txt"] + " ")])
+
+    assert written == 0
+    assert fragment_rows(service, "r2") == []
+    assert load_manifest(service).get("r2").duplicate_of == "r1"
+
+
+DUPLICATED = {
+    "a.txt": REPORTS["a.txt"],
+    "a2.txt": REPORTS["a.txt"],
+    "a3.txt": REPORTS["a.txt"],
+}
+
+
+def ingest_duplicates(service, reports_folder) -> tuple:
+    """Ingest three copies of a report; return the representative and the others"""
+    write_reports(reports_folder, DUPLICATED)
+    service.ingest_reports(str(reports_folder))
+    manifest = load_manifest(service)
+    (representative,) = [
+        report_id for report_id in DUPLICATED
+        if manifest.get(report_id).duplicate_of is None
+    ]
+    followers = [report_id for report_id in DUPLICATED if report_id != representative]
+    for report_id in followers:
+        assert manifest.get(report_id).duplicate_of == representative
+    return representative, followers
+
+
+def assert_promoted(service, followers) -> str:
+    """Check one follower took over the fragments and the other points at it"""
+    manifest = load_manifest(service)
+    (successor,) = [
+        report_id for report_id in followers
+        if manifest.get(report_id).duplicate_of is None
+    ]
+    (other,) = [report_id for report_id in followers if report_id != successor]
+    assert manifest.get(successor).fragment_count == 3
+    assert manifest.get(other).duplicate_of == successor
+    assert fragment_rows(service, successor) == [0, 1, 2]
+    assert fragment_rows(service, other) == []
+    return successor
+
+
+def test_changed_representative_hands_its_fragments_to_a_near_duplicate(
+    dedup_service, reports_folder
+):
+    representative, followers = ingest_duplicates(dedup_service, reports_folder)
+
+    write_reports(reports_folder, {representative: "Impression: Rewritten report."})
+    dedup_service.ingest_reports(str(reports_folder))
+
+    successor = assert_promoted(dedup_service, followers)
+    assert fragment_rows(dedup_service, representative) == [0]
+    assert load_manifest(dedup_service).get(representative).duplicate_of is None
+
+    # The promoted report took over the signature of the old text
+    write_reports(reports_folder, {"a4.txt": REPORTS["a.txt"]})
+    dedup_service.ingest_reports(str(reports_folder))
+    assert load_manifest(dedup_service).get("a4.txt").duplicate_of == successor
+
+
+@pytest.mark.parametrize("removal", ["file", "delete_reports"])
+def test_deleted_representative_hands_its_fragments_to_a_near_duplicate(
+    dedup_service, reports_folder, removal
+):
+    representative, followers = ingest_duplicates(dedup_service, reports_folder)
+
+    if removal == "file":
+        (reports_folder / representative).unlink()
+        dedup_service.ingest_reports(str(reports_folder))
+    else:
+        dedup_service.delete_reports([representative])
+
+    successor = assert_promoted(dedup_service, followers)
+    assert representative not in load_manifest(dedup_service)
+    assert fragment_rows(dedup_service, representative) == []
+
+    saved = NearDuplicateIndex.load(
+        dedup_index_path_for(dedup_service.db_path, dedup_service.table_name)
+    )
+    assert saved.find_or_add("a4.txt", REPORTS["a.txt"]) == successor
+
+
+def test_failed_batch_leaves_no_representative_in_saved_index(
+    dedup_service, reports_folder, monkeypatch
+):
+    write_reports(reports_folder, {"a.txt": REPORTS["a.txt"]})
+
+    def fail(self, texts):
+        raise RuntimeError("embedding failed")
+
+    with monkeypatch.context() as patch:
+        patch.setattr(HashingEngine, "embed", fail)
+        with pytest.raises(RuntimeError):
+            dedup_service.ingest_reports(str(reports_folder))
+
+    saved = NearDuplicateIndex.load(
+        dedup_index_path_for(dedup_service.db_path, dedup_service.table_name)
+    )
+    assert len(saved) == 0
+
+    # a.txt was never stored, so its copy must not be deduplicated against it
+    (reports_folder / "a.txt").unlink()
+    write_reports(reports_folder, {"a2.txt": REPORTS["a.txt"]})
+    dedup_service.ingest_reports(str(reports_folder))
+    assert load_manifest(dedup_service).get("a2.txt").duplicate_of is None
+    assert fragment_rows(dedup_service, "a2.txt") == [0, 1, 2]
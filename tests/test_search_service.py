@@ -0,0 +1,45 @@
+from conftest import write_reports
+
+from reportfindingrefiner.data_models import Report
+from reportfindingrefiner.services.search_result_cache import SearchResultCache
+from reportfindingrefiner.services.search_service import SearchService
+
+REPORTS = {
+    "a.txt": "Findings:\nLiver: normal.\nImpression: No acute finding.",
+    "b.txt": "Findings:\nLungs: clear.\nImpression: Normal chest.",
+}
+
+
+def result_ids(results) -> set:
+    return {result["report_id"] for result in results}
+
+
+def test_per_mode_searches_share_the_result_cache(service, reports_folder):
+    write_reports(reports_folder, REPORTS)
+    service.ingest_reports(str(reports_folder))
+    searches = SearchService(
+        service.db_path, service.table_name, result_cache=SearchResultCache()
+    )
+
+    results = searches.search_basic("liver")
+
+    assert result_ids(results) == {"a.txt"}
+    assert searches.search("liver", mode="basic") is results
+    assert searches.search_basic("liver") is results
+    assert searches.result_cache.hits == 2
+    vector_results = searches.search_vector("liver")
+    assert searches.search("liver", mode="vector") is vector_results
+
+
+def test_insert_invalidates_cached_results(service, reports_folder):
+    write_reports(reports_folder, REPORTS)
+    service.ingest_reports(str(reports_folder))
+    searches = SearchService(
+        service.db_path, service.table_name, result_cache=SearchResultCache()
+    )
+    assert result_ids(searches.search_basic("liver")) == {"a.txt"}
+
+    service.upsert_reports([Report(id="c.txt", text="Impression: Liver lesion.")])
+
+    assert result_ids(searches.search_basic("liver")) == {"a.txt", "c.txt"}
+    assert searches.result_cache.hits == 0
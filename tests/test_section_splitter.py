@@ -0,0 +1,136 @@
+import importlib.util
+import os
+import random
+import re
+
+import pytest
+
+from reportfindingrefiner.config import (
+    DEFAULT_SECTION_HEADINGS,
+    DEFAULT_SUBSECTION_HEADINGS,
+)
+from reportfindingrefiner.section_splitter import SectionSplitter
+
+BENCHMARK = os.path.join(
+    os.path.dirname(__file__), "..", "scripts", "benchmark_section_splitter.py"
+)
+
+
+def legacy_split_into_fragments(
+    report_text, headings, subsection_headings, ignore_case=False
+):
+    """
+    The splitter before it was compiled into a single pass, with its hard-coded
+    headings made configurable (and, with ignore_case, matched in any case and
+    labelled with the configured spelling), as the reference output
+    """
+    labels = {(h.lower() if ignore_case else h): h for h in headings}
+    pattern = r"(" + "|".join(map(re.escape, headings)) + r")"
+    parts = re.split(pattern, report_text, flags=re.IGNORECASE if ignore_case else 0)
+    sections = []
+    current_section_label = None
+    current_text_chunks = []
+    for part in parts:
+        part_stripped = part.strip()
+        if not part_stripped:
+            continue
+        label = labels.get(part.lower() if ignore_case else part)
+        if label is not None:
+            if current_section_label and current_text_chunks:
+                combined_text = " ".join(current_text_chunks).strip()
+                sections.append((current_section_label, combined_text))
+            current_section_label = label
+            current_text_chunks = []
+        else:
+            current_text_chunks.append(part_stripped)
+    if current_section_label and current_text_chunks:
+        combined_text = " ".join(current_text_chunks).strip()
+        sections.append((current_section_label, combined_text))
+    if not sections and report_text.strip():
+        sections.append((None, report_text.strip()))
+
+    fragments = []
+    for label, text in sections:
+        if label in subsection_headings and ":" in text:
+            current_fragment = []
+            for line in text.split("\n"):
+                if ":" in line and not line.endswith(":"):
+                    if current_fragment:
+                        fragments.append((label, " ".join(current_fragment).strip()))
+                        current_fragment = []
+                    fragments.append((label, line.strip()))
+                else:
+                    current_fragment.append(line)
+            if current_fragment:
+                fragments.append((label, " ".join(current_fragment).strip()))
+        else:
+            fragments.append((label, text.strip()))
+    return fragments
+
+
+EDGE_CASES = [
+    "",
+    "   \n  ",
+    "No headings at all, just free text.\nOn two lines: with a colon.",
+    "Findings:\nLiver: normal.\nSpleen: normal.\nImpression: No acute finding.",
+    "Accession 123 before any heading.\nFindings: Liver: normal.\nImpression: ok.",
+    "Findings: Liver: a.\nFindings: Spleen: b.\nImpression: x. Impression: y.",
+    "Findings:\nLiver: normal.\nImpression:",
+    "Impression: ok.\nFindings:",
+    "Header: CT.\nFindings:\n\nImpression:\n",
+    "Findings:\r\nLiver: normal.\r\nContinued without colon.\r\n"
+    "Comments:\r\nImpression: ok.\r\n",
+    "Findings:\nLiver: normal.\nTrailing text\n\nwith blank line\nAdditional:\n",
+    "Findings:Liver:normal.Impression:ok.",
+    "Findings:\n:\nKidneys: normal.\n: leading colon\nImpression: done",
+]
+
+
+@pytest.mark.parametrize("text", EDGE_CASES)
+def test_matches_legacy_with_configured_defaults(text):
+    expected = legacy_split_into_fragments(
+        text, DEFAULT_SECTION_HEADINGS, DEFAULT_SUBSECTION_HEADINGS
+    )
+    assert SectionSplitter().split_into_fragments(text) == expected
+
+
+HEADINGS = ["CLINICAL HISTORY:", "TECHNIQUE:", "FINDINGS:", "IMPRESSION:"]
+
+
+@pytest.mark.parametrize("ignore_case", [False, True])
+@pytest.mark.parametrize(
+    "text",
+    EDGE_CASES
+    + [
+        "Clinical history: pain.\nTechnique: CT.\nFindings:\nLiver: normal.\n"
+        "Impression: ok.",
+        "CLINICAL HISTORY: pain.\nfindings:\nLiver: normal.\nFINDINGS:\nLungs: clear.",
+        "technique: CT\r\nFindings:\r\nBones: intact.\r\nIMPRESSION: none",
+    ],
+)
+def test_matches_legacy_with_configured_headings(text, ignore_case):
+    splitter = SectionSplitter(
+        headings=HEADINGS, subsection_headings=["FINDINGS:"], ignore_case=ignore_case
+    )
+    expected = legacy_split_into_fragments(
+        text, HEADINGS, ["FINDINGS:"], ignore_case=ignore_case
+    )
+    assert splitter.split_into_fragments(text) == expected
+
+
+def test_matches_legacy_on_synthetic_corpus():
+    spec = importlib.util.spec_from_file_location("benchmark_splitter", BENCHMARK)
+    benchmark = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(benchmark)
+
+    rng = random.Random(0)
+    splitter = SectionSplitter(
+        headings=["Header:", "Findings:", "Impression:"],
+        subsection_headings=["Findings:"],
+    )
+    for i in range(2000):
+        text = benchmark.make_report(rng, i)
+        expected = legacy_split_into_fragments(
+            text, ["Header:", "Findings:", "Impression:"], ["Findings:"]
+        )
+        assert splitter.split_into_fragments(text) == expected, text